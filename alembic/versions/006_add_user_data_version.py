@@ -0,0 +1,24 @@
+"""Add data_version to users
+
+Revision ID: 006_data_version
+Revises: 005_add_ooo
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '006_data_version'
+down_revision = '005_add_ooo'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bumped by every work week / work item write; used to key export caches
+    op.add_column('users', sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('users', 'data_version')
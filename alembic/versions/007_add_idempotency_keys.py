@@ -0,0 +1,31 @@
+"""Add idempotency_keys table
+
+Revision ID: 007_idempotency
+Revises: 006_data_version
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '007_idempotency'
+down_revision = '006_data_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Shared by all workers so a retried form POST is answered from the stored response
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('key', sa.String(255), primary_key=True),
+        sa.Column('response', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
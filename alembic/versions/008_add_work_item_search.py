@@ -0,0 +1,87 @@
+"""Add full-text search index on work_items
+
+Revision ID: 008_search
+Revises: 007_idempotency
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '008_search'
+down_revision = '007_idempotency'
+branch_labels = None
+depends_on = None
+
+# Generated tsvector + GIN on Postgres, FTS5 table + triggers on SQLite. The
+# model creates the same objects for new databases (app/models/work_item.py).
+SEARCH_DDL = {
+    "postgresql": [
+        """
+        ALTER TABLE work_items ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(planned_work, '') || ' ' ||
+                coalesce(actual_work, '') || ' ' || coalesce(next_week_plan, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_work_items_search_vector ON work_items USING gin (search_vector)",
+    ],
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS work_items_fts USING fts5(
+            item_id UNINDEXED, owner, title, planned_work, actual_work, next_week_plan
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_items_fts_insert AFTER INSERT ON work_items BEGIN
+            INSERT INTO work_items_fts (item_id, owner, title, planned_work, actual_work, next_week_plan)
+            VALUES (new.id, (SELECT user_id FROM work_weeks WHERE id = new.week_id),
+                    new.title, new.planned_work, new.actual_work, new.next_week_plan);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_items_fts_update AFTER UPDATE ON work_items BEGIN
+            UPDATE work_items_fts SET owner = (SELECT user_id FROM work_weeks WHERE id = new.week_id),
+                title = new.title, planned_work = new.planned_work,
+                actual_work = new.actual_work, next_week_plan = new.next_week_plan
+            WHERE item_id = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_items_fts_delete AFTER DELETE ON work_items BEGIN
+            DELETE FROM work_items_fts WHERE item_id = old.id;
+        END
+        """,
+    ],
+}
+
+# Indexes existing rows; Postgres fills the generated column itself
+SQLITE_BACKFILL = (
+    "INSERT INTO work_items_fts (item_id, owner, title, planned_work, actual_work, next_week_plan) "
+    "SELECT work_items.id, work_weeks.user_id, title, planned_work, actual_work, next_week_plan "
+    "FROM work_items JOIN work_weeks ON work_weeks.id = work_items.week_id"
+)
+
+
+def upgrade():
+    # Lets per-user queries (search included) reach a user's items through their weeks
+    op.create_index('ix_work_items_week_id', 'work_items', ['week_id'], if_not_exists=True)
+    
+    dialect = op.get_bind().dialect.name
+    for statement in SEARCH_DDL.get(dialect, []):
+        op.execute(statement)
+    if dialect == "sqlite":
+        op.execute(SQLITE_BACKFILL)
+
+
+def downgrade():
+    op.drop_index('ix_work_items_week_id', table_name='work_items', if_exists=True)
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_work_items_search_vector")
+        op.execute("ALTER TABLE work_items DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("work_items_fts_insert", "work_items_fts_update", "work_items_fts_delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS work_items_fts")
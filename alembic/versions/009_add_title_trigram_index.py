@@ -0,0 +1,28 @@
+"""Add trigram index on work_items.title
+
+Revision ID: 009_title_trgm
+Revises: 008_search
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '009_title_trgm'
+down_revision = '008_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # pg_trgm GIN index behind title autocomplete; SQLite scans the user's items instead
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_work_items_title_trgm ON work_items USING gin (title gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_work_items_title_trgm")
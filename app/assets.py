@@ -0,0 +1,30 @@
+import json
+import os
+from typing import Optional
+
+STATIC_DIR = "app/static"
+DIST_DIR = "dist"
+MANIFEST_PATH = os.path.join(STATIC_DIR, DIST_DIR, "manifest.json")
+
+# Fingerprinted files never change under the same name
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    """Load the logical-name -> fingerprinted-file manifest written by scripts/build_assets.py."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+MANIFEST = load_manifest()
+
+
+def asset_url(name: str) -> Optional[str]:
+    """Return the fingerprinted /static URL for a built asset, or None before a build."""
+    filename = MANIFEST.get(name)
+    if filename is None:
+        return None
+    return f"/static/{DIST_DIR}/{filename}"
@@ -70,7 +70,7 @@ def clear_session_cookie(response: RedirectResponse) -> RedirectResponse:
 
 
 # Public routes that don't require authentication
-PUBLIC_ROUTES = ["/login", "/signup", "/health", "/static"]
+PUBLIC_ROUTES = ["/login", "/signup", "/health", "/static", "/metrics"]
 
 
 def is_public_route(path: str) -> bool:
@@ -0,0 +1,101 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.metrics import QUERY_BUDGET_EXCEEDED
+
+# SQLSTATE for "canceling statement due to statement timeout"
+QUERY_CANCELED = "57014"
+
+
+class BudgetExceeded(Exception):
+    """The database work of a route ran past its time budget."""
+
+    def __init__(self, route: str, budget_ms: int):
+        super().__init__(f"{route} exceeded its {budget_ms} ms query budget")
+        self.route = route
+        self.budget_ms = budget_ms
+
+
+# Monotonic deadline and route of the budget currently in force, if any
+current_budget: ContextVar[Optional[tuple]] = ContextVar("current_budget", default=None)
+
+
+def staged_deadlines(route: str, attempts: int) -> Iterator[Optional[float]]:
+    """Deadlines for successive fallback attempts that share one route budget.
+
+    Each attempt but the last may use half of the time left and the last
+    gets the rest, so the whole sequence ends by the budget's one deadline.
+    Evaluated lazily, as each attempt starts. None for routes without a budget.
+    """
+    budget_ms = get_settings().query_budgets_ms.get(route)
+    final = time.monotonic() + budget_ms / 1000 if budget_ms else None
+    for attempt in range(attempts):
+        if final is None or attempt == attempts - 1:
+            yield final
+        else:
+            now = time.monotonic()
+            yield now + max(final - now, 0) / 2
+
+
+@contextmanager
+def query_budget(db: Session, route: str, deadline: Optional[float] = None):
+    """Bound the database time of the enclosed block by the route's budget.
+
+    Postgres cancels any single statement that outlives the budget
+    (SET LOCAL statement_timeout, scoped to the current transaction), and
+    no new statement may start once the deadline has passed, which also
+    bounds loops of fast queries on any database. Either way the block
+    raises BudgetExceeded, after rolling back, so the route can degrade.
+    Routes without a configured budget run unbounded.
+
+    Args:
+        deadline: Monotonic time to stop by instead of the full budget from
+            now, for attempts sharing one budget (see staged_deadlines)
+    """
+    budget_ms = get_settings().query_budgets_ms.get(route)
+    if not budget_ms:
+        yield
+        return
+
+    if deadline is None:
+        deadline = time.monotonic() + budget_ms / 1000
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        QUERY_BUDGET_EXCEEDED.labels(route).inc()
+        raise BudgetExceeded(route, budget_ms)
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if postgres:
+        db.execute(text(f"SET LOCAL statement_timeout = {math.ceil(remaining * 1000)}"))
+    token = current_budget.set((deadline, route, budget_ms))
+    try:
+        yield
+    except OperationalError as e:
+        if getattr(e.orig, "pgcode", None) != QUERY_CANCELED:
+            raise
+        db.rollback()
+        QUERY_BUDGET_EXCEEDED.labels(route).inc()
+        raise BudgetExceeded(route, budget_ms) from e
+    except BudgetExceeded:
+        db.rollback()
+        QUERY_BUDGET_EXCEEDED.labels(route).inc()
+        raise
+    else:
+        if postgres:
+            db.execute(text("SET LOCAL statement_timeout = DEFAULT"))
+    finally:
+        current_budget.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _enforce_deadline(conn, cursor, statement, parameters, context, executemany):
+    budget = current_budget.get()
+    if budget is not None and time.monotonic() > budget[0]:
+        raise BudgetExceeded(budget[1], budget[2])
@@ -1,3 +1,6 @@
+import os
+import tempfile
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -6,6 +9,42 @@ class Settings(BaseSettings):
     app_name: str = "Work Tracker"
     debug: bool = True
     database_url: str = "postgresql://localhost/work_tracker"
+    export_cache_dir: str = os.path.join(tempfile.gettempdir(), "work_tracker_exports")
+    export_cache_max_bytes: int = 256 * 1024 * 1024
+    template_cache_dir: str = os.path.join(tempfile.gettempdir(), "work_tracker_templates")
+    # Re-check template files for edits on every render; only for development
+    template_auto_reload: bool = False
+    fragment_cache_max_entries: int = 2048
+    # "database" shares keys across workers; "memory" is a per-process LRU
+    idempotency_backend: str = "database"
+    idempotency_ttl_seconds: int = 300
+    idempotency_max_entries: int = 10_000
+    # "auto" uses Postgres LISTEN/NOTIFY on Postgres and in-process loopback otherwise
+    invalidation_backend: str = "auto"
+    # Fraction of requests measured for Server-Timing and the per-request log line
+    instrumentation_sample_rate: float = 1.0
+    server_timing_header: bool = True
+    # Statements slower than this are logged and kept for /admin/slow-queries
+    slow_query_threshold_ms: float = 200.0
+    slow_query_log_size: int = 200
+    # Capture an EXPLAIN plan (Postgres only, off the request path) for each slow statement
+    slow_query_explain: bool = True
+    # Lets admins add ?_profile=html|speedscope to any page to get a profile instead
+    profiling_enabled: bool = True
+    # Database time budget per route template, in ms; on Postgres each statement
+    # also runs under SET LOCAL statement_timeout. Routes not listed are unbounded.
+    query_budgets_ms: Dict[str, int] = {
+        "/analytics": 5000,
+        "/api/analytics/data": 5000,
+        "/reports": 5000,
+        "/reports/export/csv": 20000,
+        "/reports/export/excel": 20000,
+        "/reports/export/{export_format}": 20000,
+    }
+    # Where scripts/weekly_digest.py writes each week's digests
+    digest_outbox_dir: str = "outbox"
+    # When set, /metrics requires "Authorization: Bearer <token>"
+    metrics_token: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -1,11 +1,13 @@
 from app.crud.work_week import (
     get_work_week, get_work_week_by_date, get_work_weeks,
-    create_work_week, get_or_create_work_week, get_all_work_weeks
+    create_work_week, get_or_create_work_week, get_all_work_weeks,
+    get_work_weeks_page, delete_work_week
 )
 from app.crud.work_item import (
     get_work_item, get_work_items_by_week, create_work_item,
     update_work_item, delete_work_item, get_pending_items,
-    validate_points, get_pending_items_for_user
+    validate_points, get_pending_items_for_user, get_week_points,
+    get_work_items_page
 )
 from app.crud.user import (
     get_user, get_user_by_email, get_users, create_user,
@@ -16,9 +18,11 @@ from app.crud.user import (
 __all__ = [
     "get_work_week", "get_work_week_by_date", "get_work_weeks",
     "create_work_week", "get_or_create_work_week", "get_all_work_weeks",
+    "get_work_weeks_page", "delete_work_week",
     "get_work_item", "get_work_items_by_week", "create_work_item",
     "update_work_item", "delete_work_item", "get_pending_items",
-    "validate_points", "get_pending_items_for_user",
+    "validate_points", "get_pending_items_for_user", "get_week_points",
+    "get_work_items_page",
     "get_user", "get_user_by_email", "get_users", "create_user",
     "authenticate_user", "change_password", "delete_user",
     "get_user_stats", "get_all_users_with_stats", "hash_password", "verify_password"
@@ -1,11 +1,12 @@
 from uuid import UUID
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, update
 import bcrypt
 from app.models.user import User
 from app.models.work_week import WorkWeek
 from app.models.work_item import WorkItem
+from app.services.invalidation import InvalidationEvent, invalidation_bus
 
 
 def hash_password(password: str) -> str:
@@ -22,7 +23,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_user(db: Session, user_id: UUID) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+    # Session.get answers from the identity map when the request already loaded the user
+    return db.get(User, user_id)
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -60,8 +62,34 @@ def change_password(db: Session, user_id: UUID, new_password: str) -> bool:
     return True
 
 
+def _bump(db: Session, condition, entity: str) -> None:
+    """Increment matching users' data version and announce it on the invalidation bus."""
+    rows = db.execute(
+        update(User).where(condition)
+        .values(data_version=User.data_version + 1)
+        .returning(User.id, User.data_version)
+        .execution_options(synchronize_session=False)
+    ).all()
+    for user_id, version in rows:
+        invalidation_bus.publish(db, InvalidationEvent(entity, user_id, version))
+
+
+def bump_data_version(db: Session, user_id: UUID, entity: str = "work_week") -> None:
+    """Increment the user's data version. Committed together with the caller's write."""
+    _bump(db, User.id == user_id, entity)
+
+
+def bump_data_version_for_week(db: Session, week_id: UUID, entity: str = "work_item") -> None:
+    """Increment the data version of the user owning a work week."""
+    owner = db.query(WorkWeek.user_id).filter(WorkWeek.id == week_id).scalar_subquery()
+    _bump(db, User.id == owner, entity)
+
+
 def delete_user(db: Session, user_id: UUID) -> bool:
-    user = get_user(db, user_id)
+    # Load the whole cascade up front instead of one item query per week
+    user = db.query(User).options(
+        selectinload(User.work_weeks).selectinload(WorkWeek.work_items)
+    ).filter(User.id == user_id).first()
     if not user:
         return False
     db.delete(user)
@@ -69,36 +97,42 @@ def delete_user(db: Session, user_id: UUID) -> bool:
     return True
 
 
+def _stats_by_user(db: Session, user_id: Optional[UUID] = None) -> dict:
+    """Aggregate week and item totals per user with two grouped queries."""
+    week_query = db.query(WorkWeek.user_id, func.count(WorkWeek.id))
+    item_query = db.query(
+        WorkWeek.user_id,
+        func.count(WorkItem.id),
+        func.coalesce(func.sum(WorkItem.assigned_points), 0)
+    ).join(WorkItem, WorkItem.week_id == WorkWeek.id)
+    if user_id:
+        week_query = week_query.filter(WorkWeek.user_id == user_id)
+        item_query = item_query.filter(WorkWeek.user_id == user_id)
+    
+    stats = {}
+    for owner, weeks in week_query.group_by(WorkWeek.user_id).all():
+        stats[owner] = {"total_weeks": weeks, "total_items": 0, "total_points": 0}
+    for owner, items, points in item_query.group_by(WorkWeek.user_id).all():
+        stats[owner].update(total_items=items, total_points=points)
+    return stats
+
+
 def get_user_stats(db: Session, user_id: UUID) -> dict:
     """Get statistics for a user."""
-    weeks = db.query(WorkWeek).filter(WorkWeek.user_id == user_id).all()
-    total_weeks = len(weeks)
-    
-    total_items = 0
-    total_points = 0
-    for week in weeks:
-        items = db.query(WorkItem).filter(WorkItem.week_id == week.id).all()
-        total_items += len(items)
-        total_points += sum(item.assigned_points for item in items)
-    
-    return {
-        "total_weeks": total_weeks,
-        "total_items": total_items,
-        "total_points": total_points
-    }
+    return _stats_by_user(db, user_id).get(
+        user_id, {"total_weeks": 0, "total_items": 0, "total_points": 0}
+    )
 
 
 def get_all_users_with_stats(db: Session) -> List[dict]:
     """Get all users with their statistics for admin view."""
     users = get_users(db)
-    result = []
-    for user in users:
-        stats = get_user_stats(db, user.id)
-        result.append({
-            "id": str(user.id),
-            "email": user.email,
-            "is_admin": user.is_admin,
-            "created_at": user.created_at,
-            **stats
-        })
-    return result
+    stats = _stats_by_user(db)
+    empty = {"total_weeks": 0, "total_items": 0, "total_points": 0}
+    return [{
+        "id": str(user.id),
+        "email": user.email,
+        "is_admin": user.is_admin,
+        "created_at": user.created_at,
+        **stats.get(user.id, empty)
+    } for user in users]
@@ -1,10 +1,11 @@
-from datetime import date
+from datetime import date, datetime
 from uuid import UUID
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Optional, List, Sequence, Tuple
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import and_, func, or_
 from app.models.work_item import WorkItem, TaskStatus
 from app.schemas.work_item import WorkItemCreate, WorkItemUpdate
+from app.crud.user import bump_data_version_for_week
 
 
 def get_work_item(db: Session, item_id: UUID) -> Optional[WorkItem]:
@@ -15,6 +16,30 @@ def get_work_items_by_week(db: Session, week_id: UUID) -> List[WorkItem]:
     return db.query(WorkItem).filter(WorkItem.week_id == week_id).order_by(WorkItem.created_at).all()
 
 
+def get_work_items_page(
+    db: Session, week_id: UUID, columns: Sequence[str], after: Optional[Tuple[datetime, UUID]] = None,
+    limit: int = 50, item_id: UUID = None
+) -> List[dict]:
+    """Keyset page of a week's items in creation order, as plain dicts of only the requested columns.
+    
+    Args:
+        columns: WorkItem column names to select
+        after: (created_at, id) of the previous page's last item
+        item_id: Restrict to a single item
+    """
+    query = db.query(*[getattr(WorkItem, name) for name in columns]).filter(WorkItem.week_id == week_id)
+    if after:
+        created_at, last_id = after
+        query = query.filter(or_(
+            WorkItem.created_at > created_at,
+            and_(WorkItem.created_at == created_at, WorkItem.id > last_id)
+        ))
+    if item_id:
+        query = query.filter(WorkItem.id == item_id)
+    rows = query.order_by(WorkItem.created_at, WorkItem.id).limit(limit).all()
+    return [row._asdict() for row in rows]
+
+
 def validate_points(db: Session, week_id: UUID, new_points: int, exclude_item_id: UUID = None, lock: bool = True) -> int:
     """Validate points and return remaining points. Raises ValueError if exceeded.
     
@@ -68,6 +93,7 @@ def create_work_item(db: Session, item: WorkItemCreate) -> WorkItem:
         status=item.status.value
     )
     db.add(db_item)
+    bump_data_version_for_week(db, item.week_id)
     db.commit()
     db.refresh(db_item)
     return db_item
@@ -88,6 +114,7 @@ def update_work_item(db: Session, item_id: UUID, item: WorkItemUpdate) -> Option
             value = value.value
         setattr(db_item, field, value)
     
+    bump_data_version_for_week(db, db_item.week_id)
     db.commit()
     db.refresh(db_item)
     return db_item
@@ -97,6 +124,7 @@ def delete_work_item(db: Session, item_id: UUID) -> bool:
     db_item = get_work_item(db, item_id)
     if not db_item:
         return False
+    bump_data_version_for_week(db, db_item.week_id)
     db.delete(db_item)
     db.commit()
     return True
@@ -104,20 +132,49 @@ def delete_work_item(db: Session, item_id: UUID) -> bool:
 
 def get_pending_items(db: Session, before_date: date) -> List[WorkItem]:
     """Get items that are delayed or in progress from previous weeks."""
-    return db.query(WorkItem).join(WorkItem.work_week).filter(
+    return db.query(WorkItem).join(WorkItem.work_week).options(
+        contains_eager(WorkItem.work_week)
+    ).filter(
         WorkItem.status.in_([TaskStatus.DELAYED.value, TaskStatus.IN_PROGRESS.value, TaskStatus.TODO.value]),
-        WorkItem.work_week.has(WorkWeek.week_end < before_date)
+        WorkWeek.week_end < before_date
     ).order_by(WorkItem.created_at.desc()).all()
 
 
 def get_pending_items_for_user(db: Session, before_date: date, user_id: UUID) -> List[WorkItem]:
     """Get items that are delayed or in progress from previous weeks for a specific user."""
     from app.models.work_week import WorkWeek
-    return db.query(WorkItem).join(WorkItem.work_week).filter(
+    return db.query(WorkItem).join(WorkItem.work_week).options(
+        contains_eager(WorkItem.work_week)
+    ).filter(
         WorkItem.status.in_([TaskStatus.DELAYED.value, TaskStatus.IN_PROGRESS.value, TaskStatus.TODO.value]),
         WorkWeek.week_end < before_date,
         WorkWeek.user_id == user_id
     ).order_by(WorkItem.created_at.desc()).all()
 
 
+def get_week_points(db: Session, week_id: UUID) -> dict:
+    """Get point totals per task type for a week in a single grouped query."""
+    week = db.query(WorkWeek).filter(WorkWeek.id == week_id).first()
+    rows = db.query(
+        WorkItem.type, func.count(WorkItem.id), func.coalesce(func.sum(WorkItem.assigned_points), 0)
+    ).filter(WorkItem.week_id == week_id).group_by(WorkItem.type).all()
+    
+    by_type = {task_type: points for task_type, _, points in rows}
+    planned = by_type.get("PLANNED", 0)
+    unplanned = by_type.get("UNPLANNED", 0)
+    adhoc = by_type.get("ADHOC", 0)
+    total_used = planned + unplanned + adhoc
+    total_points = week.total_points if week else 100
+    
+    return {
+        "item_count": sum(count for _, count, _ in rows),
+        "planned": planned,
+        "unplanned": unplanned,
+        "adhoc": adhoc,
+        "total_used": total_used,
+        "total_points": total_points,
+        "remaining": total_points - total_used
+    }
+
+
 from app.models.work_week import WorkWeek
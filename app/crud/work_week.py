@@ -1,8 +1,11 @@
 from datetime import date, timedelta
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Sequence
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.work_week import WorkWeek
+from app.models.work_item import WorkItem
+from app.crud.user import bump_data_version
 
 
 def get_work_week(db: Session, week_id: UUID, user_id: UUID = None) -> Optional[WorkWeek]:
@@ -25,6 +28,26 @@ def get_work_weeks(db: Session, user_id: UUID, skip: int = 0, limit: int = 100)
     ).order_by(WorkWeek.week_start.desc()).offset(skip).limit(limit).all()
 
 
+def get_work_weeks_page(
+    db: Session, user_id: UUID, columns: Sequence[str], before: Optional[date] = None,
+    limit: int = 50, week_id: UUID = None
+) -> List[dict]:
+    """Keyset page of a user's weeks, newest first, as plain dicts of only the requested columns.
+    
+    Args:
+        columns: WorkWeek column names to select
+        before: Return weeks starting before this date (the previous page's last week_start)
+        week_id: Restrict to a single week
+    """
+    query = db.query(*[getattr(WorkWeek, name) for name in columns]).filter(WorkWeek.user_id == user_id)
+    if before:
+        query = query.filter(WorkWeek.week_start < before)
+    if week_id:
+        query = query.filter(WorkWeek.id == week_id)
+    rows = query.order_by(WorkWeek.week_start.desc()).limit(limit).all()
+    return [row._asdict() for row in rows]
+
+
 def get_all_work_weeks(db: Session, skip: int = 0, limit: int = 100) -> List[WorkWeek]:
     """Get all work weeks (for admin)."""
     return db.query(WorkWeek).order_by(WorkWeek.week_start.desc()).offset(skip).limit(limit).all()
@@ -35,6 +58,7 @@ def create_work_week(db: Session, week_start: date, week_end: date, user_id: UUI
     db_week = WorkWeek(week_start=week_start, week_end=week_end, user_id=user_id, ooo_days=ooo_days)
     db_week.total_points = db_week.calculate_total_points()
     db.add(db_week)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_week)
     return db_week
@@ -43,6 +67,8 @@ def create_work_week(db: Session, week_start: date, week_end: date, user_id: UUI
 def update_work_week_ooo(db: Session, week_id: UUID, ooo_days: int, user_id: UUID = None) -> Optional[WorkWeek]:
     """Update OOO days for a work week and recalculate total_points.
     
+    Rejects the change if the week's items would no longer fit its capacity.
+    
     Args:
         db: Database session
         week_id: The week to update
@@ -51,6 +77,9 @@ def update_work_week_ooo(db: Session, week_id: UUID, ooo_days: int, user_id: UUI
     
     Returns:
         Updated WorkWeek or None if not found
+    
+    Raises:
+        ValueError: If ooo_days is out of range or the assigned points exceed the new capacity
     """
     if ooo_days < 0 or ooo_days > 5:
         raise ValueError("OOO days must be between 0 and 5")
@@ -59,13 +88,35 @@ def update_work_week_ooo(db: Session, week_id: UUID, ooo_days: int, user_id: UUI
     if not week:
         return None
     
+    new_total_points = (5 - ooo_days) * 20
+    current_points = db.query(
+        func.coalesce(func.sum(WorkItem.assigned_points), 0)
+    ).filter(WorkItem.week_id == week.id).scalar()
+    if current_points > new_total_points:
+        raise ValueError(
+            f"Cannot set {ooo_days} OOO days. Current work items total {current_points} points, "
+            f"but only {new_total_points} points available."
+        )
+    
     week.ooo_days = ooo_days
     week.total_points = week.calculate_total_points()
+    bump_data_version(db, week.user_id)
     db.commit()
     db.refresh(week)
     return week
 
 
+def delete_work_week(db: Session, week_id: UUID, user_id: UUID = None) -> bool:
+    """Delete a work week and its items."""
+    week = get_work_week(db, week_id, user_id)
+    if not week:
+        return False
+    bump_data_version(db, week.user_id)
+    db.delete(week)
+    db.commit()
+    return True
+
+
 def get_or_create_work_week(db: Session, target_date: date, user_id: UUID) -> WorkWeek:
     """Get or create a work week for the given date and user.
     
@@ -4,12 +4,18 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# connect_timeout is a libpq option; SQLite (local runs, benchmarks) rejects it
+if settings.database_url.startswith("sqlite"):
+    connect_args = {"check_same_thread": False}
+else:
+    connect_args = {"connect_timeout": 10}
+
 # Add pool_pre_ping for better connection handling
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
     pool_recycle=300,
-    connect_args={"connect_timeout": 10}
+    connect_args=connect_args
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.runtime import Undefined
+from markupsafe import Markup
+from app.metrics import record_cache
+
+
+class FragmentCache:
+    """Bounded in-process LRU of rendered template fragments with per-entry TTL.
+    
+    Keys carry everything that decides the fragment (user id, data_version,
+    week), so entries never need explicit invalidation: a change produces a
+    new key and the stale entry ages out of the LRU.
+    """
+    
+    def __init__(self, max_entries: int = 2048, default_ttl: int = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def evict_user(self, user_id: str, version: int) -> int:
+        """Drop per-user fragments older than version; such keys are (name, user_id, version, ...)."""
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if isinstance(key, tuple) and len(key) > 2 and key[1] == user_id
+                and isinstance(key[2], int) and key[2] < version
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FragmentCacheExtension(Extension):
+    """``{% cache key, ttl %}...{% endcache %}`` backed by ``environment.fragment_cache``.
+    
+    The body only renders on a miss, so context values it reads lazily are
+    never computed while the fragment is warm. An undefined or None key
+    renders the body uncached.
+    """
+    
+    tags = {"cache"}
+    
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+    
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_render", args), [], [], body).set_lineno(lineno)
+    
+    def _render(self, key: Any, ttl: Optional[int], caller) -> str:
+        if key is None or isinstance(key, Undefined):
+            return caller()
+        cache = self.environment.fragment_cache
+        value = cache.get(key)
+        record_cache("fragment", value is not None)
+        if value is None:
+            value = Markup(caller())
+            cache.set(key, value, ttl)
+        return value
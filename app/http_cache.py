@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+from datetime import date
+from typing import Optional
+from starlette.requests import Request
+from starlette.responses import Response
+from app.assets import MANIFEST
+from app.metrics import record_cache
+from app.templating import TEMPLATE_DIR
+
+# Pages are per-user, so intermediaries must not store them, and browsers
+# must revalidate on every navigation (which is cheap when we answer 304).
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _template_fingerprint() -> str:
+    """Hash templates and the asset manifest so a deploy that changes markup or assets changes every ETag."""
+    digest = hashlib.sha1(json.dumps(MANIFEST, sort_keys=True).encode("utf-8"))
+    for root, _, files in sorted(os.walk(TEMPLATE_DIR)):
+        for name in sorted(files):
+            with open(os.path.join(root, name), "rb") as f:
+                digest.update(name.encode("utf-8"))
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+TEMPLATE_FINGERPRINT = _template_fingerprint()
+
+
+def page_etag(request: Request, user, *extra) -> str:
+    """Compute a page ETag from the user's data version, before any page queries run.
+    
+    Everything a page renders is derived from the user's own weeks and items
+    (tracked by data_version), the URL, today's date (current week, future
+    week and pending-item cut-offs) and the templates.
+    """
+    parts = [
+        str(user.id),
+        str(user.data_version),
+        str(user.is_admin),
+        date.today().isoformat(),
+        request.url.path,
+        request.url.query,
+        TEMPLATE_FINGERPRINT,
+        *[str(part) for part in extra],
+    ]
+    return '"' + hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison: W/"abc" matches "abc"
+    matched = header.strip() == "*" or any(tag.removeprefix("W/") == etag for tag in candidates)
+    record_cache("http_revalidation", matched)
+    return matched
+
+
+def not_modified(etag: str, cache_control: Optional[str] = PRIVATE_CACHE_CONTROL) -> Response:
+    """Build an empty 304 response carrying the validators."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+def with_validators(response: Response, etag: str, cache_control: str = PRIVATE_CACHE_CONTROL) -> Response:
+    """Attach the ETag and private Cache-Control headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.slow_queries import slow_query_log
+
+
+class RequestMetrics:
+    """Time spent by one request, split by where it went."""
+    
+    __slots__ = ("started", "sql_count", "sql_seconds", "timers", "statements")
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.timers: Dict[str, float] = {}
+        # (statement, seconds) pairs; only collected when a request is being profiled
+        self.statements: Optional[List[Tuple[str, float]]] = None
+    
+    def add(self, name: str, seconds: float) -> None:
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value; "app" is everything not spent in SQL or timed sections."""
+        total = time.perf_counter() - self.started
+        metrics = [f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_count} queries"']
+        metrics += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.timers.items()]
+        other = total - self.sql_seconds - sum(self.timers.values())
+        metrics.append(f"app;dur={max(other, 0) * 1000:.1f}")
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+    
+    def as_dict(self) -> dict:
+        return {
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_seconds * 1000, 2),
+            **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in self.timers.items()},
+        }
+
+
+# Set only for sampled requests; everything below is a no-op otherwise
+current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("current_metrics", default=None)
+
+# ASGI scope of the request being served, for labelling slow queries with their route
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+
+@contextmanager
+def timed(name: str):
+    """Attribute the enclosed block's wall time to name in the current request."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - started)
+
+
+# Every statement is timed so the slow query log sees all of them, sampled or not
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not conn.info.get("query_started"):
+        return
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    if seconds >= slow_query_log.threshold:
+        slow_query_log.record(conn, statement, parameters, seconds, executemany, current_route())
+    
+    metrics = current_metrics.get()
+    if metrics is None:
+        return
+    metrics.sql_count += 1
+    metrics.sql_seconds += seconds
+    if metrics.statements is not None:
+        metrics.statements.append((statement, seconds))
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def current_route() -> Optional[str]:
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return route.path if route is not None else scope["path"]
@@ -1,15 +1,26 @@
+import hmac
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.routers import dashboard_router, input_router, analytics_router, reports_router
+from app.routers import dashboard_router, input_router, analytics_router, reports_router, api_router
 from app.routers.auth import router as auth_router
 from app.routers.profile import router as profile_router
 from app.routers.admin import router as admin_router
 from app.auth import get_current_user_from_cookie, is_public_route
 from app.database import SessionLocal
+from app.config import get_settings
+from app.metrics import render_metrics
+from app.middleware import (
+    CompressionMiddleware, InstrumentationMiddleware, MetricsMiddleware, ProfilingMiddleware
+)
+from app.serialization import JSONResponse
+from app.staticfiles import PrecompressedStaticFiles
 
-app = FastAPI(title="Work Tracker", description="Weekly work tracking with points system")
+app = FastAPI(
+    title="Work Tracker",
+    description="Weekly work tracking with points system",
+    default_response_class=JSONResponse
+)
 
 
 # Authentication Middleware
@@ -24,6 +35,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
         try:
             user = get_current_user_from_cookie(request, db)
             if not user:
+                # API clients get a status code, browsers get the login page
+                if request.url.path.startswith("/api/v1/"):
+                    return JSONResponse(content={"detail": "Not authenticated"}, status_code=401)
                 return RedirectResponse(url="/login", status_code=302)
             # Store user in request state for later use
             request.state.user = user
@@ -33,8 +47,17 @@ class AuthMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
-# Add middleware
+# Add middleware (last added runs first, so instrumentation times everything)
 app.add_middleware(AuthMiddleware)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+if get_settings().profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(
+    InstrumentationMiddleware,
+    sample_rate=get_settings().instrumentation_sample_rate,
+    server_timing=get_settings().server_timing_header
+)
+app.add_middleware(MetricsMiddleware)
 
 
 # Health check endpoint - must be before other routes
@@ -43,6 +66,16 @@ async def health_check():
     return JSONResponse(content={"status": "healthy"}, status_code=200)
 
 
+# Prometheus scrape endpoint - public route, optionally guarded by METRICS_TOKEN
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    token = get_settings().metrics_token
+    if token and not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {token}"):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Startup event - create tables and ensure admin user exists
 @app.on_event("startup")
 async def startup_event():
@@ -130,7 +163,66 @@ async def startup_event():
     except Exception as e:
         print(f"OOO column update note: {e}")
     
-    # Step 3: Ensure admin user exists
+    # Step 2d: Ensure users has data_version column (migration 006)
+    try:
+        with engine.connect() as conn:
+            inspector = inspect(engine)
+            columns = [col['name'] for col in inspector.get_columns('users')]
+            
+            if 'data_version' not in columns:
+                print("Adding data_version column to users...")
+                conn.execute(text("ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
+                conn.commit()
+                print("Added data_version column to users")
+    except Exception as e:
+        print(f"Data version column update note: {e}")
+    
+    # Step 2e: Ensure the work item week and full-text search indexes exist (migration 008)
+    try:
+        from app.models.work_item import SEARCH_BACKFILL, SEARCH_DDL
+        
+        with engine.connect() as conn:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_work_items_week_id ON work_items (week_id)"))
+            conn.commit()
+            inspector = inspect(engine)
+            dialect = engine.dialect.name
+            if dialect == "postgresql":
+                missing = 'search_vector' not in [col['name'] for col in inspector.get_columns('work_items')]
+            else:
+                missing = dialect == "sqlite" and 'work_items_fts' not in inspector.get_table_names()
+            
+            if missing:
+                print("Adding full-text search index to work_items...")
+                for statement in SEARCH_DDL[dialect]:
+                    conn.execute(text(statement))
+                if dialect in SEARCH_BACKFILL:
+                    conn.execute(text(SEARCH_BACKFILL[dialect]))
+                conn.commit()
+                print("Added full-text search index to work_items")
+    except Exception as e:
+        print(f"Search index update note: {e}")
+    
+    # Step 2f: Ensure the trigram index behind title autocomplete exists (migration 009)
+    try:
+        from app.models.work_item import TITLE_TRGM_DDL
+        
+        if engine.dialect.name in TITLE_TRGM_DDL:
+            with engine.connect() as conn:
+                for statement in TITLE_TRGM_DDL[engine.dialect.name]:
+                    conn.execute(text(statement))
+                conn.commit()
+    except Exception as e:
+        print(f"Title trigram index update note: {e}")
+    
+    # Step 3: Compile all templates before serving traffic
+    try:
+        from app.templating import templates, precompile_templates
+        compiled = precompile_templates(templates.env)
+        print(f"Precompiled {len(compiled)} templates")
+    except Exception as e:
+        print(f"Template precompile note: {e}")
+    
+    # Step 4: Ensure admin user exists
     try:
         from app.models.user import User
         
@@ -159,10 +251,23 @@ async def startup_event():
             db.close()
     except Exception as e:
         print(f"Startup user check error: {e}")
+    
+    # Step 5: Listen for writes made by other workers
+    try:
+        from app.services.invalidation import invalidation_bus
+        await invalidation_bus.start()
+    except Exception as e:
+        print(f"Invalidation listener note: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.services.invalidation import invalidation_bus
+    await invalidation_bus.stop()
 
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 
 # Include routers - auth first (public routes)
 app.include_router(auth_router)
@@ -172,3 +277,4 @@ app.include_router(analytics_router)
 app.include_router(reports_router)
 app.include_router(profile_router)
 app.include_router(admin_router)
+app.include_router(api_router)
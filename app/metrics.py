@@ -0,0 +1,105 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# With PROMETHEUS_MULTIPROC_DIR set before start-up, every worker writes its
+# values to mmap files in that directory and any worker can serve the scrape.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently being served", ["method"], multiprocess_mode="livesum"
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool", multiprocess_mode="livesum"
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    "db_pool_connections_open", "Connections opened by the pool", multiprocess_mode="livesum"
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by outcome", ["cache", "result"])
+EXPORT_DURATION = Histogram(
+    "export_duration_seconds",
+    "Time to generate an export on a cache miss",
+    ["format"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "query_budget_exceeded_total", "Requests whose database work ran past the route's budget", ["route"]
+)
+
+# Bound once: the per-statement listener skips the attribute lookup
+_DB_QUERIES_INC = DB_QUERIES.inc
+
+# (miss, hit) children per cache name, resolved on first use so lookups on
+# the hot path skip labels()
+_CACHE_CHILDREN: dict = {}
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    children = _CACHE_CHILDREN.get(cache)
+    if children is None:
+        children = _CACHE_CHILDREN[cache] = (
+            CACHE_REQUESTS.labels(cache, "miss"), CACHE_REQUESTS.labels(cache, "hit")
+        )
+    children[hit].inc()
+
+
+class export_timer:
+    """Context manager observing one export generation."""
+    
+    def __init__(self, export_format: str):
+        self.histogram = EXPORT_DURATION.labels(export_format)
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    _DB_QUERIES_INC()
+
+
+@event.listens_for(Pool, "connect")
+def _pool_connect(dbapi_connection, connection_record):
+    DB_CONNECTIONS_OPEN.inc()
+
+
+@event.listens_for(Pool, "close")
+def _pool_close(dbapi_connection, connection_record):
+    DB_CONNECTIONS_OPEN.dec()
+
+
+@event.listens_for(Pool, "checkout")
+def _pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_CONNECTIONS_IN_USE.inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _pool_checkin(dbapi_connection, connection_record):
+    DB_CONNECTIONS_IN_USE.dec()
+
+
+def render_metrics() -> tuple:
+    """Exposition body and content type; merges all workers in multiprocess mode."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,7 +1,25 @@
+import html
+import json
+import logging
+import random
+import time
+import zlib
+from collections.abc import Mapping
 from datetime import date, timedelta
+from typing import Optional
+from urllib.parse import parse_qs
 from uuid import UUID
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.instrumentation import RequestMetrics, current_metrics, current_scope
+from app.metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+from app.serialization import dumps
+
+request_logger = logging.getLogger("app.requests")
 
 
 def get_current_week_stats(db, user_id: UUID = None):
@@ -51,3 +69,370 @@ def get_current_week_stats(db, user_id: UUID = None):
         "unplanned": unplanned,
         "adhoc": adhoc
     }
+
+
+class SidebarStats(Mapping):
+    """Current-week stats for the sidebar, computed only when first read.
+    
+    ``cache_key`` changes whenever the user's data or the current week does,
+    so base.html can serve the sidebar from the fragment cache without ever
+    touching the database.
+    """
+    
+    def __init__(self, db, user):
+        today = date.today()
+        self.cache_key = ("sidebar", str(user.id), user.data_version, today - timedelta(days=today.weekday()))
+        self._db = db
+        self._user_id = user.id
+        self._stats = None
+    
+    def _load(self) -> dict:
+        if self._stats is None:
+            self._stats = get_current_week_stats(self._db, self._user_id)
+        return self._stats
+    
+    def __getitem__(self, key):
+        return self._load()[key]
+    
+    def __iter__(self):
+        return iter(self._load())
+    
+    def __len__(self):
+        return len(self._load())
+
+
+# Content types that are already compressed; compressing them again only costs CPU
+INCOMPRESSIBLE_TYPES = (
+    "application/vnd.openxmlformats",  # xlsx/docx are zip containers
+    "application/vnd.apache.parquet",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "font/woff",
+    "font/woff2",
+    "video/",
+    "audio/",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    
+    for coding in ("br", "gzip"):
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    """Negotiate brotli/gzip compression for responses above a size threshold.
+    
+    Pure ASGI so streamed responses (exports) are compressed chunk by chunk
+    instead of being buffered. Responses that already carry a
+    Content-Encoding (precompressed static files) or whose type is already
+    compressed are passed through untouched.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        responder = _CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, options: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.options = options
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+        self.buffer = []
+        self.buffered_size = 0
+    
+    def _new_compressor(self):
+        if self.encoding == "br":
+            return brotli.Compressor(quality=self.options.brotli_quality)
+        return zlib.compressobj(self.options.gzip_level, zlib.DEFLATED, 31)
+    
+    def _compress(self, data: bytes, finish: bool) -> bytes:
+        if self.encoding == "br":
+            out = self.compressor.process(data)
+            return out + (self.compressor.finish() if finish else self.compressor.flush())
+        out = self.compressor.compress(data)
+        return out + self.compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+    
+    def _should_skip(self, headers: MutableHeaders, status: int) -> bool:
+        if status < 200 or status in (204, 304):
+            return True
+        if "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(INCOMPRESSIBLE_TYPES)
+    
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = MutableHeaders(raw=message["headers"])
+            self.passthrough = self._should_skip(headers, message["status"])
+            if self.passthrough:
+                await self._send(message)
+            return
+        
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.compressor is not None:
+            await self._send({
+                "type": "http.response.body",
+                "body": self._compress(body, finish=not more_body),
+                "more_body": more_body,
+            })
+            return
+        
+        # Buffer until we know whether the response clears the size threshold;
+        # wrapped responses (BaseHTTPMiddleware) arrive as several small chunks
+        self.buffer.append(body)
+        self.buffered_size += len(body)
+        if more_body and self.buffered_size < self.options.minimum_size:
+            return
+        body = b"".join(self.buffer)
+        self.buffer = []
+        
+        if not more_body and len(body) < self.options.minimum_size:
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        
+        self.compressor = self._new_compressor()
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        
+        compressed = self._compress(body, finish=not more_body)
+        if more_body:
+            if "content-length" in headers:
+                del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(compressed))
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+
+class InstrumentationMiddleware:
+    """Per-request SQL count/time and timed sections as Server-Timing plus one JSON log line.
+    
+    Only a sample_rate fraction of requests is measured; for the rest the
+    context variable stays unset and the engine hooks return immediately.
+    """
+    
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0, server_timing: bool = True):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        status_code = 500
+        
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", metrics.server_timing())
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_metrics.reset(token)
+            request_logger.info(dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                **metrics.as_dict(),
+            }).decode())
+
+
+def is_admin_request(scope: Scope) -> bool:
+    """True when the session cookie belongs to an admin. Costs one user lookup."""
+    from app import database
+    from app.auth import get_current_user_from_cookie
+    
+    db = database.SessionLocal()
+    try:
+        user = get_current_user_from_cookie(Request(scope), db)
+        return bool(user and user.is_admin)
+    finally:
+        db.close()
+
+
+def sql_report_html(statements) -> str:
+    """SQL statements and their timings as an HTML section for the profile page."""
+    total_ms = sum(seconds for _, seconds in statements) * 1000
+    rows = "".join(
+        f"<tr><td>{seconds * 1000:.2f}</td><td><pre>{html.escape(statement)}</pre></td></tr>"
+        for statement, seconds in statements
+    )
+    return (
+        f'<section id="sql-statements"><h2>{len(statements)} SQL statements, {total_ms:.1f} ms</h2>'
+        f"<table><tr><th>ms</th><th>statement</th></tr>{rows}</table></section>"
+    )
+
+
+class ProfilingMiddleware:
+    """Admin-only sampling profile of a request, triggered by ?_profile=html|speedscope.
+    
+    The page's own response is discarded; the client gets pyinstrument's
+    flame graph (HTML) or a speedscope JSON file instead, together with every
+    SQL statement the request ran and its duration. Requests without the
+    flag, and requests from non-admins, pass straight through.
+    """
+    
+    FORMATS = ("html", "speedscope")
+    
+    def __init__(self, app: ASGIApp, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+    
+    def requested_format(self, scope: Scope) -> Optional[str]:
+        if scope["type"] != "http" or b"_profile=" not in scope["query_string"]:
+            return None
+        fmt = parse_qs(scope["query_string"].decode("latin-1")).get("_profile", [""])[0]
+        return fmt if fmt in self.FORMATS else None
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        fmt = self.requested_format(scope)
+        if fmt is None or not is_admin_request(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        from pyinstrument import Profiler
+        
+        metrics = current_metrics.get()
+        token = None
+        if metrics is None:
+            metrics = RequestMetrics()
+            token = current_metrics.set(metrics)
+        metrics.statements = []
+        status_code = 500
+        
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+        
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+            statements, metrics.statements = metrics.statements, None
+            if token is not None:
+                current_metrics.reset(token)
+        
+        headers = {"Cache-Control": "no-store", "X-Profiled-Status": str(status_code)}
+        if fmt == "speedscope":
+            from pyinstrument.renderers import SpeedscopeRenderer
+            
+            profile = json.loads(profiler.output(renderer=SpeedscopeRenderer()))
+            profile["sql"] = [
+                {"statement": statement, "duration_ms": round(seconds * 1000, 3)}
+                for statement, seconds in statements
+            ]
+            response = Response(dumps(profile), media_type="application/json", headers=headers)
+        else:
+            page = profiler.output_html()
+            page = page.replace("</body>", sql_report_html(statements) + "</body>", 1)
+            response = Response(page, media_type="text/html", headers=headers)
+        await response(scope, receive, send)
+
+
+def route_label(scope: Scope) -> str:
+    """Route template for metric labels, so /input/2025-01-06 and /input/2025-01-13 share one series."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope["path"].startswith("/static/"):
+        return "/static"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Prometheus request latency histogram and in-flight gauge for every request."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        status_code = 500
+        scope_token = current_scope.set(scope)
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_scope.reset(scope_token)
+            in_progress.dec()
+            REQUEST_LATENCY.labels(method, route_label(scope), str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
@@ -1,5 +1,6 @@
 from app.models.user import User
 from app.models.work_week import WorkWeek
 from app.models.work_item import WorkItem, TaskType, TaskStatus
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ["User", "WorkWeek", "WorkItem", "TaskType", "TaskStatus"]
+__all__ = ["User", "WorkWeek", "WorkItem", "TaskType", "TaskStatus", "IdempotencyKey"]
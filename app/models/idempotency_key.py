@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """A claimed Idempotency key and, once the request finished, its stored response."""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    # NULL while the first request is still running
+    response = Column(Text, nullable=True)
+    # Indexed so expired keys can be purged and reclaimed by range scan
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, Date, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, String, Date, Integer, Text, DateTime, ForeignKey, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -26,7 +26,7 @@ class WorkItem(Base):
     __tablename__ = "work_items"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    week_id = Column(UUID(as_uuid=True), ForeignKey("work_weeks.id"), nullable=False)
+    week_id = Column(UUID(as_uuid=True), ForeignKey("work_weeks.id"), nullable=False, index=True)
     type = Column(String(20), nullable=False, default=TaskType.PLANNED.value)
     title = Column(String(255), nullable=False)
     start_date = Column(Date, nullable=True)
@@ -42,3 +42,77 @@ class WorkItem(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     work_week = relationship("WorkWeek", back_populates="work_items")
+
+
+# Full-text search index over the text columns (see app/services/search.py).
+# Postgres: a generated tsvector column with a GIN index, kept out of the
+# mapper so SQLite can share the model. SQLite: an FTS5 table kept in step
+# by triggers, with the owning user's id as a token so a search only walks
+# that user's postings. Also applied to existing databases by migration 008
+# and startup.
+SEARCH_DDL = {
+    "postgresql": [
+        """
+        ALTER TABLE work_items ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(planned_work, '') || ' ' ||
+                coalesce(actual_work, '') || ' ' || coalesce(next_week_plan, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_work_items_search_vector ON work_items USING gin (search_vector)",
+    ],
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS work_items_fts USING fts5(
+            item_id UNINDEXED, owner, title, planned_work, actual_work, next_week_plan
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_items_fts_insert AFTER INSERT ON work_items BEGIN
+            INSERT INTO work_items_fts (item_id, owner, title, planned_work, actual_work, next_week_plan)
+            VALUES (new.id, (SELECT user_id FROM work_weeks WHERE id = new.week_id),
+                    new.title, new.planned_work, new.actual_work, new.next_week_plan);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_items_fts_update AFTER UPDATE ON work_items BEGIN
+            UPDATE work_items_fts SET owner = (SELECT user_id FROM work_weeks WHERE id = new.week_id),
+                title = new.title, planned_work = new.planned_work,
+                actual_work = new.actual_work, next_week_plan = new.next_week_plan
+            WHERE item_id = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_items_fts_delete AFTER DELETE ON work_items BEGIN
+            DELETE FROM work_items_fts WHERE item_id = old.id;
+        END
+        """,
+    ],
+}
+
+# Indexes rows written before the FTS5 table existed; Postgres fills the generated column itself
+SEARCH_BACKFILL = {
+    "sqlite": (
+        "INSERT INTO work_items_fts (item_id, owner, title, planned_work, actual_work, next_week_plan) "
+        "SELECT work_items.id, work_weeks.user_id, title, planned_work, actual_work, next_week_plan "
+        "FROM work_items JOIN work_weeks ON work_weeks.id = work_items.week_id"
+    ),
+}
+
+# Trigram index for title autocomplete (ILIKE '%...%' and word similarity); migration 009
+TITLE_TRGM_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_work_items_title_trgm ON work_items USING gin (title gin_trgm_ops)",
+    ],
+}
+
+for ddl in (SEARCH_DDL, TITLE_TRGM_DDL):
+    for dialect, statements in ddl.items():
+        for statement in statements:
+            event.listen(WorkItem.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(
+    WorkItem.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS work_items_fts").execute_if(dialect="sqlite")
+)
@@ -2,5 +2,6 @@ from app.routers.dashboard import router as dashboard_router
 from app.routers.input import router as input_router
 from app.routers.analytics import router as analytics_router
 from app.routers.reports import router as reports_router
+from app.routers.api import router as api_router
 
-__all__ = ["dashboard_router", "input_router", "analytics_router", "reports_router"]
+__all__ = ["dashboard_router", "input_router", "analytics_router", "reports_router", "api_router"]
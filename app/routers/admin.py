@@ -1,15 +1,16 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, Form, HTTPException
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Request, Form, HTTPException, Query
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.auth import get_current_user_from_cookie
 from app.crud.user import get_all_users_with_stats, delete_user, get_user
-from app.middleware import get_current_week_stats
+from app.middleware import SidebarStats
+from app.services.slow_queries import slow_query_log
+from app.services.team_analytics import get_team_analytics
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/admin")
@@ -24,7 +25,7 @@ async def admin_dashboard(request: Request, db: Session = Depends(get_db)):
     users = get_all_users_with_stats(db)
     
     # Get sidebar stats for current user
-    sidebar_stats = get_current_week_stats(db, user.id)
+    sidebar_stats = SidebarStats(db, user)
     
     return templates.TemplateResponse("admin.html", {
         "request": request,
@@ -37,6 +38,65 @@ async def admin_dashboard(request: Request, db: Session = Depends(get_db)):
     })
 
 
+# Week ranges offered on /admin/analytics
+TEAM_ANALYTICS_RANGES = (4, 12, 26, 52)
+
+
+@router.get("/admin/analytics")
+async def team_analytics_page(
+    request: Request,
+    weeks: int = Query(12, ge=1, le=104),
+    db: Session = Depends(get_db)
+):
+    user = get_current_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+    
+    if not user.is_admin:
+        return RedirectResponse(url="/", status_code=302)
+    
+    return templates.TemplateResponse("admin_analytics.html", {
+        "request": request,
+        "user": user,
+        "team": get_team_analytics(db, weeks_back=weeks),
+        "ranges": TEAM_ANALYTICS_RANGES,
+        "active_page": "admin",
+        "sidebar_stats": SidebarStats(db, user)
+    })
+
+
+@router.get("/admin/slow-queries")
+async def slow_queries_page(request: Request, db: Session = Depends(get_db)):
+    user = get_current_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+    
+    if not user.is_admin:
+        return RedirectResponse(url="/", status_code=302)
+    
+    return templates.TemplateResponse("admin_slow_queries.html", {
+        "request": request,
+        "user": user,
+        "entries": slow_query_log.entries(),
+        "threshold_ms": slow_query_log.threshold * 1000,
+        "active_page": "admin",
+        "sidebar_stats": SidebarStats(db, user)
+    })
+
+
+@router.post("/admin/slow-queries/clear")
+async def clear_slow_queries(request: Request, db: Session = Depends(get_db)):
+    user = get_current_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+    
+    if not user.is_admin:
+        return RedirectResponse(url="/", status_code=302)
+    
+    slow_query_log.clear()
+    return RedirectResponse(url="/admin/slow-queries", status_code=302)
+
+
 @router.post("/admin/delete-user/{user_id}")
 async def delete_user_handler(
     user_id: str,
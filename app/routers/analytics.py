@@ -1,14 +1,41 @@
+from typing import Optional, Tuple
+from uuid import UUID
 from fastapi import APIRouter, Depends, Request
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
+from app.budgets import BudgetExceeded, query_budget, staged_deadlines
 from app.database import get_db
-from app.services.analytics import get_analytics_data
-from app.middleware import get_current_week_stats
+from app.services.analytics import empty_analytics_data, get_analytics_data
+from app.middleware import SidebarStats
 from app.auth import get_current_user_from_cookie
+from app.http_cache import etag_matches, not_modified, page_etag, with_validators
+from app.serialization import JSONResponse
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+# Narrower windows tried, in order, when the requested one runs past the route's budget
+DEGRADED_WEEKS = (4, 1)
+
+
+def analytics_within_budget(
+    db: Session, route: str, weeks_back: int, user_id: Optional[UUID]
+) -> Tuple[Optional[dict], int]:
+    """Analytics for the widest window that fits the route's query budget.
+    
+    All attempts share the one budget, so a request never holds the
+    database for longer than it before degrading. Returns the data and the
+    number of weeks it actually covers, or None when even the narrowest
+    window runs over.
+    """
+    windows = [weeks_back] + [weeks for weeks in DEGRADED_WEEKS if weeks < weeks_back]
+    for weeks, deadline in zip(windows, staged_deadlines(route, len(windows))):
+        try:
+            with query_budget(db, route, deadline=deadline):
+                return get_analytics_data(db, weeks_back=weeks, user_id=user_id), weeks
+        except BudgetExceeded:
+            continue
+    return None, 0
 
 
 @router.get("/analytics")
@@ -17,13 +44,17 @@ async def analytics_page(request: Request, db: Session = Depends(get_db)):
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
-    data = get_analytics_data(db, weeks_back=12, user_id=user.id)
-    sidebar_stats = get_current_week_stats(db, user.id)
+    data, weeks = analytics_within_budget(db, "/analytics", 12, user.id)
+    if data is None:
+        data = empty_analytics_data()
+    sidebar_stats = SidebarStats(db, user)
     
     return templates.TemplateResponse("analytics.html", {
         "request": request,
         "user": user,
         "analytics": data,
+        "weeks": weeks,
+        "degraded": weeks < 12,
         "active_page": "analytics",
         "sidebar_stats": sidebar_stats
     })
@@ -33,5 +64,21 @@ async def analytics_page(request: Request, db: Session = Depends(get_db)):
 async def analytics_data(weeks: int = 12, request: Request = None, db: Session = Depends(get_db)):
     user = get_current_user_from_cookie(request, db) if request else None
     user_id = user.id if user else None
-    data = get_analytics_data(db, weeks_back=weeks, user_id=user_id)
-    return JSONResponse(content=data)
+    
+    etag = page_etag(request, user) if user else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    
+    data, covered = analytics_within_budget(db, "/api/analytics/data", weeks, user_id)
+    if data is None:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Analytics are taking too long to compute, try again shortly"},
+            headers={"Retry-After": "60"}
+        )
+    if covered < weeks:
+        # A partial result must not be revalidated as if it were the full one
+        data["degraded"] = {"weeks": covered, "requested_weeks": weeks}
+        return JSONResponse(content=data)
+    response = JSONResponse(content=data)
+    return with_validators(response, etag) if etag else response
@@ -0,0 +1,240 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.auth import require_auth
+from app.crud import (
+    get_work_week, get_work_week_by_date, create_work_week, delete_work_week,
+    get_work_weeks_page, get_work_item, create_work_item, update_work_item, delete_work_item,
+    get_work_items_page
+)
+from app.crud.work_week import update_work_week_ooo
+from app.models.user import User
+from app.pagination import decode_cursor, encode_cursor
+from app.services.search import SEARCH_PAGE_SIZE, search_work_items
+from app.schemas import WorkItemApiUpdate, WorkItemBase, WorkItemCreate, WorkWeekApiCreate, WorkWeekApiUpdate
+from app.serialization import JSONResponse
+
+router = APIRouter(prefix="/api/v1", tags=["api"])
+
+# Fields callers may request with ?fields=; the big text columns can be left out
+WEEK_FIELDS = ("id", "week_start", "week_end", "total_points", "ooo_days", "created_at", "updated_at")
+ITEM_FIELDS = (
+    "id", "week_id", "type", "title", "status", "start_date", "end_date",
+    "assigned_points", "completion_points", "planned_work", "actual_work",
+    "next_week_plan", "document_url", "created_at", "updated_at"
+)
+
+SEARCH_FIELDS = ("id", "week_id", "title", "type", "status", "assigned_points", "week_start", "rank", "snippet")
+
+# Handlers return JSONResponse themselves so rows skip FastAPI's jsonable_encoder pass
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], keys: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Split ?fields= into (columns to select, columns to return).
+    
+    The keyset columns are always selected so the next cursor can be built,
+    but only returned when asked for.
+    """
+    if not fields:
+        return list(allowed), list(allowed)
+    wanted = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in wanted if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    selected = list(dict.fromkeys(wanted + list(keys)))
+    return selected, wanted
+
+
+def page(rows: List[dict], returned: List[str], limit: int, cursor_of) -> dict:
+    """Wrap a keyset page, dropping columns that were only selected for the cursor."""
+    next_cursor = encode_cursor(cursor_of(rows[-1])) if len(rows) == limit else None
+    if rows and len(returned) < len(rows[0]):
+        rows = [{name: row[name] for name in returned} for row in rows]
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+def get_owned_week(db: Session, week_id: UUID, user: User):
+    week = get_work_week(db, week_id, user.id)
+    if not week:
+        raise HTTPException(status_code=404, detail="Work week not found")
+    return week
+
+
+def get_week_item(db: Session, week_id: UUID, item_id: UUID):
+    item = get_work_item(db, item_id)
+    if not item or item.week_id != week_id:
+        raise HTTPException(status_code=404, detail="Work item not found")
+    return item
+
+
+def week_row(db: Session, user: User, week_id: UUID) -> dict:
+    return get_work_weeks_page(db, user.id, WEEK_FIELDS, week_id=week_id, limit=1)[0]
+
+
+def item_row(db: Session, week_id: UUID, item_id: UUID) -> dict:
+    return get_work_items_page(db, week_id, ITEM_FIELDS, item_id=item_id, limit=1)[0]
+
+
+@router.get("/weeks")
+async def list_weeks(
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """List the user's weeks, newest first."""
+    selected, returned = parse_fields(fields, WEEK_FIELDS, keys=("week_start",))
+    before = None
+    if cursor:
+        try:
+            before = date.fromisoformat(decode_cursor(cursor)[0])
+        except (ValueError, TypeError, IndexError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = get_work_weeks_page(db, user.id, selected, before=before, limit=limit)
+    return JSONResponse(page(rows, returned, limit, lambda row: [row["week_start"].isoformat()]))
+
+
+@router.post("/weeks", status_code=201)
+async def create_week(body: WorkWeekApiCreate, user: User = Depends(require_auth), db: Session = Depends(get_db)):
+    """Create the week containing week_start."""
+    if body.ooo_days < 0 or body.ooo_days > 5:
+        raise HTTPException(status_code=400, detail="OOO days must be between 0 and 5")
+    monday = body.week_start - timedelta(days=body.week_start.weekday())
+    if get_work_week_by_date(db, monday, user.id):
+        raise HTTPException(status_code=409, detail="Work week already exists")
+    week = create_work_week(db, monday, monday + timedelta(days=4), user.id, ooo_days=body.ooo_days)
+    return JSONResponse(week_row(db, user, week.id), status_code=201)
+
+
+@router.get("/weeks/{week_id}")
+async def read_week(
+    week_id: UUID, fields: Optional[str] = None,
+    user: User = Depends(require_auth), db: Session = Depends(get_db)
+):
+    selected, returned = parse_fields(fields, WEEK_FIELDS, keys=())
+    rows = get_work_weeks_page(db, user.id, selected, week_id=week_id, limit=1)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Work week not found")
+    return JSONResponse(rows[0])
+
+
+@router.patch("/weeks/{week_id}")
+async def update_week(
+    week_id: UUID, body: WorkWeekApiUpdate,
+    user: User = Depends(require_auth), db: Session = Depends(get_db)
+):
+    """Change a week's OOO days, which recalculates its capacity."""
+    get_owned_week(db, week_id, user)
+    try:
+        update_work_week_ooo(db, week_id, body.ooo_days, user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(week_row(db, user, week_id))
+
+
+@router.delete("/weeks/{week_id}", status_code=204)
+async def remove_week(week_id: UUID, user: User = Depends(require_auth), db: Session = Depends(get_db)):
+    if not delete_work_week(db, week_id, user.id):
+        raise HTTPException(status_code=404, detail="Work week not found")
+    return Response(status_code=204)
+
+
+@router.get("/weeks/{week_id}/items")
+async def list_items(
+    week_id: UUID,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """List a week's items in creation order."""
+    get_owned_week(db, week_id, user)
+    selected, returned = parse_fields(fields, ITEM_FIELDS, keys=("created_at", "id"))
+    after = None
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+            after = (datetime.fromisoformat(created_at), UUID(last_id))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = get_work_items_page(db, week_id, selected, after=after, limit=limit)
+    return JSONResponse(page(rows, returned, limit, lambda row: [row["created_at"].isoformat(), str(row["id"])]))
+
+
+@router.post("/weeks/{week_id}/items", status_code=201)
+async def create_item(
+    week_id: UUID, body: WorkItemBase,
+    user: User = Depends(require_auth), db: Session = Depends(get_db)
+):
+    get_owned_week(db, week_id, user)
+    try:
+        item = create_work_item(db, WorkItemCreate(week_id=week_id, **body.model_dump()))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(item_row(db, week_id, item.id), status_code=201)
+
+
+@router.get("/weeks/{week_id}/items/{item_id}")
+async def read_item(
+    week_id: UUID, item_id: UUID, fields: Optional[str] = None,
+    user: User = Depends(require_auth), db: Session = Depends(get_db)
+):
+    get_owned_week(db, week_id, user)
+    selected, returned = parse_fields(fields, ITEM_FIELDS, keys=())
+    rows = get_work_items_page(db, week_id, selected, item_id=item_id, limit=1)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Work item not found")
+    return JSONResponse(rows[0])
+
+
+@router.patch("/weeks/{week_id}/items/{item_id}")
+async def patch_item(
+    week_id: UUID, item_id: UUID, body: WorkItemApiUpdate,
+    user: User = Depends(require_auth), db: Session = Depends(get_db)
+):
+    """Update only the fields present in the request body."""
+    get_owned_week(db, week_id, user)
+    get_week_item(db, week_id, item_id)
+    try:
+        update_work_item(db, item_id, body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(item_row(db, week_id, item_id))
+
+
+@router.delete("/weeks/{week_id}/items/{item_id}", status_code=204)
+async def remove_item(
+    week_id: UUID, item_id: UUID,
+    user: User = Depends(require_auth), db: Session = Depends(get_db)
+):
+    get_owned_week(db, week_id, user)
+    get_week_item(db, week_id, item_id)
+    delete_work_item(db, item_id)
+    return Response(status_code=204)
+
+
+@router.get("/search")
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over the user's items, best match first. Snippets are HTML."""
+    after = None
+    if cursor:
+        try:
+            rank, last_id = decode_cursor(cursor)
+            after = (float(rank), UUID(last_id))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = search_work_items(db, user.id, q, after=after, limit=limit)
+    return JSONResponse(page(rows, SEARCH_FIELDS, limit, lambda row: [row["rank"], str(row["id"])]))
@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Depends, Request, Form, HTTPException
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.crud.user import get_user_by_email, create_user, authenticate_user
 from app.auth import set_session_cookie, clear_session_cookie, get_current_user_from_cookie
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/login")
@@ -1,16 +1,16 @@
 from datetime import date, timedelta
 from fastapi import APIRouter, Depends, Request
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.crud import get_or_create_work_week, get_work_items_by_week
 from app.crud.work_item import get_pending_items_for_user
-from app.middleware import get_current_week_stats
+from app.middleware import SidebarStats
 from app.auth import get_current_user_from_cookie
+from app.http_cache import etag_matches, not_modified, page_etag, with_validators
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/")
@@ -20,6 +20,10 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
         if not user:
             return RedirectResponse(url="/login", status_code=302)
         
+        etag = page_etag(request, user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         today = date.today()
         monday = today - timedelta(days=today.weekday())
         
@@ -37,9 +41,9 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
         pending_items = get_pending_items_for_user(db, monday, user.id)
         
         # Get sidebar stats
-        sidebar_stats = get_current_week_stats(db, user.id)
+        sidebar_stats = SidebarStats(db, user)
         
-        return templates.TemplateResponse("dashboard.html", {
+        return with_validators(templates.TemplateResponse("dashboard.html", {
             "request": request,
             "user": user,
             "current_week": current_week,
@@ -52,7 +56,7 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
             "pending_items": pending_items,
             "active_page": "dashboard",
             "sidebar_stats": sidebar_stats
-        })
+        }), etag)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
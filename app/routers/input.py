@@ -1,61 +1,108 @@
+from contextlib import contextmanager
 from datetime import date, timedelta
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, Form, HTTPException
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Request, Form, HTTPException, Query
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-from collections import OrderedDict
-import time
 from app.database import get_db
 from app.crud import (
     get_or_create_work_week, get_work_week_by_date, get_work_weeks,
     get_work_items_by_week, create_work_item, update_work_item, delete_work_item,
-    get_work_item
+    get_work_item, get_week_points
 )
 from app.crud.work_week import update_work_week_ooo
 from app.schemas import WorkItemCreate, WorkItemUpdate
 from app.models.work_item import TaskType, TaskStatus
-from app.middleware import get_current_week_stats
+from app.middleware import SidebarStats
 from app.auth import get_current_user_from_cookie
+from app.http_cache import etag_matches, not_modified, page_etag, with_validators
+from app.serialization import JSONResponse, dumps
+from app.services.idempotency import PENDING, idempotency_store
+from app.services.search import suggest_titles
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
-# Simple idempotency cache with TTL (5 minutes)
-# Stores: {idempotency_key: (timestamp, redirect_url)}
-_idempotency_cache: OrderedDict = OrderedDict()
-_IDEMPOTENCY_TTL = 300  # 5 minutes
+def parse_date(date_str: str) -> date:
+    return date.fromisoformat(date_str)
 
-def check_idempotency(key: str) -> Optional[str]:
-    """Check if request is duplicate. Returns redirect URL if duplicate, None otherwise."""
-    if not key:
-        return None
-    
-    # Clean expired entries
-    now = time.time()
-    while _idempotency_cache:
-        oldest_key, (ts, _) = next(iter(_idempotency_cache.items()))
-        if now - ts > _IDEMPOTENCY_TTL:
-            _idempotency_cache.pop(oldest_key)
-        else:
-            break
-    
-    # Check if key exists
-    if key in _idempotency_cache:
-        _, redirect_url = _idempotency_cache[key]
-        return redirect_url
-    
-    return None
 
-def store_idempotency(key: str, redirect_url: str):
-    """Store idempotency key with result."""
+def serialize_item(item) -> dict:
+    """Work item as the input page script sees it; dumps encodes the UUID and dates."""
+    return {
+        "id": item.id,
+        "type": item.type,
+        "title": item.title,
+        "start_date": item.start_date,
+        "end_date": item.end_date,
+        "assigned_points": item.assigned_points,
+        "completion_points": item.completion_points,
+        "planned_work": item.planned_work,
+        "actual_work": item.actual_work,
+        "next_week_plan": item.next_week_plan,
+        "document_url": item.document_url,
+        "status": item.status
+    }
+
+
+def wants_json(request: Request) -> bool:
+    """True when the input page script asked for a partial update instead of a redirect."""
+    return "application/json" in request.headers.get("accept", "")
+
+
+def item_change_payload(db: Session, week_id: UUID, item=None, deleted_id: UUID = None) -> dict:
+    """Changed item card plus the week's new totals, for patching the page in place."""
+    payload = {"points": get_week_points(db, week_id)}
+    if item is not None:
+        payload["item"] = serialize_item(item)
+        payload["html"] = templates.get_template("partials/work_item.html").render(item=item)
+    if deleted_id is not None:
+        payload["deleted"] = str(deleted_id)
+    return payload
+
+
+def idempotency_scope(user, key: Optional[str]) -> Optional[str]:
+    """Namespace a client-supplied key by user so keys never collide across accounts."""
+    return f"{user.id}:{key}" if key else None
+
+
+def finish_item_change(request: Request, db: Session, key: Optional[str], redirect_url: str, week_id: UUID, item=None):
+    """Build the response for a completed change and store it under the idempotency key."""
+    payload = item_change_payload(db, week_id, item=item) if wants_json(request) else None
     if key:
-        _idempotency_cache[key] = (time.time(), redirect_url)
+        idempotency_store.complete(db, key, {"redirect": redirect_url, "json": payload})
+    if payload is not None:
+        return JSONResponse(payload)
+    return RedirectResponse(url=redirect_url, status_code=302)
 
 
-def parse_date(date_str: str) -> date:
-    return date.fromisoformat(date_str)
+@contextmanager
+def released_on_failure(db: Session, key: Optional[str]):
+    """Release a claimed idempotency key if the change fails in any way.
+
+    Otherwise the key stays PENDING for its whole TTL and every retry of the
+    submission is answered 409.
+    """
+    try:
+        yield
+    except BaseException:
+        if key:
+            try:
+                db.rollback()
+                idempotency_store.release(db, key)
+            except Exception:
+                pass  # the key expires with its TTL instead
+        raise
+
+
+def replay_item_change(request: Request, stored: dict):
+    """Answer a retried submission with the response the first attempt produced."""
+    if stored is PENDING:
+        raise HTTPException(status_code=409, detail="This submission is still being processed")
+    if wants_json(request):
+        return JSONResponse(stored["json"] if stored.get("json") else {"redirect": stored["redirect"]})
+    return RedirectResponse(url=stored["redirect"], status_code=302)
 
 
 @router.get("/input")
@@ -75,6 +122,11 @@ async def input_page_for_week(request: Request, week_start: str, db: Session = D
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
+    # Revisiting an unchanged week costs only the user lookup
+    etag = page_etag(request, user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     week_start_date = parse_date(week_start)
     week = get_or_create_work_week(db, week_start_date, user.id)
     items = get_work_items_by_week(db, week.id)
@@ -92,38 +144,20 @@ async def input_page_for_week(request: Request, week_start: str, db: Session = D
     prev_week = week.week_start - timedelta(days=7)
     next_week = week.week_start + timedelta(days=7)
     
-    # Convert items to JSON-serializable format for JavaScript
-    items_json = [
-        {
-            "id": str(item.id),
-            "type": item.type,
-            "title": item.title,
-            "start_date": item.start_date.isoformat() if item.start_date else None,
-            "end_date": item.end_date.isoformat() if item.end_date else None,
-            "assigned_points": item.assigned_points,
-            "completion_points": item.completion_points,
-            "planned_work": item.planned_work,
-            "actual_work": item.actual_work,
-            "next_week_plan": item.next_week_plan,
-            "document_url": item.document_url,
-            "status": item.status
-        }
-        for item in items
-    ]
-    
     # Get sidebar stats
-    sidebar_stats = get_current_week_stats(db, user.id)
+    sidebar_stats = SidebarStats(db, user)
     
     # Detect if this is a future week (for planning mode)
     today = date.today()
     is_future_week = week.week_start > today
     
-    return templates.TemplateResponse("input.html", {
+    return with_validators(templates.TemplateResponse("input.html", {
         "request": request,
         "user": user,
         "week": week,
         "items": items,
-        "items_json": items_json,
+        # Serialized once here; the template's tojson embeds the bytes as-is
+        "page_data": dumps({"items": [serialize_item(item) for item in items], "is_future_week": is_future_week}),
         "all_weeks": all_weeks,
         "planned_points": planned_points,
         "unplanned_points": unplanned_points,
@@ -137,7 +171,7 @@ async def input_page_for_week(request: Request, week_start: str, db: Session = D
         "active_page": "input",
         "sidebar_stats": sidebar_stats,
         "is_future_week": is_future_week
-    })
+    }), etag)
 
 
 def parse_int_or_none(value) -> Optional[int]:
@@ -147,6 +181,21 @@ def parse_int_or_none(value) -> Optional[int]:
     return int(value)
 
 
+@router.get("/api/titles/suggest")
+async def title_suggestions(
+    request: Request,
+    q: str = Query("", max_length=255),
+    limit: int = Query(8, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """Past titles matching what is typed in the add form, with their last type and points."""
+    user = get_current_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+    
+    return JSONResponse({"suggestions": suggest_titles(db, user.id, q, limit=limit)})
+
+
 @router.post("/api/work-items")
 async def create_item(
     request: Request,
@@ -169,38 +218,36 @@ async def create_item(
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
-    # Check for duplicate submission
-    cached_redirect = check_idempotency(idempotency_key)
-    if cached_redirect:
-        return RedirectResponse(url=cached_redirect, status_code=302)
+    # A retried submission is answered with the stored response, on any worker
+    key = idempotency_scope(user, idempotency_key)
+    if key:
+        stored = idempotency_store.claim(db, key)
+        if stored is not None:
+            return replay_item_change(request, stored)
     
-    try:
-        item_data = WorkItemCreate(
-            week_id=week_id,
-            type=TaskType(type),
-            title=title,
-            assigned_points=int(assigned_points) if assigned_points else 0,
-            start_date=parse_date(start_date) if start_date else None,
-            end_date=parse_date(end_date) if end_date else None,
-            planned_work=planned_work or None,
-            actual_work=actual_work or None,
-            next_week_plan=next_week_plan or None,
-            document_url=document_url or None,
-            completion_points=parse_int_or_none(completion_points),
-            status=TaskStatus(status)
-        )
-        create_work_item(db, item_data)
+    with released_on_failure(db, key):
+        try:
+            item_data = WorkItemCreate(
+                week_id=week_id,
+                type=TaskType(type),
+                title=title,
+                assigned_points=int(assigned_points) if assigned_points else 0,
+                start_date=parse_date(start_date) if start_date else None,
+                end_date=parse_date(end_date) if end_date else None,
+                planned_work=planned_work or None,
+                actual_work=actual_work or None,
+                next_week_plan=next_week_plan or None,
+                document_url=document_url or None,
+                completion_points=parse_int_or_none(completion_points),
+                status=TaskStatus(status)
+            )
+            item = create_work_item(db, item_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Get week to redirect back
         week = db.query(WorkWeek).filter(WorkWeek.id == week_id).first()
-        redirect_url = f"/input/{week.week_start}"
-        
-        # Store idempotency key
-        store_idempotency(idempotency_key, redirect_url)
-        
-        return RedirectResponse(url=redirect_url, status_code=302)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return finish_item_change(request, db, key, f"/input/{week.week_start}", week_id, item=item)
 
 
 @router.post("/api/work-items/{item_id}")
@@ -225,37 +272,35 @@ async def update_item(
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
-    # Check for duplicate submission
-    cached_redirect = check_idempotency(idempotency_key)
-    if cached_redirect:
-        return RedirectResponse(url=cached_redirect, status_code=302)
+    # A retried submission is answered with the stored response, on any worker
+    key = idempotency_scope(user, idempotency_key)
+    if key:
+        stored = idempotency_store.claim(db, key)
+        if stored is not None:
+            return replay_item_change(request, stored)
     
-    try:
-        item_data = WorkItemUpdate(
-            type=TaskType(type),
-            title=title,
-            assigned_points=int(assigned_points) if assigned_points else 0,
-            start_date=parse_date(start_date) if start_date else None,
-            end_date=parse_date(end_date) if end_date else None,
-            planned_work=planned_work or None,
-            actual_work=actual_work or None,
-            next_week_plan=next_week_plan or None,
-            document_url=document_url or None,
-            completion_points=parse_int_or_none(completion_points),
-            status=TaskStatus(status)
-        )
-        item = update_work_item(db, item_id, item_data)
+    with released_on_failure(db, key):
+        try:
+            item_data = WorkItemUpdate(
+                type=TaskType(type),
+                title=title,
+                assigned_points=int(assigned_points) if assigned_points else 0,
+                start_date=parse_date(start_date) if start_date else None,
+                end_date=parse_date(end_date) if end_date else None,
+                planned_work=planned_work or None,
+                actual_work=actual_work or None,
+                next_week_plan=next_week_plan or None,
+                document_url=document_url or None,
+                completion_points=parse_int_or_none(completion_points),
+                status=TaskStatus(status)
+            )
+            item = update_work_item(db, item_id, item_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         if not item:
             raise HTTPException(status_code=404, detail="Item not found")
         
-        redirect_url = f"/input/{item.work_week.week_start}"
-        
-        # Store idempotency key
-        store_idempotency(idempotency_key, redirect_url)
-        
-        return RedirectResponse(url=redirect_url, status_code=302)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return finish_item_change(request, db, key, f"/input/{item.work_week.week_start}", item.week_id, item=item)
 
 
 @router.post("/api/work-items/{item_id}/delete")
@@ -268,9 +313,12 @@ async def delete_item(item_id: UUID, request: Request, db: Session = Depends(get
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     
+    week_id = item.week_id
     week_start = item.work_week.week_start
     delete_work_item(db, item_id)
     
+    if wants_json(request):
+        return JSONResponse(item_change_payload(db, week_id, deleted_id=item_id))
     return RedirectResponse(url=f"/input/{week_start}", status_code=302)
 
 
@@ -296,21 +344,11 @@ async def update_week_ooo(
     if not week:
         raise HTTPException(status_code=404, detail="Work week not found")
     
-    # Calculate new total_points
-    new_total_points = (5 - ooo_days) * 20
-    
-    # Check if existing work items exceed new capacity
-    items = get_work_items_by_week(db, week_id)
-    current_points = sum(item.assigned_points for item in items)
-    
-    if current_points > new_total_points:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot set {ooo_days} OOO days. Current work items total {current_points} points, but only {new_total_points} points available."
-        )
-    
-    # Update OOO days
-    updated_week = update_work_week_ooo(db, week_id, ooo_days, user.id)
+    # Update OOO days; rejected if existing work items exceed the new capacity
+    try:
+        updated_week = update_work_week_ooo(db, week_id, ooo_days, user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated_week:
         raise HTTPException(status_code=500, detail="Failed to update OOO days")
     
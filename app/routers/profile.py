@@ -1,14 +1,13 @@
 from fastapi import APIRouter, Depends, Request, Form
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.auth import get_current_user_from_cookie
 from app.crud.user import verify_password, change_password, get_user_stats
-from app.middleware import get_current_week_stats
+from app.middleware import SidebarStats
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/profile")
@@ -18,7 +17,7 @@ async def profile_page(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/login", status_code=302)
     
     stats = get_user_stats(db, user.id)
-    sidebar_stats = get_current_week_stats(db, user.id)
+    sidebar_stats = SidebarStats(db, user)
     
     return templates.TemplateResponse("profile.html", {
         "request": request,
@@ -44,7 +43,7 @@ async def change_password_handler(
         return RedirectResponse(url="/login", status_code=302)
     
     stats = get_user_stats(db, user.id)
-    sidebar_stats = get_current_week_stats(db, user.id)
+    sidebar_stats = SidebarStats(db, user)
     
     # Verify current password
     if not verify_password(current_password, user.password_hash):
@@ -1,18 +1,35 @@
 from datetime import date
-from typing import Optional
-from fastapi import APIRouter, Depends, Request, Query
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import Response, RedirectResponse
+from typing import Callable, Iterable, Optional, Union
+from uuid import UUID
+from fastapi import APIRouter, Depends, Request, Query, HTTPException
+from fastapi.responses import Response, RedirectResponse, FileResponse
 from sqlalchemy.orm import Session
+from app.budgets import BudgetExceeded, query_budget
 from app.database import get_db
-from app.services.export import export_to_csv, export_to_excel, get_filtered_items
+from app.services.export import (
+    export_to_csv, export_to_excel, get_filtered_items, iter_export_batches,
+    stream_parquet, stream_arrow, stream_ndjson
+)
 from app.models.work_item import TaskType, TaskStatus
 from app.crud import get_work_weeks
-from app.middleware import get_current_week_stats
+from app.middleware import SidebarStats
 from app.auth import get_current_user_from_cookie
+from app.http_cache import etag_matches, not_modified, page_etag, with_validators, PRIVATE_CACHE_CONTROL
+from app.services.export_cache import export_cache
+from app.services.search import SEARCH_PAGE_SIZE, search_work_items
+from app.metrics import export_timer, record_cache
+from app.pagination import decode_cursor, encode_cursor
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+
+# Columnar export formats: (encoder, media type, file extension)
+COLUMNAR_FORMATS = {
+    "parquet": (stream_parquet, "application/vnd.apache.parquet", "parquet"),
+    "arrow": (stream_arrow, "application/vnd.apache.arrow.stream", "arrows"),
+    "ndjson": (stream_ndjson, "application/x-ndjson", "ndjson"),
+}
 
 
 def parse_date_optional(date_str: Optional[str]) -> Optional[date]:
@@ -34,14 +51,24 @@ async def reports_page(
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
-    items = get_filtered_items(
-        db,
-        parse_date_optional(start_date),
-        parse_date_optional(end_date),
-        task_type,
-        status,
-        user_id=user.id
-    )
+    etag = page_etag(request, user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    try:
+        with query_budget(db, "/reports"):
+            items = get_filtered_items(
+                db,
+                parse_date_optional(start_date),
+                parse_date_optional(end_date),
+                task_type,
+                status,
+                user_id=user.id
+            )
+        degraded = False
+    except BudgetExceeded:
+        items = []
+        degraded = True
     
     # Calculate summary stats
     total_points = sum(item["Assigned Points"] for item in items)
@@ -52,12 +79,13 @@ async def reports_page(
         status_counts[item["Status"]] = status_counts.get(item["Status"], 0) + 1
     
     all_weeks = get_work_weeks(db, user.id, limit=52)
-    sidebar_stats = get_current_week_stats(db, user.id)
+    sidebar_stats = SidebarStats(db, user)
     
-    return templates.TemplateResponse("reports.html", {
+    response = templates.TemplateResponse("reports.html", {
         "request": request,
         "user": user,
         "items": items,
+        "degraded": degraded,
         "total_items": len(items),
         "total_points": total_points,
         "type_counts": type_counts,
@@ -74,6 +102,95 @@ async def reports_page(
         "active_page": "reports",
         "sidebar_stats": sidebar_stats
     })
+    # An empty page standing in for one that timed out must not be revalidated
+    return response if degraded else with_validators(response, etag)
+
+
+@router.get("/search")
+async def search_page(
+    request: Request,
+    q: str = Query("", max_length=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    user = get_current_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+    
+    results = []
+    next_cursor = None
+    if q.strip():
+        after = None
+        if cursor:
+            try:
+                rank, last_id = decode_cursor(cursor)
+                after = (float(rank), UUID(last_id))
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        results = search_work_items(db, user.id, q, after=after, limit=SEARCH_PAGE_SIZE)
+        if len(results) == SEARCH_PAGE_SIZE:
+            next_cursor = encode_cursor([results[-1]["rank"], str(results[-1]["id"])])
+    
+    sidebar_stats = SidebarStats(db, user)
+    
+    return templates.TemplateResponse("search.html", {
+        "request": request,
+        "user": user,
+        "q": q,
+        "results": results,
+        "next_cursor": next_cursor,
+        "active_page": "reports",
+        "sidebar_stats": sidebar_stats
+    })
+
+
+def cached_export_response(
+    request: Request,
+    db: Session,
+    route: str,
+    user,
+    export_format: str,
+    filters: dict,
+    build: Callable[[], Union[bytes, Iterable[bytes]]],
+    media_type: str,
+    extension: str
+) -> Response:
+    """Serve an export from the disk cache, generating it on a miss.
+    
+    The ETag is the cache key, so a client holding the current file gets a
+    304 without the export being generated or read from disk. Generation
+    runs under the route's query budget; an export that cannot be built
+    within it is a 503 asking for a narrower date range.
+    """
+    key = export_cache.make_key(user.id, user.data_version, export_format, filters)
+    etag = f'"{key}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    path = export_cache.get(key)
+    record_cache("export", path is not None)
+    if path is None:
+        try:
+            with export_timer(export_format), query_budget(db, route):
+                path = export_cache.put(key, build())
+        except BudgetExceeded:
+            raise HTTPException(
+                status_code=503,
+                detail="This export is too large to generate right now; narrow the date range and try again",
+                headers={"Retry-After": "60"}
+            )
+    
+    filename = f"work_tracker_export_{date.today().strftime('%Y%m%d')}.{extension}"
+    
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "ETag": etag,
+            "Cache-Control": PRIVATE_CACHE_CONTROL
+        }
+    )
 
 
 @router.get("/reports/export/csv")
@@ -89,22 +206,18 @@ async def export_csv(
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
-    csv_data = export_to_csv(
-        db,
-        parse_date_optional(start_date),
-        parse_date_optional(end_date),
-        task_type,
-        status,
-        user_id=user.id
-    )
+    def build():
+        return export_to_csv(
+            db,
+            parse_date_optional(start_date),
+            parse_date_optional(end_date),
+            task_type,
+            status,
+            user_id=user.id
+        ).encode("utf-8")
     
-    filename = f"work_tracker_export_{date.today().strftime('%Y%m%d')}.csv"
-    
-    return Response(
-        content=csv_data,
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    filters = {"start_date": start_date, "end_date": end_date, "task_type": task_type, "status": status}
+    return cached_export_response(request, db, "/reports/export/csv", user, "csv", filters, build, "text/csv", "csv")
 
 
 @router.get("/reports/export/excel")
@@ -120,19 +233,53 @@ async def export_excel(
     if not user:
         return RedirectResponse(url="/login", status_code=302)
     
-    excel_data = export_to_excel(
-        db,
-        parse_date_optional(start_date),
-        parse_date_optional(end_date),
-        task_type,
-        status,
-        user_id=user.id
+    def build():
+        return export_to_excel(
+            db,
+            parse_date_optional(start_date),
+            parse_date_optional(end_date),
+            task_type,
+            status,
+            user_id=user.id
+        )
+    
+    filters = {"start_date": start_date, "end_date": end_date, "task_type": task_type, "status": status}
+    return cached_export_response(
+        request, db, "/reports/export/excel", user, "excel", filters, build,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"
     )
+
+
+@router.get("/reports/export/{export_format}")
+async def export_columnar(
+    request: Request,
+    export_format: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    task_type: Optional[str] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    user = get_current_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=302)
+    
+    if export_format not in COLUMNAR_FORMATS:
+        raise HTTPException(status_code=404, detail="Unknown export format")
+    encoder, media_type, extension = COLUMNAR_FORMATS[export_format]
     
-    filename = f"work_tracker_export_{date.today().strftime('%Y%m%d')}.xlsx"
+    def build():
+        # Record batches are encoded into the cache file one at a time
+        return encoder(iter_export_batches(
+            db,
+            parse_date_optional(start_date),
+            parse_date_optional(end_date),
+            task_type,
+            status,
+            user_id=user.id
+        ))
     
-    return Response(
-        content=excel_data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    filters = {"start_date": start_date, "end_date": end_date, "task_type": task_type, "status": status}
+    return cached_export_response(
+        request, db, "/reports/export/{export_format}", user, export_format, filters, build, media_type, extension
     )
@@ -1,9 +1,11 @@
-from app.schemas.work_week import WorkWeekCreate, WorkWeekUpdate, WorkWeekResponse
-from app.schemas.work_item import WorkItemCreate, WorkItemUpdate, WorkItemResponse
+from app.schemas.work_week import (
+    WorkWeekCreate, WorkWeekUpdate, WorkWeekResponse, WorkWeekApiCreate, WorkWeekApiUpdate
+)
+from app.schemas.work_item import WorkItemBase, WorkItemCreate, WorkItemUpdate, WorkItemApiUpdate, WorkItemResponse
 from app.schemas.user import UserCreate, UserLogin, UserUpdate, UserResponse, PasswordChange, UserWithStats
 
 __all__ = [
-    "WorkWeekCreate", "WorkWeekUpdate", "WorkWeekResponse",
-    "WorkItemCreate", "WorkItemUpdate", "WorkItemResponse",
+    "WorkWeekCreate", "WorkWeekUpdate", "WorkWeekResponse", "WorkWeekApiCreate", "WorkWeekApiUpdate",
+    "WorkItemBase", "WorkItemCreate", "WorkItemUpdate", "WorkItemApiUpdate", "WorkItemResponse",
     "UserCreate", "UserLogin", "UserUpdate", "UserResponse", "PasswordChange", "UserWithStats"
 ]
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from uuid import UUID
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from app.models.work_item import TaskType, TaskStatus
 
 
@@ -37,6 +37,20 @@ class WorkItemUpdate(BaseModel):
     status: Optional[TaskStatus] = None
 
 
+class WorkItemApiUpdate(WorkItemUpdate):
+    """PATCH body: omitted fields are left alone, but NOT NULL columns cannot be set to null."""
+
+    @model_validator(mode="after")
+    def required_fields_not_null(self):
+        nulls = [
+            field for field in ("title", "type", "status", "assigned_points")
+            if field in self.model_fields_set and getattr(self, field) is None
+        ]
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
+
+
 class WorkItemResponse(WorkItemBase):
     id: UUID
     week_id: UUID
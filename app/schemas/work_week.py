@@ -18,6 +18,15 @@ class WorkWeekUpdate(BaseModel):
     total_points: Optional[int] = None
 
 
+class WorkWeekApiCreate(BaseModel):
+    week_start: date
+    ooo_days: int = 0
+
+
+class WorkWeekApiUpdate(BaseModel):
+    ooo_days: int
+
+
 class WorkWeekResponse(WorkWeekBase):
     id: UUID
     created_at: datetime
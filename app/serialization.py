@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import Any
+import orjson
+from markupsafe import Markup
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+# UUID, date, datetime and str enums are encoded natively; dict keys may be non-strings
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "_asdict"):
+        return value._asdict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize to compact JSON bytes; the one encoder for responses and templates."""
+    return orjson.dumps(value, default=_default, option=DUMPS_OPTIONS)
+
+
+class JSONResponse(StarletteJSONResponse):
+    """Default response class: renders content with orjson instead of stdlib json."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def tojson(value: Any) -> Markup:
+    """Jinja ``tojson`` replacement that is safe inside ``<script>`` blocks.
+    
+    Bytes are taken as already-serialized JSON, so routes can embed page data
+    they encoded once with ``dumps`` without a second pass.
+    """
+    data = value if isinstance(value, bytes) else dumps(value)
+    return Markup(
+        data.decode("utf-8")
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+        .replace("'", "\\u0027")
+    )
@@ -1,7 +1,7 @@
 from datetime import date, timedelta
 from uuid import UUID
 from typing import Dict, List, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import func
 from app.models.work_week import WorkWeek
 from app.models.work_item import WorkItem, TaskType, TaskStatus
@@ -12,17 +12,18 @@ def get_analytics_data(db: Session, weeks_back: int = 12, user_id: Optional[UUID
     end_date = date.today()
     start_date = end_date - timedelta(weeks=weeks_back)
     
-    # Base query for weeks
-    weeks_query = db.query(WorkWeek).filter(WorkWeek.week_start >= start_date)
+    # Weeks with their used points, summed in one grouped query
+    used_points = func.coalesce(func.sum(WorkItem.assigned_points), 0).label("used")
+    weeks_query = db.query(WorkWeek, used_points).outerjoin(
+        WorkItem, WorkItem.week_id == WorkWeek.id
+    ).filter(WorkWeek.week_start >= start_date)
     if user_id:
         weeks_query = weeks_query.filter(WorkWeek.user_id == user_id)
-    weeks = weeks_query.order_by(WorkWeek.week_start).all()
+    weeks = weeks_query.group_by(WorkWeek.id).order_by(WorkWeek.week_start).all()
     
     # Points trend data
     points_trend = []
-    for week in weeks:
-        items = db.query(WorkItem).filter(WorkItem.week_id == week.id).all()
-        total_used = sum(item.assigned_points for item in items)
+    for week, total_used in weeks:
         total_points = week.total_points
         points_trend.append({
             "week": week.week_start.strftime("%m/%d"),
@@ -64,7 +65,9 @@ def get_analytics_data(db: Session, weeks_back: int = 12, user_id: Optional[UUID
     today = date.today()
     monday = today - timedelta(days=today.weekday())
     
-    carry_query = db.query(WorkItem).join(WorkWeek).filter(
+    carry_query = db.query(WorkItem).join(WorkItem.work_week).options(
+        contains_eager(WorkItem.work_week)
+    ).filter(
         WorkItem.status.in_([TaskStatus.DELAYED.value, TaskStatus.IN_PROGRESS.value]),
         WorkWeek.week_end < monday
     )
@@ -91,3 +94,13 @@ def get_analytics_data(db: Session, weeks_back: int = 12, user_id: Optional[UUID
         "status_breakdown": status_breakdown,
         "carry_over": carry_over_data
     }
+
+
+def empty_analytics_data() -> Dict[str, Any]:
+    """Analytics with every chart empty, for when none could be computed in time."""
+    return {
+        "points_trend": [],
+        "type_distribution": {t.value: {"count": 0, "points": 0} for t in TaskType},
+        "status_breakdown": {s.value: 0 for s in TaskStatus},
+        "carry_over": []
+    }
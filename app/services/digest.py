@@ -0,0 +1,121 @@
+import os
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.work_week import WorkWeek
+from app.models.work_item import WorkItem, TaskStatus
+
+DIGEST_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "digest")
+
+# Unfinished work that rolls into the new week, as on the dashboard
+CARRY_OVER_STATUSES = (TaskStatus.DELAYED.value, TaskStatus.IN_PROGRESS.value, TaskStatus.TODO.value)
+
+_environment: Optional[Environment] = None
+
+
+def digest_week_start(today: Optional[date] = None) -> date:
+    """Monday of last week, the week a digest run on any day of this week covers."""
+    today = today or date.today()
+    return today - timedelta(days=today.weekday(), weeks=1)
+
+
+def iter_user_chunks(db: Session, chunk_size: int, after: Optional[UUID] = None) -> Iterator[List[Tuple[UUID, str]]]:
+    """(id, email) of every user after the given id, in id order, chunk_size at a time."""
+    while True:
+        statement = select(User.id, User.email).order_by(User.id).limit(chunk_size)
+        if after is not None:
+            statement = statement.where(User.id > after)
+        chunk = [tuple(row) for row in db.execute(statement).all()]
+        if not chunk:
+            return
+        yield chunk
+        after = chunk[-1][0]
+
+
+def load_digests(db: Session, users: List[Tuple[UUID, str]], week_start: date) -> List[dict]:
+    """Digest data for a chunk of users, in two queries whatever the chunk size.
+
+    Returns plain dicts (no ORM objects) so they can be sent to other processes.
+    Users with no week recorded get a digest with week set to None.
+    """
+    user_ids = [user_id for user_id, _ in users]
+    weeks = {
+        week.user_id: week
+        for week in db.execute(select(
+            WorkWeek.id, WorkWeek.user_id, WorkWeek.week_end, WorkWeek.total_points, WorkWeek.ooo_days
+        ).where(WorkWeek.user_id.in_(user_ids), WorkWeek.week_start == week_start)).all()
+    }
+
+    items_by_week: Dict[UUID, list] = {}
+    if weeks:
+        rows = db.execute(select(
+            WorkItem.week_id, WorkItem.title, WorkItem.type, WorkItem.status, WorkItem.assigned_points,
+            WorkItem.completion_points, WorkItem.actual_work, WorkItem.next_week_plan
+        ).where(
+            WorkItem.week_id.in_([week.id for week in weeks.values()])
+        ).order_by(WorkItem.week_id, WorkItem.type, WorkItem.created_at)).all()
+        for row in rows:
+            item = row._asdict()
+            items_by_week.setdefault(item.pop("week_id"), []).append(item)
+
+    digests = []
+    for user_id, email in users:
+        week = weeks.get(user_id)
+        items = items_by_week.get(week.id, []) if week else []
+        assigned = sum(item["assigned_points"] for item in items)
+        completed = sum(item["completion_points"] or 0 for item in items)
+        digests.append({
+            "user_id": str(user_id),
+            "email": email,
+            "week_start": week_start,
+            "week": {
+                "week_end": week.week_end,
+                "total_points": week.total_points,
+                "ooo_days": week.ooo_days,
+            } if week else None,
+            "work_items": items,
+            "assigned": assigned,
+            "completed": completed,
+            "completion_rate": completed / assigned if assigned else None,
+            "carry_overs": [item for item in items if item["status"] in CARRY_OVER_STATUSES],
+            "next_week": [item for item in items if item["next_week_plan"]],
+        })
+    return digests
+
+
+def _get_environment() -> Environment:
+    # One per process: digests are rendered in worker processes
+    global _environment
+    if _environment is None:
+        _environment = Environment(
+            loader=FileSystemLoader(DIGEST_TEMPLATE_DIR),
+            autoescape=select_autoescape(["html"]),
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+    return _environment
+
+
+def render_digest(digest: dict) -> Tuple[str, str]:
+    """The digest as (HTML, Markdown)."""
+    env = _get_environment()
+    return env.get_template("weekly.html").render(d=digest), env.get_template("weekly.md").render(d=digest)
+
+
+def write_digests(directory: str, digests: List[dict]) -> int:
+    """Render each digest to <user_id>.html and <user_id>.md in directory.
+
+    Files are written under a temporary name and renamed, so an interrupted
+    run never leaves a truncated digest behind. Returns the number written.
+    """
+    for digest in digests:
+        for extension, content in zip(("html", "md"), render_digest(digest)):
+            path = os.path.join(directory, f"{digest['user_id']}.{extension}")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(path + ".tmp", path)
+    return len(digests)
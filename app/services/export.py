@@ -2,25 +2,49 @@ import csv
 import io
 from datetime import date
 from uuid import UUID
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager
 from app.models.work_week import WorkWeek
 from app.models.work_item import WorkItem, TaskType, TaskStatus
+from app.serialization import dumps
 
 
-def get_filtered_items(
-    db: Session,
+# Typed columns for the columnar exports (Parquet, Arrow IPC, NDJSON).
+# Order matters: query result tuples are transposed into arrays by position.
+EXPORT_COLUMNS = [
+    ("week_start", WorkWeek.week_start, pa.date32()),
+    ("week_end", WorkWeek.week_end, pa.date32()),
+    ("title", WorkItem.title, pa.string()),
+    ("type", WorkItem.type, pa.dictionary(pa.int8(), pa.string())),
+    ("status", WorkItem.status, pa.dictionary(pa.int8(), pa.string())),
+    ("start_date", WorkItem.start_date, pa.date32()),
+    ("end_date", WorkItem.end_date, pa.date32()),
+    ("assigned_points", WorkItem.assigned_points, pa.int32()),
+    ("completion_points", WorkItem.completion_points, pa.int32()),
+    ("planned_work", WorkItem.planned_work, pa.string()),
+    ("actual_work", WorkItem.actual_work, pa.string()),
+    ("next_week_plan", WorkItem.next_week_plan, pa.string()),
+]
+
+EXPORT_SCHEMA = pa.schema([(name, arrow_type) for name, _, arrow_type in EXPORT_COLUMNS])
+
+EXPORT_BATCH_SIZE = 10_000
+
+
+def apply_export_filters(
+    query,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     task_type: Optional[str] = None,
     status: Optional[str] = None,
     user_id: Optional[UUID] = None
-) -> List[dict]:
-    """Get work items with filters applied."""
-    query = db.query(WorkItem).join(WorkWeek)
-    
+):
+    """Apply the report filters to a query (or select) joining WorkItem and WorkWeek."""
     if user_id:
         query = query.filter(WorkWeek.user_id == user_id)
     if start_date:
@@ -31,7 +55,22 @@ def get_filtered_items(
         query = query.filter(WorkItem.type == task_type)
     if status:
         query = query.filter(WorkItem.status == status)
-    
+    return query
+
+
+def get_filtered_items(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    task_type: Optional[str] = None,
+    status: Optional[str] = None,
+    user_id: Optional[UUID] = None
+) -> List[dict]:
+    """Get work items with filters applied."""
+    query = apply_export_filters(
+        db.query(WorkItem).join(WorkItem.work_week).options(contains_eager(WorkItem.work_week)),
+        start_date, end_date, task_type, status, user_id
+    )
     items = query.order_by(WorkWeek.week_start.desc(), WorkItem.created_at).all()
     
     return [{
@@ -122,3 +161,93 @@ def export_to_excel(
     output = io.BytesIO()
     wb.save(output)
     return output.getvalue()
+
+
+def iter_export_batches(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    task_type: Optional[str] = None,
+    status: Optional[str] = None,
+    user_id: Optional[UUID] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[pa.RecordBatch]:
+    """Yield typed record batches built directly from query result tuples.
+    
+    Only the exported columns are selected, and each chunk of rows is
+    transposed into Arrow arrays without building ORM objects or dicts.
+    """
+    stmt = select(*[column for _, column, _ in EXPORT_COLUMNS]).join_from(WorkItem, WorkWeek)
+    stmt = apply_export_filters(stmt, start_date, end_date, task_type, status, user_id)
+    stmt = stmt.order_by(WorkWeek.week_start.desc(), WorkItem.created_at)
+    
+    result = db.execute(stmt)
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            break
+        columns = zip(*rows)
+        arrays = [
+            pa.array(values, type=field.type)
+            for values, field in zip(columns, EXPORT_SCHEMA)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=EXPORT_SCHEMA)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator."""
+    
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_parquet(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    """Encode record batches as a Parquet file, one row group per batch."""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, EXPORT_SCHEMA, compression="zstd")
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_arrow(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    """Encode record batches as an Arrow IPC stream."""
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, EXPORT_SCHEMA)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_ndjson(batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    """Encode record batches as newline-delimited JSON, one object per item."""
+    names = EXPORT_SCHEMA.names
+    for batch in batches:
+        columns = [column.to_pylist() for column in batch.columns]
+        yield b"".join(dumps(dict(zip(names, row))) + b"\n" for row in zip(*columns))
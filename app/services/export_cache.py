@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import date
+from typing import Iterable, Optional, Union
+from uuid import UUID
+from app.config import get_settings
+
+
+class ExportCache:
+    """Disk cache for generated exports with LRU eviction under a byte budget.
+    
+    Entries are keyed by everything that determines the file contents: the
+    user, their data version, the export format and the filter set. A new
+    data version therefore produces a new key, and stale files simply age
+    out of the LRU. Recency is tracked through file mtimes, so the cache
+    survives restarts and can be shared by workers on the same host.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(user_id: UUID, data_version: int, export_format: str, filters: dict) -> str:
+        # The export date is part of the key: Excel summaries and filenames embed it
+        payload = json.dumps({
+            "user": str(user_id),
+            "version": data_version,
+            "format": export_format,
+            "filters": {k: v or None for k, v in sorted(filters.items())},
+            "date": date.today().isoformat(),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path for key and mark it recently used."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+    
+    def put(self, key: str, content: Union[bytes, Iterable[bytes]]) -> str:
+        """Write content atomically under key, then evict down to the budget."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if isinstance(content, bytes):
+                    f.write(content)
+                else:
+                    for chunk in content:
+                        f.write(chunk)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict(keep=key)
+        return self._path(key)
+    
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        with self._evict_lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.startswith(".tmp-") or not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.name))
+                    total += stat.st_size
+            
+            entries.sort()
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                try:
+                    os.unlink(self._path(name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+settings = get_settings()
+export_cache = ExportCache(settings.export_cache_dir, settings.export_cache_max_bytes)
@@ -0,0 +1,145 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+import orjson
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.idempotency_key import IdempotencyKey
+
+# Returned by claim() when another request holds the key but has not finished
+PENDING: dict = {}
+
+
+class IdempotencyStore(ABC):
+    """Remembers the response to each idempotency key for a TTL.
+    
+    A request first claims its key. The claim succeeds (returns None) for the
+    first request only; retries get the stored response to replay, or PENDING
+    while the first request is still running. The winner then either
+    completes the key with its response or releases it on failure so the
+    client may retry.
+    """
+    
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+    
+    @abstractmethod
+    def claim(self, db: Session, key: str) -> Optional[dict]:
+        """None if this request now owns the key, else the stored response or PENDING."""
+    
+    @abstractmethod
+    def complete(self, db: Session, key: str, response: dict) -> None:
+        """Store the owner's response for retries to replay."""
+    
+    @abstractmethod
+    def release(self, db: Session, key: str) -> None:
+        """Forget a claimed key so the client may retry."""
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Bounded per-process LRU; only safe with a single worker."""
+    
+    def __init__(self, ttl_seconds: int, max_entries: int = 10_000):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def claim(self, db: Session, key: str) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return entry[1] if entry[1] is not None else PENDING
+            self._entries[key] = (now, None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return None
+    
+    def complete(self, db: Session, key: str, response: dict) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (self._entries[key][0], response)
+    
+    def release(self, db: Session, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Keys in the idempotency_keys table, shared by every worker.
+    
+    Claiming is a single INSERT ... ON CONFLICT statement: it inserts the
+    key, or takes over an expired one, and reports via the row count
+    whether this request won. Expired rows are purged by created_at range
+    at most once per purge interval.
+    """
+    
+    PURGE_INTERVAL = 60
+    
+    def __init__(self, ttl_seconds: int):
+        super().__init__(ttl_seconds)
+        self._last_purge = 0.0
+    
+    def _insert(self, db: Session):
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(IdempotencyKey.__table__)
+    
+    def claim(self, db: Session, key: str) -> Optional[dict]:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        table = IdempotencyKey.__table__
+        statement = self._insert(db).values(key=key, response=None, created_at=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"response": None, "created_at": now},
+            where=table.c.created_at < cutoff,
+        )
+        claimed = db.execute(statement).rowcount == 1
+        self._purge(db, cutoff)
+        db.commit()
+        if claimed:
+            return None
+        
+        stored = db.query(IdempotencyKey.response).filter(IdempotencyKey.key == key).scalar()
+        return orjson.loads(stored) if stored else PENDING
+    
+    def complete(self, db: Session, key: str, response: dict) -> None:
+        db.query(IdempotencyKey).filter(IdempotencyKey.key == key).update(
+            {"response": orjson.dumps(response).decode()}, synchronize_session=False
+        )
+        db.commit()
+    
+    def release(self, db: Session, key: str) -> None:
+        db.rollback()
+        db.query(IdempotencyKey).filter(IdempotencyKey.key == key).delete(synchronize_session=False)
+        db.commit()
+    
+    def _purge(self, db: Session, cutoff: datetime) -> None:
+        if time.monotonic() - self._last_purge < self.PURGE_INTERVAL:
+            return
+        self._last_purge = time.monotonic()
+        db.query(IdempotencyKey).filter(IdempotencyKey.created_at < cutoff).delete(synchronize_session=False)
+
+
+def create_idempotency_store(backend: str, ttl_seconds: int, max_entries: int) -> IdempotencyStore:
+    if backend == "memory":
+        return MemoryIdempotencyStore(ttl_seconds, max_entries)
+    if backend == "database":
+        return DatabaseIdempotencyStore(ttl_seconds)
+    raise ValueError(f"Unknown idempotency backend: {backend}")
+
+
+settings = get_settings()
+idempotency_store = create_idempotency_store(
+    settings.idempotency_backend, settings.idempotency_ttl_seconds, settings.idempotency_max_entries
+)
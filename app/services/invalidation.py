@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, List, NamedTuple, Optional
+from uuid import UUID
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "work_tracker_invalidation"
+
+# Session.info key holding events published in the current transaction
+_PENDING_KEY = "invalidation_events"
+
+
+class InvalidationEvent(NamedTuple):
+    """A committed write: which kind of row changed, whose data, and their new data_version."""
+    entity: str
+    user_id: UUID
+    version: int
+
+
+Subscriber = Callable[[InvalidationEvent], None]
+
+
+class InvalidationBus(ABC):
+    """Fans committed writes out to per-process caches.
+    
+    CRUD functions publish an event inside their transaction; subscribers
+    only ever see it after the commit, and never for a rolled-back write.
+    """
+    
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+    
+    def subscribe(self, callback: Subscriber) -> None:
+        self._subscribers.append(callback)
+    
+    def dispatch(self, event_: InvalidationEvent) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(event_)
+            except Exception:
+                logger.exception("Invalidation subscriber failed for %s", event_)
+    
+    @abstractmethod
+    def publish(self, db: Session, event_: InvalidationEvent) -> None:
+        """Queue the event for dispatch once db's transaction commits."""
+    
+    async def start(self) -> None:
+        """Begin receiving events from other workers."""
+    
+    async def stop(self) -> None:
+        pass
+
+
+class LoopbackInvalidationBus(InvalidationBus):
+    """Delivers events to this process only, after the session commits.
+    
+    Used by tests and SQLite deployments, which run a single worker.
+    """
+    
+    def publish(self, db: Session, event_: InvalidationEvent) -> None:
+        pending = db.info.setdefault(_PENDING_KEY, [])
+        pending.append(event_)
+        if not event.contains(db, "after_commit", self._after_commit):
+            event.listen(db, "after_commit", self._after_commit)
+            event.listen(db, "after_rollback", self._after_rollback)
+    
+    def _after_commit(self, db: Session) -> None:
+        for event_ in db.info.pop(_PENDING_KEY, []):
+            self.dispatch(event_)
+    
+    def _after_rollback(self, db: Session) -> None:
+        db.info.pop(_PENDING_KEY, None)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """NOTIFY inside the writing transaction; every worker LISTENs on one connection.
+    
+    Postgres delivers a notification only when its transaction commits, and
+    to every listening session including the publisher's own worker, so all
+    processes evict through the same path.
+    """
+    
+    RECONNECT_DELAY = 5
+    
+    def __init__(self, database_url: str):
+        super().__init__()
+        self.database_url = database_url
+        self._connection = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def publish(self, db: Session, event_: InvalidationEvent) -> None:
+        payload = orjson.dumps(event_._asdict()).decode()
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+    
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._connect()
+    
+    async def stop(self) -> None:
+        if self._connection is not None:
+            self._loop.remove_reader(self._connection.fileno())
+            self._connection.close()
+            self._connection = None
+    
+    def _connect(self) -> None:
+        import psycopg2
+        import psycopg2.extensions
+        try:
+            connection = psycopg2.connect(self.database_url)
+            connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+        except Exception:
+            logger.exception("Invalidation listener could not connect; retrying")
+            self._loop.call_later(self.RECONNECT_DELAY, self._connect)
+            return
+        self._connection = connection
+        # The listener is a reader on the event loop: no thread, no polling interval
+        self._loop.add_reader(connection.fileno(), self._on_readable)
+    
+    def _on_readable(self) -> None:
+        connection = self._connection
+        try:
+            connection.poll()
+        except Exception:
+            logger.exception("Invalidation listener lost its connection; reconnecting")
+            self._loop.remove_reader(connection.fileno())
+            self._connection = None
+            self._loop.call_later(self.RECONNECT_DELAY, self._connect)
+            return
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            data = orjson.loads(notify.payload)
+            self.dispatch(InvalidationEvent(data["entity"], UUID(data["user_id"]), data["version"]))
+
+
+def create_invalidation_bus(backend: str, database_url: str) -> InvalidationBus:
+    if backend == "auto":
+        backend = "postgres" if database_url.startswith("postgres") else "loopback"
+    if backend == "loopback":
+        return LoopbackInvalidationBus()
+    if backend == "postgres":
+        return PostgresInvalidationBus(database_url)
+    raise ValueError(f"Unknown invalidation backend: {backend}")
+
+
+settings = get_settings()
+invalidation_bus = create_invalidation_bus(settings.invalidation_backend, settings.database_url)
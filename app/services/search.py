@@ -0,0 +1,174 @@
+import re
+from typing import List, Optional, Tuple
+from uuid import UUID
+from markupsafe import escape
+from sqlalchemy import column, func, literal, literal_column, or_, and_, select, table
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.orm import Session
+from app.models.work_item import WorkItem
+from app.models.work_week import WorkWeek
+
+SEARCH_CONFIG = "english"
+
+# Control characters mark the matches in database snippets, so the text can be
+# HTML-escaped before they are swapped for <mark> tags
+MATCH_START = "\x02"
+MATCH_STOP = "\x03"
+HEADLINE_OPTIONS = f"StartSel={MATCH_START}, StopSel={MATCH_STOP}, MaxFragments=2, MaxWords=20, MinWords=8"
+SNIPPET_TOKENS = 16
+
+# Results per page of the search API and the reports search box
+SEARCH_PAGE_SIZE = 20
+
+# Title autocomplete starts once this many characters are typed
+SUGGEST_MIN_CHARS = 2
+
+RESULT_COLUMNS = (
+    WorkItem.id, WorkItem.week_id, WorkItem.title, WorkItem.type, WorkItem.status,
+    WorkItem.assigned_points, WorkWeek.week_start
+)
+
+work_items_fts = table(
+    "work_items_fts",
+    column("item_id"), column("owner"),
+    column("title"), column("planned_work"), column("actual_work"), column("next_week_plan")
+)
+# Positions of the searched columns in work_items_fts
+TEXT_COLUMNS = (2, 3, 4, 5)
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """Escape a database snippet and turn its match markers into <mark> tags."""
+    if not snippet:
+        return ""
+    return str(escape(snippet)).replace(MATCH_START, "<mark>").replace(MATCH_STOP, "</mark>")
+
+
+def search_work_items(
+    db: Session, user_id: UUID, query: str, after: Optional[Tuple[float, UUID]] = None, limit: int = SEARCH_PAGE_SIZE
+) -> List[dict]:
+    """Keyset page of the user's items matching a free-text query, best match first.
+
+    Title, planned work, actual work and next week's plan are searched; title
+    matches rank higher. Each row carries a rank and an HTML snippet with the
+    matched words in <mark> tags (everything else escaped).
+
+    Args:
+        query: Words to find; on Postgres "quoted phrases", OR and -word work too
+        after: (rank, id) of the previous page's last result
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        results = [row._asdict() for row in _search_postgres(db, user_id, query, after, limit)]
+    else:
+        results = _search_sqlite(db, user_id, query, after, limit)
+    for result in results:
+        result["snippet"] = highlight(result["snippet"])
+    return results
+
+
+def _keyset(rank, after: Optional[Tuple[float, UUID]]):
+    last_rank, last_id = after
+    return or_(rank < last_rank, and_(rank == last_rank, WorkItem.id > last_id))
+
+
+def _search_postgres(db: Session, user_id: UUID, query: str, after, limit: int):
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    vector = literal_column("work_items.search_vector")
+    # ts_rank_cd is a float4; as a float8 the rank survives the cursor round trip exactly
+    rank = func.ts_rank_cd(vector, tsquery).cast(DOUBLE_PRECISION)
+
+    matches = select(
+        *RESULT_COLUMNS, WorkItem.planned_work, WorkItem.actual_work, WorkItem.next_week_plan,
+        rank.label("rank")
+    ).join(WorkWeek, WorkItem.week_id == WorkWeek.id).where(
+        WorkWeek.user_id == user_id, vector.op("@@")(tsquery)
+    )
+    if after:
+        matches = matches.where(_keyset(rank, after))
+    page = matches.order_by(rank.desc(), WorkItem.id).limit(limit).subquery()
+
+    # ts_headline re-parses the text, so it only runs for the rows on this page
+    document = func.concat_ws(
+        " … ", page.c.title, page.c.planned_work, page.c.actual_work, page.c.next_week_plan
+    )
+    return db.execute(select(
+        *[page.c[col.key] for col in RESULT_COLUMNS], page.c.rank,
+        func.ts_headline(SEARCH_CONFIG, document, tsquery, HEADLINE_OPTIONS).label("snippet")
+    ).order_by(page.c.rank.desc(), page.c.id)).all()
+
+
+def _search_sqlite(db: Session, user_id: UUID, query: str, after, limit: int):
+    # Each word is quoted so FTS5 never sees its own query syntax in user input
+    words = re.findall(r"\w+", query)
+    if not words:
+        return []
+    terms = " ".join(f'"{word}"' for word in words)
+    # The owner token narrows the match to this user's items inside the index
+    match = f'owner:"{user_id.hex}" AND ({terms})'
+
+    fts = literal_column("work_items_fts")
+    # bm25() is lower-is-better; negated so rank orders the same way as on Postgres
+    rank = -func.bm25(fts, 0.0, 0.0, 4.0, 1.0, 1.0, 1.0)
+    # One snippet per text column; the first with a match is shown
+    snippets = [
+        func.snippet(fts, index, MATCH_START, MATCH_STOP, "…", SNIPPET_TOKENS).label(f"snippet_{index}")
+        for index in TEXT_COLUMNS
+    ]
+
+    statement = select(*RESULT_COLUMNS, rank.label("rank"), *snippets).select_from(
+        work_items_fts
+    ).join(WorkItem, WorkItem.id == work_items_fts.c.item_id).join(
+        WorkWeek, WorkItem.week_id == WorkWeek.id
+    ).where(WorkWeek.user_id == user_id, fts.op("MATCH")(match))
+    if after:
+        statement = statement.where(_keyset(rank, after))
+    rows = db.execute(statement.order_by(rank.desc(), WorkItem.id).limit(limit)).all()
+
+    results = []
+    for row in rows:
+        result = row._asdict()
+        found = [result.pop(f"snippet_{index}") for index in TEXT_COLUMNS]
+        result["snippet"] = next((snippet for snippet in found if snippet and MATCH_START in snippet), found[0])
+        results.append(result)
+    return results
+
+
+def suggest_titles(db: Session, user_id: UUID, query: str, limit: int = 8) -> List[dict]:
+    """The user's past titles containing (or, on Postgres, resembling) the typed text.
+
+    One row per distinct title, case-insensitively, with the type and points
+    it was last given, so picking a suggestion can fill those in too. Titles
+    that match closer and were used more recently come first.
+    """
+    query = query.strip()
+    if len(query) < SUGGEST_MIN_CHARS:
+        return []
+
+    escaped = query.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    contains = WorkItem.title.ilike(f"%{escaped}%", escape="/")
+    if db.get_bind().dialect.name == "postgresql":
+        # Both predicates are served by the pg_trgm GIN index; <% also forgives typos
+        match = or_(contains, literal(query).op("<%")(WorkItem.title))
+        score = func.word_similarity(query, WorkItem.title)
+    else:
+        match = contains
+        # Earlier occurrences score higher; a prefix match scores highest
+        score = -func.instr(func.lower(WorkItem.title), query.lower())
+
+    latest = func.row_number().over(
+        partition_by=func.lower(WorkItem.title),
+        order_by=(WorkWeek.week_start.desc(), WorkItem.created_at.desc())
+    )
+    candidates = select(
+        WorkItem.title, WorkItem.type, WorkItem.assigned_points,
+        WorkWeek.week_start.label("last_used"), score.label("score"), latest.label("latest")
+    ).join(WorkWeek, WorkItem.week_id == WorkWeek.id).where(
+        WorkWeek.user_id == user_id, match
+    ).subquery()
+
+    rows = db.execute(select(
+        candidates.c.title, candidates.c.type, candidates.c.assigned_points, candidates.c.last_used
+    ).where(candidates.c.latest == 1).order_by(
+        candidates.c.score.desc(), candidates.c.last_used.desc()
+    ).limit(limit)).all()
+    return [row._asdict() for row in rows]
@@ -0,0 +1,118 @@
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+from app.config import get_settings
+from app.serialization import dumps
+
+logger = logging.getLogger("app.slow_queries")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CALLER_DIRS = tuple(os.path.join(APP_DIR, name) + os.sep for name in ("crud", "services"))
+
+# Statements EXPLAIN accepts; anything else (BEGIN, LISTEN, ...) is logged without a plan
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+# Connection.info flag on the connection running EXPLAIN, so plans are never logged themselves
+EXPLAIN_CONNECTION = "slow_query_explain"
+
+
+def redact(parameters, executemany: bool):
+    """Bound values replaced by their type names, so no user data is kept."""
+    if executemany:
+        return {"rows": len(parameters)}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def find_caller() -> Optional[str]:
+    """The innermost app/crud or app/services frame that issued the statement."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(CALLER_DIRS) and not filename.endswith("slow_queries.py"):
+            relative = os.path.relpath(filename, os.path.dirname(APP_DIR))
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Ring buffer of the most recent statements slower than a threshold.
+
+    Each entry is also logged to the "app.slow_queries" logger. On Postgres
+    the statement's plan is captured with EXPLAIN (ANALYZE false) on a
+    background thread, so the request that ran it never waits for the plan.
+    """
+
+    def __init__(self, threshold_ms: float, max_entries: int, explain: bool = True):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._entries: deque = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def record(self, conn, statement: str, parameters, seconds: float, executemany: bool, route: Optional[str]) -> None:
+        if conn.info.get(EXPLAIN_CONNECTION):
+            return
+        entry = {
+            "at": datetime.utcnow().isoformat(timespec="seconds"),
+            "duration_ms": round(seconds * 1000, 2),
+            "statement": statement,
+            "parameters": redact(parameters, executemany),
+            "route": route,
+            "caller": find_caller(),
+            "plan": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(dumps({k: v for k, v in entry.items() if k != "plan"}).decode())
+
+        if (self.explain and not executemany and conn.dialect.name == "postgresql"
+                and statement.lstrip().lower().startswith(EXPLAINABLE)):
+            self._explain_later(conn.engine, entry, statement, parameters)
+
+    def _explain_later(self, engine, entry: dict, statement: str, parameters) -> None:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._executor.submit(self._explain, engine, entry, statement, parameters)
+
+    def _explain(self, engine, entry: dict, statement: str, parameters) -> None:
+        try:
+            with engine.connect() as conn:
+                conn.info[EXPLAIN_CONNECTION] = True
+                try:
+                    result = conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE false, FORMAT JSON) {statement}", parameters
+                    )
+                    entry["plan"] = result.scalar()
+                finally:
+                    conn.info.pop(EXPLAIN_CONNECTION, None)
+        except Exception as e:
+            entry["plan"] = {"error": str(e)}
+
+    def entries(self) -> List[dict]:
+        """Newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+settings = get_settings()
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    max_entries=settings.slow_query_log_size,
+    explain=settings.slow_query_explain,
+)
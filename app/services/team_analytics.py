@@ -0,0 +1,216 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import Float, case, cast, func, select
+from sqlalchemy.orm import Session
+from app.fragment_cache import FragmentCache
+from app.metrics import record_cache
+from app.models.user import User
+from app.models.work_week import WorkWeek
+from app.models.work_item import WorkItem, TaskType, TaskStatus
+
+# Percentiles reported across users
+WEEKLY_PERCENTILES = (("p25", 0.25), ("p50", 0.5), ("p75", 0.75))
+USER_PERCENTILES = (("p10", 0.1), ("p25", 0.25), ("p50", 0.5), ("p75", 0.75), ("p90", 0.9))
+
+# Keyed by (start, end, team version); any write anywhere changes the version
+team_analytics_cache = FragmentCache(max_entries=64, default_ttl=300)
+
+
+def percentile_cont(values: Iterable[Optional[float]], fraction: float) -> Optional[float]:
+    """Continuous percentile with linear interpolation, as Postgres percentile_cont; NULLs ignored."""
+    ordered = sorted(value for value in values if value is not None)
+    if not ordered:
+        return None
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def team_version(db: Session) -> tuple:
+    """Changes whenever any user's weeks or items change, or a user is added or removed.
+
+    Every data_version bump also stamps users.updated_at, so the latest
+    updated_at moves forward with each write and a signup; the count covers
+    deletions. A sum of versions alone can repeat over different data (delete
+    a user at version k, sign one up, make k writes elsewhere).
+    """
+    return tuple(db.execute(select(
+        func.count(User.id), func.max(User.updated_at), func.coalesce(func.sum(User.data_version), 0)
+    )).one())
+
+
+def get_team_analytics(db: Session, weeks_back: int = 12) -> Dict[str, Any]:
+    """Team-wide analytics for the last weeks_back weeks, up to and including this one.
+
+    Cached per week range and team version, so repeated views cost one query.
+    """
+    today = date.today()
+    end = today - timedelta(days=today.weekday())
+    start = end - timedelta(weeks=weeks_back - 1)
+
+    key = (start, end, team_version(db))
+    data = team_analytics_cache.get(key)
+    record_cache("team_analytics", data is not None)
+    if data is None:
+        data = compute_team_analytics(db, start, end)
+        team_analytics_cache.set(key, data)
+    return data
+
+
+def _ratio(numerator, denominator):
+    return cast(numerator, Float) / func.nullif(denominator, 0)
+
+
+def _round(value) -> Optional[float]:
+    return round(float(value), 4) if value is not None else None
+
+
+def compute_team_analytics(db: Session, start: date, end: date) -> Dict[str, Any]:
+    """Weekly utilization, type mix, completion, OOO impact and per-user distributions.
+
+    Every figure is aggregated in SQL over all users at once: four grouped
+    statements on Postgres, where percentile_cont runs in the database. Other
+    databases lack percentile_cont, so the per-user values behind the
+    percentiles are fetched and interpolated the same way in Python.
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+
+    # One row per user-week in the range, with its item totals
+    user_weeks = select(
+        WorkWeek.user_id, WorkWeek.week_start, WorkWeek.total_points, WorkWeek.ooo_days,
+        func.coalesce(func.sum(WorkItem.assigned_points), 0).label("assigned"),
+        func.coalesce(func.sum(WorkItem.completion_points), 0).label("completed"),
+    ).outerjoin(WorkItem, WorkItem.week_id == WorkWeek.id).where(
+        WorkWeek.week_start.between(start, end)
+    ).group_by(WorkWeek.id).cte("user_weeks")
+    utilization = _ratio(user_weeks.c.assigned, user_weeks.c.total_points)
+
+    # Weekly utilization, with the change from the previous week via lag()
+    team_utilization = _ratio(func.sum(user_weeks.c.assigned), func.sum(user_weeks.c.total_points))
+    weekly_columns = [
+        user_weeks.c.week_start,
+        func.count().label("users"),
+        func.sum(user_weeks.c.total_points).label("capacity"),
+        func.sum(user_weeks.c.assigned).label("assigned"),
+        func.sum(user_weeks.c.completed).label("completed"),
+        func.sum(user_weeks.c.ooo_days).label("ooo_days"),
+        team_utilization.label("utilization"),
+        (team_utilization - func.lag(team_utilization).over(order_by=user_weeks.c.week_start)).label("change"),
+    ]
+    if postgres:
+        weekly_columns += [
+            func.percentile_cont(fraction).within_group(utilization).label(name)
+            for name, fraction in WEEKLY_PERCENTILES
+        ]
+    weekly_rows = db.execute(
+        select(*weekly_columns).group_by(user_weeks.c.week_start).order_by(user_weeks.c.week_start)
+    ).all()
+    if not postgres:
+        by_week: Dict[date, list] = {}
+        for week_start, value in db.execute(select(user_weeks.c.week_start, utilization)).all():
+            by_week.setdefault(week_start, []).append(value)
+
+    weekly = []
+    for row in weekly_rows:
+        values = row._asdict()
+        if not postgres:
+            for name, fraction in WEEKLY_PERCENTILES:
+                values[name] = percentile_cont(by_week.get(row.week_start, []), fraction)
+        weekly.append({
+            "week": row.week_start,
+            "users": row.users,
+            "capacity": int(row.capacity or 0),
+            "assigned": int(row.assigned or 0),
+            "completed": int(row.completed or 0),
+            "ooo_days": int(row.ooo_days or 0),
+            "utilization": _round(row.utilization),
+            "change": _round(row.change),
+            **{name: _round(values[name]) for name, _ in WEEKLY_PERCENTILES},
+        })
+
+    # Type mix and completion
+    completed_items = func.sum(case((WorkItem.status == TaskStatus.COMPLETED.value, 1), else_=0))
+    type_rows = db.execute(select(
+        WorkItem.type,
+        func.count(WorkItem.id).label("items"),
+        func.coalesce(func.sum(WorkItem.assigned_points), 0).label("points"),
+        func.coalesce(func.sum(WorkItem.completion_points), 0).label("completion_points"),
+        completed_items.label("completed_items"),
+    ).join(WorkWeek, WorkItem.week_id == WorkWeek.id).where(
+        WorkWeek.week_start.between(start, end)
+    ).group_by(WorkItem.type)).all()
+
+    type_mix = {t.value: {"items": 0, "points": 0, "completed_items": 0, "completion_rate": None} for t in TaskType}
+    totals = {"items": 0, "points": 0, "completion_points": 0, "completed_items": 0}
+    for row in type_rows:
+        type_mix[row.type] = {
+            "items": row.items,
+            "points": int(row.points),
+            "completed_items": int(row.completed_items or 0),
+            "completion_rate": _round(row.completion_points / row.points) if row.points else None,
+        }
+        for name in totals:
+            totals[name] += int(getattr(row, name) or 0)
+    completion = {
+        "items": totals["items"],
+        "completed_items": totals["completed_items"],
+        "item_rate": _round(totals["completed_items"] / totals["items"]) if totals["items"] else None,
+        "points_rate": _round(totals["completion_points"] / totals["points"]) if totals["points"] else None,
+    }
+
+    # OOO impact: how weeks with time off compare to full weeks
+    ooo_rows = db.execute(select(
+        user_weeks.c.ooo_days,
+        func.count().label("weeks"),
+        func.avg(utilization).label("utilization"),
+        _ratio(func.sum(user_weeks.c.completed), func.sum(user_weeks.c.assigned)).label("completion_rate"),
+        func.avg(user_weeks.c.assigned).label("assigned"),
+    ).group_by(user_weeks.c.ooo_days).order_by(user_weeks.c.ooo_days)).all()
+    ooo_impact = [{
+        "ooo_days": row.ooo_days,
+        "weeks": row.weeks,
+        "utilization": _round(row.utilization),
+        "completion_rate": _round(row.completion_rate),
+        "assigned": _round(row.assigned),
+    } for row in ooo_rows]
+
+    # Distribution of per-user utilization and completion over the whole range
+    per_user = select(
+        user_weeks.c.user_id,
+        _ratio(func.sum(user_weeks.c.assigned), func.sum(user_weeks.c.total_points)).label("utilization"),
+        _ratio(func.sum(user_weeks.c.completed), func.sum(user_weeks.c.assigned)).label("completion_rate"),
+    ).group_by(user_weeks.c.user_id).cte("per_user")
+    metrics = ("utilization", "completion_rate")
+    if postgres:
+        row = db.execute(select(
+            func.count().label("users"),
+            *[
+                func.percentile_cont(fraction).within_group(per_user.c[metric]).label(f"{metric}_{name}")
+                for metric in metrics for name, fraction in USER_PERCENTILES
+            ]
+        )).one()
+        user_count = row.users
+        distribution = {
+            metric: {name: _round(getattr(row, f"{metric}_{name}")) for name, _ in USER_PERCENTILES}
+            for metric in metrics
+        }
+    else:
+        rows = db.execute(select(per_user.c.utilization, per_user.c.completion_rate)).all()
+        user_count = len(rows)
+        distribution = {
+            metric: {
+                name: _round(percentile_cont((getattr(r, metric) for r in rows), fraction))
+                for name, fraction in USER_PERCENTILES
+            }
+            for metric in metrics
+        }
+
+    return {
+        "range": {"start": start, "end": end, "weeks": (end - start).days // 7 + 1},
+        "weekly": weekly,
+        "type_mix": type_mix,
+        "completion": completion,
+        "ooo_impact": ooo_impact,
+        "users": {"count": user_count, **distribution},
+    }
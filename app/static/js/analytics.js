@@ -0,0 +1,134 @@
+// Work Tracker - Analytics page
+
+// Page data is embedded as JSON by analytics.html
+const analyticsData = JSON.parse(document.getElementById('analytics-page-data').textContent);
+
+// Chart.js default styling for dark theme
+Chart.defaults.color = '#94a3b8';
+Chart.defaults.borderColor = 'rgba(51, 65, 85, 0.5)';
+Chart.defaults.font.family = 'Inter, system-ui, sans-serif';
+
+// Points Trend Chart
+const pointsTrendCtx = document.getElementById('pointsTrendChart').getContext('2d');
+const gradient = pointsTrendCtx.createLinearGradient(0, 0, 0, 300);
+gradient.addColorStop(0, 'rgba(59, 130, 246, 0.3)');
+gradient.addColorStop(1, 'rgba(59, 130, 246, 0)');
+
+new Chart(pointsTrendCtx, {
+    type: 'line',
+    data: {
+        labels: analyticsData.points_trend.map(d => d.week),
+        datasets: [{
+            label: 'Points Used',
+            data: analyticsData.points_trend.map(d => d.used),
+            borderColor: '#3b82f6',
+            backgroundColor: gradient,
+            fill: true,
+            tension: 0.4,
+            borderWidth: 3,
+            pointBackgroundColor: '#3b82f6',
+            pointBorderColor: '#1e293b',
+            pointBorderWidth: 2,
+            pointRadius: 4,
+            pointHoverRadius: 6
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: { display: false }
+        },
+        scales: {
+            y: {
+                beginAtZero: true,
+                max: 100,
+                grid: { color: 'rgba(51, 65, 85, 0.3)' },
+                ticks: { font: { size: 11 } }
+            },
+            x: {
+                grid: { display: false },
+                ticks: { font: { size: 11 } }
+            }
+        }
+    }
+});
+
+// Type Distribution Chart
+const typeCtx = document.getElementById('typeDistributionChart').getContext('2d');
+new Chart(typeCtx, {
+    type: 'doughnut',
+    data: {
+        labels: ['Planned', 'Unplanned', 'Ad-Hoc'],
+        datasets: [{
+            data: [
+                analyticsData.type_distribution.PLANNED.points,
+                analyticsData.type_distribution.UNPLANNED.points,
+                analyticsData.type_distribution.ADHOC.points
+            ],
+            backgroundColor: ['#10b981', '#f59e0b', '#a855f7'],
+            borderWidth: 0,
+            hoverOffset: 10
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: {
+                position: 'bottom',
+                labels: { 
+                    padding: 20,
+                    usePointStyle: true,
+                    pointStyle: 'circle',
+                    font: { size: 12, weight: '500' }
+                }
+            }
+        },
+        cutout: '65%'
+    }
+});
+
+// Status Chart
+const statusCtx = document.getElementById('statusChart').getContext('2d');
+const statusLabels = Object.keys(analyticsData.status_breakdown).map(s => s.replace('_', ' '));
+const statusValues = Object.values(analyticsData.status_breakdown);
+const statusColors = {
+    'TODO': '#64748b',
+    'IN PROGRESS': '#3b82f6',
+    'HOLD': '#eab308',
+    'DELAYED': '#ef4444',
+    'COMPLETED': '#22c55e',
+    'ABANDONED': '#6b7280'
+};
+
+new Chart(statusCtx, {
+    type: 'bar',
+    data: {
+        labels: statusLabels,
+        datasets: [{
+            data: statusValues,
+            backgroundColor: statusLabels.map(l => statusColors[l] || '#64748b'),
+            borderRadius: 8,
+            borderSkipped: false
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: { display: false }
+        },
+        scales: {
+            y: {
+                beginAtZero: true,
+                grid: { color: 'rgba(51, 65, 85, 0.3)' },
+                ticks: { font: { size: 11 } }
+            },
+            x: {
+                grid: { display: false },
+                ticks: { font: { size: 10 } }
+            }
+        }
+    }
+});
@@ -0,0 +1,475 @@
+// Work Tracker - Input page
+
+// Generate UUID for idempotency keys
+function generateUUID() {
+    return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) {
+        const r = Math.random() * 16 | 0;
+        const v = c === 'x' ? r : (r & 0x3 | 0x8);
+        return v.toString(16);
+    });
+}
+
+// Handle form submission with idempotency
+function handleFormSubmit(form) {
+    const submitBtn = form.querySelector('button[type="submit"]');
+    if (submitBtn.disabled) {
+        return false; // Already submitting
+    }
+    
+    // Disable button to prevent double-click
+    const originalLabel = submitBtn.innerHTML;
+    submitBtn.disabled = true;
+    submitBtn.innerHTML = '<svg class="animate-spin h-5 w-5 mr-2 inline" viewBox="0 0 24 24"><circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4" fill="none"></circle><path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4z"></path></svg>Saving...';
+    
+    // Save in the background and patch the page instead of reloading it
+    submitItemForm(form)
+        .then(data => applyItemChange(data, form))
+        .catch(err => alert(err.message))
+        .finally(() => {
+            submitBtn.disabled = false;
+            submitBtn.innerHTML = originalLabel;
+        });
+    return false;
+}
+
+function handleDeleteSubmit(form, itemId) {
+    if (!confirm('Delete this item?')) {
+        return false;
+    }
+    submitItemForm(form)
+        .then(data => applyItemChange(data, form))
+        .catch(err => alert(err.message));
+    return false;
+}
+
+// POST a form asking for the JSON partial-update response
+async function submitItemForm(form) {
+    const response = await fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: { 'Accept': 'application/json' },
+        credentials: 'same-origin'
+    });
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.detail || 'Could not save the work item');
+    }
+    return data;
+}
+
+// Apply an item endpoint response: replace, insert or remove the card and refresh totals
+function applyItemChange(data, form) {
+    if (data.redirect) {
+        // Duplicate submission: the server already applied it, show the saved state
+        window.location.href = data.redirect;
+        return;
+    }
+    
+    if (data.item) {
+        const index = items.findIndex(i => i.id === data.item.id);
+        if (index >= 0) {
+            items[index] = data.item;
+        } else {
+            items.push(data.item);
+        }
+        
+        const template = document.createElement('template');
+        template.innerHTML = data.html.trim();
+        const card = template.content.firstElementChild;
+        const existing = document.getElementById(`item-${data.item.id}`);
+        if (existing) {
+            existing.replaceWith(card);
+        } else {
+            document.getElementById('items-list').appendChild(card);
+        }
+    }
+    
+    if (data.deleted) {
+        const index = items.findIndex(i => i.id === data.deleted);
+        if (index >= 0) items.splice(index, 1);
+        const existing = document.getElementById(`item-${data.deleted}`);
+        if (existing) existing.remove();
+    }
+    
+    updatePoints(data.points);
+    
+    if (form.id === 'addForm') {
+        form.reset();
+        document.getElementById('add_idempotency_key').value = generateUUID();
+        toggleAddFormFields();
+        togglePlanningMode();
+    } else if (form.id === 'editForm') {
+        closeModal();
+    }
+}
+
+// Refresh the points summary, progress bars and add-form limit from the week totals
+function updatePoints(points) {
+    document.querySelectorAll('[data-points]').forEach(el => {
+        el.textContent = points[el.dataset.points];
+    });
+    document.querySelectorAll('[data-bar]').forEach(el => {
+        const value = points[el.dataset.bar];
+        el.style.width = points.total_points > 0 ? `${value / points.total_points * 100}%` : '0%';
+    });
+    
+    const addPoints = document.getElementById('add_assigned_points');
+    if (addPoints) addPoints.max = points.remaining;
+    
+    const emptyState = document.getElementById('items-empty');
+    if (emptyState) emptyState.classList.toggle('hidden', points.item_count > 0);
+}
+
+// Initialize idempotency keys on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const addKey = document.getElementById('add_idempotency_key');
+    if (addKey) addKey.value = generateUUID();
+    
+    // Initialize panels to collapsed state
+    initializePanels();
+    
+    initTitleSuggest();
+});
+
+// Title autocomplete from the user's past items; picking one also fills in its type and points
+const TITLE_SUGGEST_DELAY = 150;
+let titleSuggestions = [];
+let titleSuggestTimer = null;
+let titleSuggestController = null;
+
+function initTitleSuggest() {
+    const input = document.getElementById('add_title');
+    const list = document.getElementById('title_suggestions');
+    if (!input || !list) return;
+    
+    input.addEventListener('input', function() {
+        const picked = titleSuggestions.find(s => s.title === input.value);
+        if (picked) {
+            applyTitleSuggestion(picked);
+            return;
+        }
+        clearTimeout(titleSuggestTimer);
+        const query = input.value.trim();
+        if (query.length < 2) {
+            list.replaceChildren();
+            return;
+        }
+        titleSuggestTimer = setTimeout(() => fetchTitleSuggestions(query, list), TITLE_SUGGEST_DELAY);
+    });
+}
+
+async function fetchTitleSuggestions(query, list) {
+    // Only the latest keystroke's request matters
+    if (titleSuggestController) titleSuggestController.abort();
+    titleSuggestController = new AbortController();
+    try {
+        const response = await fetch(`/api/titles/suggest?q=${encodeURIComponent(query)}`, {
+            headers: { 'Accept': 'application/json' },
+            signal: titleSuggestController.signal
+        });
+        if (!response.ok) return;
+        titleSuggestions = (await response.json()).suggestions;
+    } catch (error) {
+        return;
+    }
+    list.replaceChildren(...titleSuggestions.map(s => {
+        const option = document.createElement('option');
+        option.value = s.title;
+        option.label = `${s.type} · ${s.assigned_points} pts`;
+        return option;
+    }));
+}
+
+function applyTitleSuggestion(suggestion) {
+    document.getElementById('add_type').value = suggestion.type;
+    toggleAddFormFields();
+    const points = document.getElementById('add_assigned_points');
+    points.value = points.max === '' ? suggestion.assigned_points : Math.min(suggestion.assigned_points, Number(points.max));
+}
+
+// OOO form handling
+function updateOOOPreview() {
+    const oooDays = parseInt(document.getElementById('ooo_days').value);
+    const workingDays = 5 - oooDays;
+    const totalPoints = workingDays * 20;
+    const preview = document.getElementById('ooo_preview');
+    const summary = document.getElementById('ooo_collapsed_summary');
+    
+    if (preview) {
+        preview.innerHTML = `<span class="font-semibold text-amber-400">${totalPoints} points</span> <span class="text-slate-500">(${workingDays} working days)</span>`;
+    }
+    
+    // Update collapsed summary
+    if (summary) {
+        if (oooDays > 0) {
+            summary.innerHTML = `<span>${oooDays} day(s) OOO - ${totalPoints} points</span>`;
+        } else {
+            summary.innerHTML = `<span>No OOO - ${totalPoints} points</span>`;
+        }
+    }
+}
+
+function handleOOOFormSubmit(form) {
+    const submitBtn = form.querySelector('button[type="submit"]');
+    if (submitBtn.disabled) {
+        return false;
+    }
+    submitBtn.disabled = true;
+    submitBtn.innerHTML = '<svg class="animate-spin h-5 w-5 mr-2 inline" viewBox="0 0 24 24"><circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4" fill="none"></circle><path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4z"></path></svg>Saving...';
+    return true;
+}
+
+// Panel toggle functions
+function toggleOOOPanel() {
+    const content = document.getElementById('ooo_expanded_content');
+    const chevron = document.getElementById('ooo_chevron');
+    
+    if (!content || !chevron) return;
+    
+    const isHidden = content.classList.contains('hidden') || content.style.display === 'none';
+    
+    if (isHidden) {
+        content.classList.remove('hidden');
+        content.style.display = '';
+        chevron.style.transform = 'rotate(180deg)';
+    } else {
+        content.classList.add('hidden');
+        content.style.display = 'none';
+        chevron.style.transform = 'rotate(0deg)';
+    }
+}
+
+function togglePointsPanel() {
+    const content = document.getElementById('points_expanded_content');
+    const chevron = document.getElementById('points_chevron');
+    const miniProgress = document.getElementById('points_mini_progress');
+    
+    if (!content || !chevron) return;
+    
+    const isHidden = content.classList.contains('hidden') || content.style.display === 'none';
+    
+    if (isHidden) {
+        // Expanding: hide mini progress, show full content
+        content.classList.remove('hidden');
+        content.style.display = '';
+        chevron.style.transform = 'rotate(180deg)';
+        if (miniProgress) {
+            miniProgress.style.display = 'none';
+        }
+    } else {
+        // Collapsing: show mini progress, hide full content
+        content.classList.add('hidden');
+        content.style.display = 'none';
+        chevron.style.transform = 'rotate(0deg)';
+        if (miniProgress) {
+            miniProgress.style.display = '';
+        }
+    }
+}
+
+// Initialize panels to collapsed state on page load
+function initializePanels() {
+    const oooContent = document.getElementById('ooo_expanded_content');
+    const oooChevron = document.getElementById('ooo_chevron');
+    const pointsContent = document.getElementById('points_expanded_content');
+    const pointsChevron = document.getElementById('points_chevron');
+    const pointsMiniProgress = document.getElementById('points_mini_progress');
+    
+    // Ensure OOO panel starts collapsed
+    if (oooContent && oooChevron) {
+        oooContent.classList.add('hidden');
+        oooContent.style.display = 'none';
+        oooChevron.style.transform = 'rotate(0deg)';
+    }
+    
+    // Ensure Points panel starts collapsed (show mini progress, hide full content)
+    if (pointsContent && pointsChevron) {
+        pointsContent.classList.add('hidden');
+        pointsContent.style.display = 'none';
+        pointsChevron.style.transform = 'rotate(0deg)';
+        if (pointsMiniProgress) {
+            pointsMiniProgress.style.display = '';
+        }
+    }
+}
+
+// Page data is embedded as JSON by input.html
+const pageData = JSON.parse(document.getElementById('input-page-data').textContent);
+const items = pageData.items;
+const isFutureWeek = pageData.is_future_week;
+
+// Store original status options for restoration
+const allStatusOptions = [
+    { value: 'TODO', text: 'To Do' },
+    { value: 'IN_PROGRESS', text: 'In Progress' },
+    { value: 'HOLD', text: 'Hold' },
+    { value: 'DELAYED', text: 'Delayed' },
+    { value: 'COMPLETED', text: 'Completed' },
+    { value: 'ABANDONED', text: 'Abandoned' }
+];
+
+const planningModeStatuses = ['TODO', 'IN_PROGRESS'];
+
+// Toggle planning mode for Add form (hides Completion Points and Actual Work for future weeks)
+function togglePlanningMode() {
+    const completionField = document.getElementById('add_completion_field');
+    const actualWorkField = document.getElementById('add_actual_work_field');
+    const statusSelect = document.getElementById('add_status');
+    const pointsGrid = document.getElementById('add_points_grid');
+    
+    if (isFutureWeek) {
+        // Hide completion points and actual work
+        completionField.style.display = 'none';
+        actualWorkField.style.display = 'none';
+        // Make points grid single column
+        pointsGrid.classList.remove('grid-cols-2');
+        pointsGrid.classList.add('grid-cols-1');
+        // Filter status options
+        filterStatusOptions(statusSelect, planningModeStatuses);
+    } else {
+        // Show all fields
+        completionField.style.display = 'block';
+        actualWorkField.style.display = 'block';
+        // Restore grid layout
+        pointsGrid.classList.remove('grid-cols-1');
+        pointsGrid.classList.add('grid-cols-2');
+        // Restore all status options
+        restoreAllStatusOptions(statusSelect);
+    }
+}
+
+// Toggle planning mode for Edit modal
+function toggleEditPlanningMode() {
+    const completionField = document.getElementById('edit_completion_field');
+    const actualWorkField = document.getElementById('edit_actual_work_field');
+    const statusSelect = document.getElementById('edit_status');
+    const pointsGrid = document.getElementById('edit_points_grid');
+    
+    if (isFutureWeek) {
+        // Hide completion points and actual work
+        completionField.style.display = 'none';
+        actualWorkField.style.display = 'none';
+        // Make points grid single column
+        pointsGrid.classList.remove('grid-cols-2');
+        pointsGrid.classList.add('grid-cols-1');
+        // Filter status options
+        filterStatusOptions(statusSelect, planningModeStatuses);
+    } else {
+        // Show all fields
+        completionField.style.display = 'block';
+        actualWorkField.style.display = 'block';
+        // Restore grid layout
+        pointsGrid.classList.remove('grid-cols-1');
+        pointsGrid.classList.add('grid-cols-2');
+        // Restore all status options
+        restoreAllStatusOptions(statusSelect);
+    }
+}
+
+// Filter status options to only allowed values
+function filterStatusOptions(selectElement, allowedStatuses) {
+    const currentValue = selectElement.value;
+    selectElement.innerHTML = '';
+    allStatusOptions.forEach(opt => {
+        if (allowedStatuses.includes(opt.value)) {
+            const option = document.createElement('option');
+            option.value = opt.value;
+            option.textContent = opt.text;
+            selectElement.appendChild(option);
+        }
+    });
+    // Restore current value if still valid, otherwise default to TODO
+    if (allowedStatuses.includes(currentValue)) {
+        selectElement.value = currentValue;
+    } else {
+        selectElement.value = 'TODO';
+    }
+}
+
+// Restore all status options
+function restoreAllStatusOptions(selectElement) {
+    const currentValue = selectElement.value;
+    selectElement.innerHTML = '';
+    allStatusOptions.forEach(opt => {
+        const option = document.createElement('option');
+        option.value = opt.value;
+        option.textContent = opt.text;
+        selectElement.appendChild(option);
+    });
+    selectElement.value = currentValue || 'TODO';
+}
+
+// Toggle fields visibility based on task type for Add form
+function toggleAddFormFields() {
+    const type = document.getElementById('add_type').value;
+    const plannedWorkField = document.getElementById('add_planned_work_field');
+    const nextWeekField = document.getElementById('add_next_week_field');
+    
+    if (type === 'ADHOC') {
+        plannedWorkField.style.display = 'none';
+        nextWeekField.style.display = 'none';
+    } else {
+        plannedWorkField.style.display = 'block';
+        nextWeekField.style.display = 'block';
+    }
+}
+
+// Toggle fields visibility based on task type for Edit form
+function toggleEditFormFields() {
+    const type = document.getElementById('edit_type').value;
+    const plannedWorkField = document.getElementById('edit_planned_work_field');
+    const nextWeekField = document.getElementById('edit_next_week_field');
+    
+    if (type === 'ADHOC') {
+        plannedWorkField.style.display = 'none';
+        nextWeekField.style.display = 'none';
+    } else {
+        plannedWorkField.style.display = 'block';
+        nextWeekField.style.display = 'block';
+    }
+}
+
+function editItem(itemId) {
+    const item = items.find(i => i.id === itemId);
+    if (!item) return;
+
+    // Generate new idempotency key for this edit
+    document.getElementById('edit_idempotency_key').value = generateUUID();
+    
+    document.getElementById('editForm').action = `/api/work-items/${itemId}`;
+    document.getElementById('edit_type').value = item.type;
+    document.getElementById('edit_status').value = item.status;
+    document.getElementById('edit_title').value = item.title;
+    document.getElementById('edit_start_date').value = item.start_date || '';
+    document.getElementById('edit_end_date').value = item.end_date || '';
+    document.getElementById('edit_assigned_points').value = item.assigned_points;
+    document.getElementById('edit_completion_points').value = item.completion_points || '';
+    document.getElementById('edit_planned_work').value = item.planned_work || '';
+    document.getElementById('edit_actual_work').value = item.actual_work || '';
+    document.getElementById('edit_next_week_plan').value = item.next_week_plan || '';
+    document.getElementById('edit_document_url').value = item.document_url || '';
+
+    // Toggle fields based on type and planning mode
+    toggleEditFormFields();
+    toggleEditPlanningMode();
+
+    document.getElementById('editModal').classList.remove('hidden');
+    document.getElementById('editModal').classList.add('flex');
+}
+
+function closeModal() {
+    document.getElementById('editModal').classList.add('hidden');
+    document.getElementById('editModal').classList.remove('flex');
+}
+
+document.getElementById('editModal').addEventListener('click', function(e) {
+    if (e.target === this) closeModal();
+});
+
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') closeModal();
+});
+
+// Initialize field visibility on page load
+toggleAddFormFields();
+togglePlanningMode();
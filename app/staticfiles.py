@@ -0,0 +1,51 @@
+import os
+from mimetypes import guess_type
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+from app.assets import DIST_DIR, IMMUTABLE_CACHE_CONTROL
+from app.middleware import choose_encoding
+
+# Sibling suffix for each content coding, as written by scripts/precompress_static.py
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a prebuilt .br/.gz sibling when the client accepts it.
+    
+    Fingerprinted build output under dist/ is additionally marked immutable.
+    """
+    
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = self._encoded_file_response(full_path, stat_result, scope, status_code)
+        if self.get_path(scope).startswith(DIST_DIR + os.sep):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+    
+    def _encoded_file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int) -> Response:
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        
+        compressed_path = str(full_path) + PRECOMPRESSED_SUFFIXES[encoding]
+        try:
+            compressed_stat = os.stat(compressed_path)
+        except OSError:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        if compressed_stat.st_mtime < stat_result.st_mtime:
+            # Stale sibling from an older build
+            return super().file_response(full_path, stat_result, scope, status_code)
+        
+        response = FileResponse(
+            compressed_path,
+            status_code=status_code,
+            stat_result=compressed_stat,
+            # Content type comes from the original name, not the .br/.gz suffix
+            media_type=guess_type(str(full_path))[0] or "text/plain",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
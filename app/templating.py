@@ -0,0 +1,82 @@
+import hashlib
+import os
+from typing import List
+import jinja2
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from app.assets import asset_url
+from app.config import get_settings
+from app.fragment_cache import FragmentCache, FragmentCacheExtension
+from app.instrumentation import timed
+from app.serialization import tojson
+from app.services.invalidation import InvalidationEvent, invalidation_bus
+
+TEMPLATE_DIR = "app/templates"
+
+settings = get_settings()
+
+
+def create_environment(bytecode_cache_dir: str, auto_reload: bool) -> Environment:
+    """Build the Jinja environment shared by every router.
+    
+    Compiled templates are kept in a filesystem bytecode cache so a new
+    worker process loads them instead of recompiling. Unless auto_reload
+    is opted into, templates are never re-stat'ed per render.
+    """
+    os.makedirs(bytecode_cache_dir, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=auto_reload,
+        # Every page template is held in memory; the default of 400 is never reached
+        cache_size=-1,
+        extensions=[FragmentCacheExtension],
+    )
+    env.fragment_cache = FragmentCache(max_entries=settings.fragment_cache_max_entries)
+    env.globals["asset_url"] = asset_url
+    env.filters["tojson"] = tojson
+    env.bytecode_cache = FileSystemBytecodeCache(
+        bytecode_cache_dir, f"__jinja2_{environment_fingerprint(env)}_%s.cache"
+    )
+    return env
+
+
+def environment_fingerprint(env: Environment) -> str:
+    """Hash of what compiled code depends on besides the template source.
+    
+    Bytecode is keyed by template source only, but the generated code also
+    bakes in how each filter and test is called, so a changed filter must
+    not load bytecode compiled against the old one.
+    """
+    signature = [jinja2.__version__]
+    for kind, mapping in (("filter", env.filters), ("test", env.tests)):
+        for name in sorted(mapping):
+            func = mapping[name]
+            signature.append(f"{kind}:{name}:{getattr(func, 'jinja_pass_arg', None)}")
+    return hashlib.sha256("\n".join(signature).encode()).hexdigest()[:12]
+
+
+def precompile_templates(env: Environment) -> List[str]:
+    """Compile every template up front so the first request after a deploy does not pay for it."""
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+class InstrumentedTemplates(Jinja2Templates):
+    """Jinja2Templates whose rendering time shows up as "render" in Server-Timing."""
+    
+    def TemplateResponse(self, *args, **kwargs):
+        with timed("render"):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+templates = InstrumentedTemplates(env=create_environment(settings.template_cache_dir, auto_reload=settings.template_auto_reload))
+
+
+def _evict_fragments(event: InvalidationEvent) -> None:
+    templates.env.fragment_cache.evict_user(str(event.user_id), event.version)
+
+
+invalidation_bus.subscribe(_evict_fragments)
@@ -0,0 +1,5 @@
+"""
+Benchmarks for Work Tracker.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.export_formats``.
+"""
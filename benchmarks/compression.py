@@ -0,0 +1,79 @@
+"""
+Bytes on the wire per route: identity vs gzip vs brotli.
+
+Runs the app in-process against a throwaway SQLite database seeded with a
+user's history, then fetches each route with every Accept-Encoding and
+counts the raw (still encoded) body bytes.
+
+Usage:
+    python scripts/precompress_static.py   # so static routes use the siblings
+    python -m benchmarks.compression --items 300
+"""
+import argparse
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def wire_bytes(client, url: str, encoding: str) -> int:
+    with client.stream("GET", url, headers={"Accept-Encoding": encoding}) as response:
+        return sum(len(chunk) for chunk in response.iter_raw())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure compression savings per route")
+    parser.add_argument("--items", type=int, default=300)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+    os.environ["EXPORT_CACHE_DIR"] = os.path.join(tmpdir, "exports")
+
+    from fastapi.testclient import TestClient
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.crud.user import create_user
+    from benchmarks.export_formats import seed
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = create_user(db, "bench@example.com", "bench123")
+    seed(db, user.id, args.items)
+    db.close()
+
+    monday = date.today() - timedelta(days=date.today().weekday())
+    routes = [
+        "/",
+        f"/input/{monday}",
+        f"/input/{monday - timedelta(weeks=1)}",
+        "/reports",
+        "/analytics",
+        "/api/analytics/data?weeks=52",
+        "/reports/export/csv",
+        "/reports/export/ndjson",
+        "/reports/export/excel",
+        "/static/js/app.js",
+        "/static/css/style.css",
+    ]
+
+    results = []
+    with TestClient(app) as client:
+        client.post("/login", data={"email": "bench@example.com", "password": "bench123"})
+        for url in routes:
+            sizes = {encoding: wire_bytes(client, url, encoding) for encoding in ENCODINGS}
+            identity = sizes["identity"] or 1
+            results.append({
+                "route": url,
+                **{f"{encoding}_bytes": size for encoding, size in sizes.items()},
+                "gzip_saving_pct": round(100 * (1 - sizes["gzip"] / identity), 1),
+                "br_saving_pct": round(100 * (1 - sizes["br"] / identity), 1),
+            })
+
+    print(json.dumps({"items": args.items, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
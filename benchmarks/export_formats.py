@@ -0,0 +1,137 @@
+"""
+Compare export sizes and load times: CSV vs Parquet, Arrow IPC and NDJSON.
+
+Seeds a throwaway SQLite database with synthetic work items, exports them in
+every format, and times how long a consumer takes to load each file back.
+
+Usage:
+    python -m benchmarks.export_formats --items 50000
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+from sqlalchemy import text
+
+
+def seed(db, user_id, item_count: int):
+    """Insert item_count work items spread over weekly rows for one user."""
+    from app.models.work_week import WorkWeek
+    from app.models.work_item import WorkItem
+
+    rng = random.Random(42)
+    monday = date.today() - timedelta(days=date.today().weekday())
+    weeks = []
+    for i in range(max(item_count // 15, 1)):
+        start = monday - timedelta(weeks=i)
+        weeks.append({"id": uuid4(), "user_id": user_id, "week_start": start,
+                      "week_end": start + timedelta(days=4), "total_points": 100, "ooo_days": 0})
+    db.bulk_insert_mappings(WorkWeek, weeks)
+
+    items = []
+    for i in range(item_count):
+        week = weeks[i % len(weeks)]
+        items.append({
+            "id": uuid4(),
+            "week_id": week["id"],
+            "title": f"Task {i} " + "x" * rng.randint(5, 60),
+            "type": rng.choice(["PLANNED", "UNPLANNED", "ADHOC"]),
+            "status": rng.choice(["TODO", "IN_PROGRESS", "COMPLETED", "DELAYED"]),
+            "start_date": week["week_start"],
+            "end_date": week["week_end"],
+            "assigned_points": rng.randint(1, 30),
+            "completion_points": rng.choice([None, rng.randint(0, 30)]),
+            "planned_work": "Plan " * rng.randint(0, 40) or None,
+            "actual_work": "Did " * rng.randint(0, 40) or None,
+            "next_week_plan": None,
+        })
+    db.bulk_insert_mappings(WorkItem, items)
+    # Without this SQLite nested-loops the join and the query dominates every
+    # format equally; Postgres hash-joins, so index it to compare encodings.
+    db.execute(text("CREATE INDEX ix_bench_work_items_week_id ON work_items (week_id)"))
+    db.commit()
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.models.user import User
+    from app.services.export import (
+        export_to_csv, iter_export_batches, stream_parquet, stream_arrow, stream_ndjson
+    )
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    seed(db, user.id, args.items)
+
+    payloads = {}
+    export_times = {}
+
+    def export_csv():
+        payloads["csv"] = export_to_csv(db, user_id=user.id).encode("utf-8")
+
+    def export_columnar(name, encoder):
+        def run():
+            payloads[name] = b"".join(encoder(iter_export_batches(db, user_id=user.id)))
+        return run
+
+    export_times["csv"] = timed(export_csv)
+    export_times["parquet"] = timed(export_columnar("parquet", stream_parquet))
+    export_times["arrow"] = timed(export_columnar("arrow", stream_arrow))
+    export_times["ndjson"] = timed(export_columnar("ndjson", stream_ndjson))
+
+    loaders = {
+        "csv": lambda data: list(csv.DictReader(io.StringIO(data.decode("utf-8")))),
+        "csv (pyarrow)": lambda data: pa_csv.read_csv(io.BytesIO(data)),
+        "parquet": lambda data: pq.read_table(io.BytesIO(data)),
+        "arrow": lambda data: pa.ipc.open_stream(data).read_all(),
+        "ndjson": lambda data: [json.loads(line) for line in data.splitlines()],
+    }
+
+    results = []
+    for name, loader in loaders.items():
+        fmt = name.split(" ")[0]
+        data = payloads[fmt]
+        results.append({
+            "format": name,
+            "bytes": len(data),
+            "export_ms": round(export_times[fmt] * 1000, 1),
+            "load_ms": round(timed(lambda: loader(data)) * 1000, 2),
+        })
+
+    db.close()
+    print(json.dumps({"items": args.items, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare JSON encoding paths: stdlib json, FastAPI's jsonable_encoder, and orjson.
+
+Seeds a throwaway SQLite database, then times serializing work items (as the
+input page embeds them) and a year of analytics (as /api/analytics/data
+returns it).
+
+Usage:
+    python -m benchmarks.json_serialization --items 1000
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.export_formats import seed, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--weeks", type=int, default=52)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.models.user import User
+    from app.models.work_item import WorkItem
+    from app.routers.input import serialize_item
+    from app.serialization import dumps
+    from app.services.analytics import get_analytics_data
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    seed(db, user.id, args.items)
+
+    items = [serialize_item(item) for item in db.query(WorkItem).limit(args.items).all()]
+    analytics = get_analytics_data(db, weeks_back=args.weeks, user_id=user.id)
+    db.close()
+
+    encoders = {
+        "json (default=str)": lambda data: json.dumps(data, default=str).encode("utf-8"),
+        "jsonable_encoder + json": lambda data: json.dumps(jsonable_encoder(data)).encode("utf-8"),
+        "orjson (app.serialization.dumps)": dumps,
+    }
+
+    results = []
+    for payload_name, payload in (("work_items", items), ("analytics", analytics)):
+        for name, encode in encoders.items():
+            results.append({
+                "payload": payload_name,
+                "encoder": name,
+                "bytes": len(encode(payload)),
+                "ms": round(timed(lambda: encode(payload), repeat=20) * 1000, 3),
+            })
+
+    print(json.dumps({"items": len(items), "weeks": args.weeks, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
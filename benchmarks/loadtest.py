@@ -0,0 +1,241 @@
+"""
+HTTP load test: simulated users replaying realistic journeys.
+
+Each simulated user signs up (or logs in), then repeats a journey: dashboard,
+input week navigation, a burst of item creates/edits/deletes, analytics,
+reports and exports. Requests go to a running server, so the numbers include
+the real worker count, database and network stack.
+
+Redirects are not followed: every hop is timed under its own route. Routes
+are reported by template (``/input/{week_start}``), not by concrete URL.
+
+Usage:
+    uvicorn app.main:app --workers 4 &
+    python -m benchmarks.loadtest --users 20 --iterations 5 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+
+
+# Export URLs and the route template each one is served by
+EXPORT_ROUTES = {
+    "/reports/export/csv": "GET /reports/export/csv",
+    "/reports/export/excel": "GET /reports/export/excel",
+    "/reports/export/ndjson": "GET /reports/export/{export_format}",
+}
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Collects (route, status, latency) samples across all simulated users."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def add(self, route: str, seconds: float, ok: bool):
+        self.samples[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for route, latencies in sorted(self.samples.items()):
+            latencies = sorted(latencies)
+            routes[route] = {
+                "count": len(latencies),
+                "errors": self.errors[route],
+                "error_rate": round(self.errors[route] / len(latencies), 4),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+            }
+        total = sum(len(latencies) for latencies in self.samples.values())
+        errors = sum(self.errors.values())
+        return {
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "elapsed_s": round(elapsed, 2),
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "routes": routes,
+        }
+
+
+class SimulatedUser:
+    """One browser session: its own cookie jar, replaying the journey."""
+
+    def __init__(self, base_url: str, email: str, password: str, recorder: Recorder,
+                 rng: random.Random, think_time: float, burst: int):
+        self.client = httpx.AsyncClient(base_url=base_url, follow_redirects=False, timeout=60)
+        self.email = email
+        self.password = password
+        self.recorder = recorder
+        self.rng = rng
+        self.think_time = think_time
+        self.burst = burst
+
+    async def request(self, method: str, url: str, route: str, expect=(200, 302), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(route, time.perf_counter() - start, ok=False)
+            return None
+        # Read the whole body so streamed exports are timed to the last byte
+        await response.aread()
+        self.recorder.add(route, time.perf_counter() - start, ok=response.status_code in expect)
+        return response
+
+    async def pause(self):
+        if self.think_time:
+            await asyncio.sleep(self.rng.uniform(0, 2 * self.think_time))
+
+    async def sign_in(self):
+        form = {"email": self.email, "password": self.password, "confirm_password": self.password}
+        response = await self.request("POST", "/signup", "POST /signup", data=form)
+        # An existing account re-renders the signup form with an error
+        if response is None or response.status_code != 302:
+            await self.request("POST", "/login", "POST /login",
+                               data={"email": self.email, "password": self.password}, expect=(302,))
+
+    async def current_week_id(self):
+        response = await self.request("GET", "/api/v1/weeks?limit=1&fields=id", "GET /api/v1/weeks")
+        if response is None or response.status_code != 200:
+            return None
+        weeks = response.json()["data"]
+        return weeks[0]["id"] if weeks else None
+
+    async def item_burst(self, week_id: str, monday: date):
+        """Create a few small items, edit each, then delete them to free the points."""
+        headers = {"Accept": "application/json"}
+        created = []
+        for n in range(self.burst):
+            form = {
+                "week_id": week_id,
+                "type": self.rng.choice(["PLANNED", "UNPLANNED", "ADHOC"]),
+                "title": f"Load test task {n}",
+                "assigned_points": "1",
+                "start_date": monday.isoformat(),
+                "end_date": (monday + timedelta(days=4)).isoformat(),
+                "planned_work": "Planned " * self.rng.randint(1, 30),
+                "status": "TODO",
+                "idempotency_key": uuid4().hex,
+            }
+            response = await self.request("POST", "/api/work-items", "POST /api/work-items",
+                                          data=form, headers=headers)
+            if response is not None and response.status_code == 200:
+                created.append((response.json()["item"]["id"], form))
+        for item_id, form in created:
+            edit = {**form, "status": "IN_PROGRESS", "completion_points": "1",
+                    "actual_work": "Progress " * self.rng.randint(1, 30)}
+            edit.pop("week_id")
+            await self.request("POST", f"/api/work-items/{item_id}", "POST /api/work-items/{item_id}",
+                               data=edit, headers=headers)
+        for item_id, _ in created:
+            await self.request("POST", f"/api/work-items/{item_id}/delete",
+                               "POST /api/work-items/{item_id}/delete", headers=headers)
+
+    async def journey(self):
+        monday = date.today() - timedelta(days=date.today().weekday())
+        await self.request("GET", "/", "GET /")
+        await self.pause()
+
+        await self.request("GET", "/input", "GET /input")
+        for weeks_back in range(self.rng.randint(1, 4)):
+            week = monday - timedelta(weeks=weeks_back)
+            await self.request("GET", f"/input/{week}", "GET /input/{week_start}")
+        await self.pause()
+
+        week_id = await self.current_week_id()
+        if week_id:
+            await self.item_burst(week_id, monday)
+        await self.pause()
+
+        await self.request("GET", "/analytics", "GET /analytics")
+        await self.request("GET", "/api/analytics/data?weeks=12", "GET /api/analytics/data")
+        await self.pause()
+
+        await self.request("GET", "/reports", "GET /reports")
+        url = self.rng.choice(list(EXPORT_ROUTES))
+        await self.request("GET", url, EXPORT_ROUTES[url])
+        await self.pause()
+
+    async def run(self, iterations: int):
+        try:
+            await self.sign_in()
+            for _ in range(iterations):
+                await self.journey()
+        finally:
+            await self.client.aclose()
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_load(args) -> dict:
+    recorder = Recorder()
+    users = [
+        SimulatedUser(args.base_url, f"{args.email_prefix}{n}@example.com", args.password, recorder,
+                      random.Random(args.seed + n), args.think_time, args.burst)
+        for n in range(args.users)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(user.run(args.iterations) for user in users))
+    elapsed = time.perf_counter() - start
+    return {
+        "commit": current_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "users": args.users,
+        "iterations": args.iterations,
+        **recorder.report(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay user journeys against a running server")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=3, help="journeys per user")
+    parser.add_argument("--burst", type=int, default=3, help="items created per journey")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between steps, seconds")
+    parser.add_argument("--email-prefix", default="loadtest")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
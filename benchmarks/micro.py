@@ -0,0 +1,250 @@
+"""
+Micro-benchmarks for the CRUD and service functions on the request path.
+
+Seeds each database at each size with scripts/seed_data.py, then times every
+benchmark with timeit (best-of and median per call). Results are written as
+JSON; ``compare`` diffs two result files and exits non-zero when a benchmark
+got slower than the threshold allows.
+
+Non-SQLite databases have their tables dropped and recreated, so point them
+at a scratch database and pass --allow-reset.
+
+Usage:
+    python -m benchmarks.micro run --sizes 5,50 --output baseline.json
+    python -m benchmarks.micro run --database-url sqlite:// \\
+        --database-url postgresql://localhost/work_tracker_bench --allow-reset --output current.json
+    python -m benchmarks.micro compare baseline.json current.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+REPEAT = 5
+
+# Weeks of history and items per full week for every seeded user
+SEED_WEEKS = 52
+SEED_ITEMS_PER_WEEK = 15
+
+# Benchmarks that write. Each runs in a transaction that is rolled back
+# afterwards, so every other benchmark reads the data as seeded whatever
+# number of calls timeit picked on this machine.
+WRITE_BENCHMARKS = {"create_work_item"}
+
+
+def build_benchmarks(db, user_id, week_id) -> dict:
+    """Name -> zero-argument callable, all acting as one seeded user."""
+    from app.auth import create_session_token, verify_session_token
+    from app.crud.work_item import create_work_item, validate_points
+    from app.crud.work_week import get_or_create_work_week
+    from app.middleware import get_current_week_stats
+    from app.schemas.work_item import WorkItemCreate
+    from app.models.work_item import TaskType, TaskStatus
+    from app.services.analytics import get_analytics_data
+    from app.services.export import export_to_csv, export_to_excel, get_filtered_items
+    from app.services.search import search_work_items, suggest_titles
+    from app.services.team_analytics import compute_team_analytics
+
+    token = create_session_token(user_id)
+    # Zero points so repeated creates never hit the week's capacity
+    new_item = WorkItemCreate(week_id=week_id, type=TaskType.ADHOC, title="Benchmark item",
+                              assigned_points=0, status=TaskStatus.TODO)
+    today = date.today()
+    quarter_ago = today - timedelta(weeks=13)
+
+    return {
+        "get_current_week_stats": lambda: get_current_week_stats(db, user_id),
+        "validate_points": lambda: validate_points(db, week_id, 0),
+        "create_work_item": lambda: create_work_item(db, new_item),
+        "get_or_create_work_week": lambda: get_or_create_work_week(db, today, user_id),
+        "get_analytics_data": lambda: get_analytics_data(db, weeks_back=12, user_id=user_id),
+        "get_filtered_items": lambda: get_filtered_items(db, start_date=quarter_ago, user_id=user_id),
+        "export_to_csv": lambda: export_to_csv(db, start_date=quarter_ago, user_id=user_id),
+        "export_to_excel": lambda: export_to_excel(db, start_date=quarter_ago, user_id=user_id),
+        "search_work_items": lambda: search_work_items(db, user_id, "incident timeout"),
+        "suggest_titles": lambda: suggest_titles(db, user_id, "dep"),
+        "compute_team_analytics": lambda: compute_team_analytics(db, quarter_ago, today),
+        "verify_session_token": lambda: verify_session_token(token),
+    }
+
+
+def measure(fn) -> dict:
+    """Per-call timings in microseconds, with timeit choosing the loop count."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = [total / number * 1e6 for total in timer.repeat(repeat=REPEAT, number=number)]
+    return {
+        "min_us": round(min(per_call), 2),
+        "median_us": round(statistics.median(per_call), 2),
+        "calls": number * REPEAT,
+    }
+
+
+@contextmanager
+def rolled_back_session(engine):
+    """A session whose commits only release savepoints of one transaction, rolled back on exit."""
+    from sqlalchemy.orm import Session
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    if engine.dialect.name == "sqlite":
+        # pysqlite defers BEGIN until the first write, which would leave the
+        # savepoints outside any transaction to roll back
+        connection.exec_driver_sql("BEGIN")
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield db
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+def busiest_user(db):
+    """The seeded user with the longest history, and their current week."""
+    from sqlalchemy import func
+    from app.crud.work_week import get_or_create_work_week
+    from app.models.work_week import WorkWeek
+
+    user_id = db.query(WorkWeek.user_id).group_by(WorkWeek.user_id).order_by(
+        func.count(WorkWeek.id).desc()
+    ).limit(1).scalar()
+    week = get_or_create_work_week(db, date.today(), user_id)
+    return user_id, week.id
+
+
+def run_backend(url: str, sizes: list, only: set) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    import app.models  # noqa: F401  (registers the tables)
+    from scripts.seed_data import seed_dataset
+
+    engine = create_engine(url)
+    results = {}
+    for size in sizes:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        seed_dataset(engine, users=size, weeks=SEED_WEEKS, items_per_week=SEED_ITEMS_PER_WEEK,
+                     seed=size, email_prefix="bench")
+        db = sessionmaker(bind=engine)()
+        try:
+            user_id, week_id = busiest_user(db)
+            for name, fn in build_benchmarks(db, user_id, week_id).items():
+                if only and name not in only:
+                    continue
+                key = f"{engine.dialect.name}/users={size}/{name}"
+                if name in WRITE_BENCHMARKS:
+                    db.rollback()
+                    with rolled_back_session(engine) as scratch:
+                        results[key] = measure(build_benchmarks(scratch, user_id, week_id)[name])
+                else:
+                    results[key] = measure(fn)
+                print(f"{key}: {results[key]['median_us']:.1f} us", file=sys.stderr, flush=True)
+        finally:
+            db.close()
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    return results
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args) -> int:
+    urls = args.database_url or [f"sqlite:///{tempfile.mkdtemp()}/micro.db"]
+    unsafe = [url for url in urls if not url.startswith("sqlite")]
+    if unsafe and not args.allow_reset:
+        print(f"Refusing to drop tables in {', '.join(unsafe)} without --allow-reset", file=sys.stderr)
+        return 2
+
+    # Set before the app modules read their settings
+    os.environ.setdefault("DATABASE_URL", urls[0])
+    os.environ["INVALIDATION_BACKEND"] = "loopback"
+    sizes = [int(size) for size in args.sizes.split(",")]
+    only = set(args.only.split(",")) if args.only else set()
+
+    results = {}
+    for url in urls:
+        results.update(run_backend(url, sizes, only))
+
+    import sqlalchemy
+    report = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "seed": {"weeks": SEED_WEEKS, "items_per_week": SEED_ITEMS_PER_WEEK},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':60} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key]["median_us"]
+        after = current[key]["median_us"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:60} {before:>10.1f}us {after:>10.1f}us {change:>+7.1%}{flag}")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key:60} missing from current results")
+
+    if regressions:
+        print(f"{regressions} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRUD and service micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed, benchmark and write results")
+    run_parser.add_argument("--database-url", action="append",
+                            help="repeatable; defaults to a throwaway SQLite file")
+    run_parser.add_argument("--sizes", default="5,50", help="comma-separated seeded user counts")
+    run_parser.add_argument("--only", help="comma-separated benchmark names")
+    run_parser.add_argument("--allow-reset", action="store_true",
+                            help="allow dropping tables in non-SQLite databases")
+    run_parser.add_argument("--output", help="write results JSON here as well as stdout")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15,
+                                help="allowed slowdown of the median, as a fraction")
+
+    args = parser.parse_args()
+    handler = run if args.command == "run" else compare
+    sys.exit(handler(args))
+
+
+if __name__ == "__main__":
+    main()
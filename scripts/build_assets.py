@@ -0,0 +1,73 @@
+"""
+Build fingerprinted frontend assets into app/static/dist.
+
+Emits purged Tailwind CSS (compiled once here instead of in every browser),
+a local Chart.js bundle, and the page scripts from app/static/js. Each file
+is written as <name>.<content hash>.<ext> and recorded in manifest.json,
+which app.assets.asset_url() reads to build template URLs.
+
+Requires the Node dev dependencies from package.json (npm install).
+
+Usage:
+    python scripts/build_assets.py [--static-dir app/static]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
+TAILWIND_INPUT = "frontend/tailwind.css"
+TAILWIND_CONFIG = "tailwind.config.js"
+CHARTJS_BUNDLE = "node_modules/chart.js/dist/chart.umd.js"
+PAGE_SCRIPTS = ["app.js", "input.js", "analytics.js"]
+
+
+def fingerprint(name: str, data: bytes, dist_dir: str) -> str:
+    """Write data as <stem>.<hash><ext> in dist_dir and return the filename."""
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    filename = f"{stem}.{digest}{ext}"
+    with open(os.path.join(dist_dir, filename), "wb") as f:
+        f.write(data)
+    return filename
+
+
+def build_tailwind() -> bytes:
+    return subprocess.run(
+        ["npx", "tailwindcss", "-c", TAILWIND_CONFIG, "-i", TAILWIND_INPUT, "--minify"],
+        check=True, capture_output=True
+    ).stdout
+
+
+def build(static_dir: str) -> dict:
+    dist_dir = os.path.join(static_dir, "dist")
+    # Start clean so stale fingerprints do not accumulate
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+    
+    sources = {"tailwind.css": build_tailwind()}
+    with open(CHARTJS_BUNDLE, "rb") as f:
+        sources["chart.js"] = f.read()
+    for name in PAGE_SCRIPTS:
+        with open(os.path.join(static_dir, "js", name), "rb") as f:
+            sources[name] = f.read()
+    
+    manifest = {name: fingerprint(name, data, dist_dir) for name, data in sources.items()}
+    with open(os.path.join(dist_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fingerprinted frontend assets")
+    parser.add_argument("--static-dir", default="app/static")
+    args = parser.parse_args()
+    
+    for name, filename in build(args.static_dir).items():
+        print(f"{name} -> dist/{filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Write .br and .gz siblings for every compressible file under app/static.
+
+Run at build time; PrecompressedStaticFiles serves the siblings directly so
+static assets are never compressed per request.
+
+Usage:
+    python scripts/precompress_static.py [--static-dir app/static]
+"""
+import argparse
+import gzip
+import os
+import brotli
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".html", ".svg", ".json", ".txt", ".map", ".xml"}
+
+# Below this the compressed file plus headers is rarely smaller
+MINIMUM_SIZE = 256
+
+
+def precompress(static_dir: str) -> list:
+    results = []
+    for root, _, files in os.walk(static_dir):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < MINIMUM_SIZE:
+                continue
+            
+            siblings = {
+                ".br": brotli.compress(data, quality=11),
+                ".gz": gzip.compress(data, compresslevel=9, mtime=0),
+            }
+            for suffix, compressed in siblings.items():
+                # Only keep siblings that actually save bytes
+                if len(compressed) < len(data):
+                    with open(path + suffix, "wb") as f:
+                        f.write(compressed)
+            results.append((path, len(data), len(siblings[".br"]), len(siblings[".gz"])))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompress static assets")
+    parser.add_argument("--static-dir", default="app/static")
+    args = parser.parse_args()
+    
+    for path, size, br_size, gz_size in precompress(args.static_dir):
+        print(f"{path}: {size} B -> br {br_size} B, gz {gz_size} B")
+
+
+if __name__ == "__main__":
+    main()
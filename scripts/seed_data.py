@@ -0,0 +1,259 @@
+"""
+Seed a database with a synthetic, production-shaped dataset.
+
+Generates users, a contiguous history of work weeks per user (with OOO days)
+and work items with realistic type, status, points and text-length mixes.
+The output is a pure function of --seed and --end-date, so two runs with the
+same arguments produce identical rows, ids included (only the bcrypt salt of
+the shared password differs).
+
+Rows are generated per batch of users and written straight away, so memory
+stays flat at any size. Postgres gets COPY; other databases get batched
+executemany inserts. All seeded users share one password.
+
+Usage:
+    python scripts/seed_data.py --users 5000 --weeks 156 --items-per-week 15
+    python scripts/seed_data.py --database-url sqlite:///./seed.db --create-tables --users 50
+"""
+import argparse
+import csv
+import io
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+
+TYPE_WEIGHTS = {"PLANNED": 60, "UNPLANNED": 25, "ADHOC": 15}
+
+# Status mix for finished weeks vs the current week
+PAST_STATUS_WEIGHTS = {
+    "COMPLETED": 72, "IN_PROGRESS": 6, "DELAYED": 8, "HOLD": 4, "ABANDONED": 5, "TODO": 5,
+}
+CURRENT_STATUS_WEIGHTS = {
+    "TODO": 40, "IN_PROGRESS": 42, "COMPLETED": 12, "HOLD": 3, "DELAYED": 3,
+}
+
+# Most weeks have no time off; the tail covers sick days and holidays
+OOO_WEIGHTS = {0: 85, 1: 7, 2: 3, 3: 2, 4: 1, 5: 2}
+
+WORDS = (
+    "api auth backlog bug build cache ci client config customer dashboard data deploy design "
+    "docs endpoint export feature fix flaky incident index integration latency load login "
+    "meeting metrics migration model monitoring onboarding page performance pipeline query "
+    "refactor release report review schema search service sync test ticket timeout ui "
+    "update upgrade user validation"
+).split()
+
+BATCH_USERS = 50
+
+USER_COLUMNS = ["id", "email", "password_hash", "is_admin", "data_version", "created_at", "updated_at"]
+WEEK_COLUMNS = ["id", "user_id", "week_start", "week_end", "total_points", "ooo_days", "created_at", "updated_at"]
+ITEM_COLUMNS = [
+    "id", "week_id", "type", "title", "start_date", "end_date", "assigned_points",
+    "completion_points", "planned_work", "actual_work", "next_week_plan", "document_url",
+    "status", "created_at", "updated_at",
+]
+
+
+def weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def sentence(rng: random.Random, mean_words: float) -> str:
+    """Text whose word count is roughly log-normal: mostly short, some long."""
+    count = max(1, int(rng.lognormvariate(math.log(mean_words), 0.6)))
+    return " ".join(rng.choice(WORDS) for _ in range(count)).capitalize()
+
+
+def split_points(rng: random.Random, budget: int, count: int) -> list:
+    """Split budget into count positive integers (count <= budget)."""
+    weights = [rng.expovariate(1.0) for _ in range(count)]
+    total = sum(weights)
+    points = [max(1, int(budget * w / total)) for w in weights]
+    while sum(points) > budget:
+        points[points.index(max(points))] -= 1
+    return points
+
+
+def generate_items(rng: random.Random, week: dict, items_per_week: float, weeks_ago: int):
+    capacity = week["total_points"]
+    if capacity == 0:
+        return
+    count = max(1, round(rng.gauss(items_per_week * capacity / 100, items_per_week / 5)))
+    budget = int(capacity * rng.uniform(0.6, 1.0))
+    count = min(count, budget)
+    statuses = PAST_STATUS_WEIGHTS if weeks_ago else CURRENT_STATUS_WEIGHTS
+    created = datetime.combine(week["week_start"], dt_time(9))
+
+    for points in split_points(rng, budget, count):
+        status = weighted(rng, statuses)
+        start = week["week_start"] + timedelta(days=rng.randint(0, 4))
+        end = min(start + timedelta(days=rng.randint(0, 4)), week["week_end"])
+        if status == "COMPLETED":
+            completion = points
+        elif status in ("IN_PROGRESS", "DELAYED", "HOLD"):
+            completion = rng.randint(0, points)
+        else:
+            completion = None
+        started = status != "TODO"
+        item_created = created + timedelta(minutes=rng.randint(0, 5 * 24 * 60))
+        yield {
+            "id": seeded_uuid(rng),
+            "week_id": week["id"],
+            "type": weighted(rng, TYPE_WEIGHTS),
+            "title": sentence(rng, 5)[:255],
+            "start_date": start,
+            "end_date": end,
+            "assigned_points": points,
+            "completion_points": completion,
+            "planned_work": sentence(rng, 25) if rng.random() < 0.8 else None,
+            "actual_work": sentence(rng, 40) if started and rng.random() < 0.9 else None,
+            "next_week_plan": sentence(rng, 15) if rng.random() < 0.4 else None,
+            "document_url": f"https://docs.example.com/{rng.getrandbits(32):08x}" if rng.random() < 0.1 else None,
+            "status": status,
+            "created_at": item_created,
+            "updated_at": item_created + timedelta(hours=rng.randint(0, 72)),
+        }
+
+
+def generate_user(rng: random.Random, index: int, email_prefix: str, password_hash: str,
+                  end_monday: date, weeks: int, items_per_week: float):
+    """Yield ("user" | "week" | "item", row) for one user and their history."""
+    # Users join at different times, so history lengths vary
+    history = rng.randint(max(1, weeks // 4), weeks)
+    joined = datetime.combine(end_monday - timedelta(weeks=history - 1), dt_time(8))
+    user_id = seeded_uuid(rng)
+    yield "user", {
+        "id": user_id,
+        "email": f"{email_prefix}{index}@example.com",
+        "password_hash": password_hash,
+        "is_admin": False,
+        "data_version": 0,
+        "created_at": joined,
+        "updated_at": joined,
+    }
+    for weeks_ago in range(history - 1, -1, -1):
+        monday = end_monday - timedelta(weeks=weeks_ago)
+        ooo_days = weighted(rng, OOO_WEIGHTS)
+        created = datetime.combine(monday, dt_time(8))
+        week = {
+            "id": seeded_uuid(rng),
+            "user_id": user_id,
+            "week_start": monday,
+            "week_end": monday + timedelta(days=4),
+            "total_points": (5 - ooo_days) * 20,
+            "ooo_days": ooo_days,
+            "created_at": created,
+            "updated_at": created,
+        }
+        yield "week", week
+        for item in generate_items(rng, week, items_per_week, weeks_ago):
+            yield "item", item
+
+
+def copy_rows(raw_connection, table: str, columns: list, rows: list):
+    """Stream rows into Postgres with COPY ... FROM STDIN (CSV; None -> NULL)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def write_batch(engine, batch: dict):
+    from app.models.user import User
+    from app.models.work_week import WorkWeek
+    from app.models.work_item import WorkItem
+
+    tables = [(User.__table__, USER_COLUMNS, batch["user"]),
+              (WorkWeek.__table__, WEEK_COLUMNS, batch["week"]),
+              (WorkItem.__table__, ITEM_COLUMNS, batch["item"])]
+    if engine.dialect.name == "postgresql":
+        raw = engine.raw_connection()
+        try:
+            for table, columns, rows in tables:
+                if rows:
+                    copy_rows(raw, table.name, columns, rows)
+            raw.commit()
+        finally:
+            raw.close()
+    else:
+        with engine.begin() as conn:
+            for table, _, rows in tables:
+                if rows:
+                    conn.execute(table.insert(), rows)
+
+
+def seed_dataset(engine, users: int, weeks: int, items_per_week: float, seed: int = 42,
+                 end_date: date = None, email_prefix: str = "seed", password: str = "seed123",
+                 progress: bool = False) -> dict:
+    """Generate and insert the dataset; returns row counts per table."""
+    from app.crud.user import hash_password
+
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    end_monday = end_date - timedelta(days=end_date.weekday())
+    # bcrypt is deliberately slow: hash once and share it
+    password_hash = hash_password(password)
+    counts = {"user": 0, "week": 0, "item": 0}
+    started = time.perf_counter()
+
+    for first in range(0, users, BATCH_USERS):
+        batch = {"user": [], "week": [], "item": []}
+        for index in range(first, min(first + BATCH_USERS, users)):
+            for kind, row in generate_user(rng, index, email_prefix, password_hash,
+                                           end_monday, weeks, items_per_week):
+                batch[kind].append(row)
+        write_batch(engine, batch)
+        for kind, rows in batch.items():
+            counts[kind] += len(rows)
+        if progress:
+            elapsed = time.perf_counter() - started
+            print(f"{counts['user']}/{users} users, {counts['week']} weeks, "
+                  f"{counts['item']} items ({elapsed:.1f}s)", flush=True)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic work tracker dataset")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL / app settings")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--weeks", type=int, default=156, help="history per user, at most")
+    parser.add_argument("--items-per-week", type=float, default=15, help="mean items in a full week")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=date.fromisoformat, help="last week seeded (default: this week)")
+    parser.add_argument("--email-prefix", default="seed")
+    parser.add_argument("--password", default="seed123")
+    parser.add_argument("--create-tables", action="store_true", help="create missing tables first")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from app.config import get_settings
+    from app.database import Base
+    import app.models  # noqa: F401  (registers the tables for create_all)
+
+    engine = create_engine(get_settings().database_url)
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+    counts = seed_dataset(engine, args.users, args.weeks, args.items_per_week, seed=args.seed,
+                          end_date=args.end_date, email_prefix=args.email_prefix,
+                          password=args.password, progress=True)
+    print(f"Seeded {counts['user']} users, {counts['week']} weeks, {counts['item']} items")
+
+
+if __name__ == "__main__":
+    main()
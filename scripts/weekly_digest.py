@@ -0,0 +1,131 @@
+"""
+Write last week's digest for every user to a local outbox.
+
+Each digest covers one user's week: its items, completed vs assigned points,
+carry-overs and next week's plans, as <outbox>/<week>/<user_id>.html and .md.
+
+Users are read in id order, chunk by chunk, with two queries per chunk; the
+chunks are rendered and written by a process pool while the next ones load.
+After every chunk is written (in order) the last user id is saved to
+<outbox>/<week>/progress.json, so an interrupted run picks up where it left
+off. A finished week is skipped unless --restart is given.
+
+Usage:
+    python scripts/weekly_digest.py
+    python scripts/weekly_digest.py --week 2026-10-12 --outbox /var/spool/digests --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+CHUNK_USERS = 500
+PROGRESS_FILE = "progress.json"
+
+
+def read_progress(directory: str) -> dict:
+    path = os.path.join(directory, PROGRESS_FILE)
+    if not os.path.exists(path):
+        return {"after": None, "users": 0, "done": False}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_progress(directory: str, progress: dict) -> None:
+    path = os.path.join(directory, PROGRESS_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({**progress, "updated_at": datetime.utcnow().isoformat()}, f)
+    os.replace(path + ".tmp", path)
+
+
+def generate_digests(engine, outbox: str, week_start: date, chunk_size: int = CHUNK_USERS,
+                     workers: int = None, restart: bool = False, progress: bool = False) -> dict:
+    """Write every user's digest for the week; returns the saved progress.
+
+    workers=1 renders in this process instead of a pool.
+    """
+    from app.services.digest import iter_user_chunks, load_digests, write_digests
+
+    directory = os.path.join(outbox, week_start.isoformat())
+    os.makedirs(directory, exist_ok=True)
+    state = {"after": None, "users": 0, "done": False} if restart else read_progress(directory)
+    if state["done"]:
+        return state
+
+    workers = workers or os.cpu_count() or 1
+    after = UUID(state["after"]) if state["after"] else None
+    started = time.perf_counter()
+
+    def finished(last_id: UUID, written: int) -> None:
+        state["after"] = str(last_id)
+        state["users"] += written
+        save_progress(directory, state)
+        if progress:
+            elapsed = time.perf_counter() - started
+            print(f"{state['users']} digests ({elapsed:.1f}s)", flush=True)
+
+    with Session(engine) as db:
+        chunks = iter_user_chunks(db, chunk_size, after=after)
+        if workers == 1:
+            for chunk in chunks:
+                finished(chunk[-1][0], write_digests(directory, load_digests(db, chunk, week_start)))
+        else:
+            # A few chunks in flight per worker keeps every core busy while
+            # memory stays flat; results are taken in order so the saved
+            # position never skips an unwritten chunk
+            in_flight = deque()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk in chunks:
+                    digests = load_digests(db, chunk, week_start)
+                    in_flight.append((chunk[-1][0], pool.submit(write_digests, directory, digests)))
+                    if len(in_flight) >= workers * 2:
+                        last_id, future = in_flight.popleft()
+                        finished(last_id, future.result())
+                while in_flight:
+                    last_id, future = in_flight.popleft()
+                    finished(last_id, future.result())
+
+    state["done"] = True
+    save_progress(directory, state)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write weekly digests for every user")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL / app settings")
+    parser.add_argument("--week", type=date.fromisoformat, help="Monday of the week (default: last week)")
+    parser.add_argument("--outbox", help="defaults to DIGEST_OUTBOX_DIR / app settings")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_USERS, help="users loaded per query")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per core)")
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress and rewrite every digest")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from app.config import get_settings
+    from app.services.digest import digest_week_start
+
+    settings = get_settings()
+    if args.week:
+        week_start = args.week - timedelta(days=args.week.weekday())
+    else:
+        week_start = digest_week_start()
+    engine = create_engine(settings.database_url)
+    state = generate_digests(engine, args.outbox or settings.digest_outbox_dir, week_start,
+                             chunk_size=args.chunk_size, workers=args.workers,
+                             restart=args.restart, progress=True)
+    print(f"Wrote {state['users']} digests for the week of {week_start}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@
 Shared test fixtures for Work Tracker tests.
 """
 import os
+import re
 import pytest
+from collections import Counter
 from datetime import date, timedelta
 from typing import Generator
 from uuid import uuid4
@@ -11,7 +13,7 @@ from uuid import uuid4
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -34,6 +36,98 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# A statement shape executed more than this many times within one request
+# is reported as an N+1 pattern.
+N_PLUS_ONE_THRESHOLD = 3
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_EXPANDED_PARAMS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Reduce a SQL statement to its shape: literals and IN-lists collapsed."""
+    shape = _LITERALS.sub("?", statement)
+    shape = _EXPANDED_PARAMS.sub("(?)", shape)
+    return " ".join(shape.split())
+
+
+class RecordedRequest:
+    """Statements executed while serving one request through the test client."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.statements: list[str] = []
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {self.path}"
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict:
+        """Statement shapes executed more than ``threshold`` times."""
+        counts = Counter(statement_shape(s) for s in self.statements)
+        return {shape: n for shape, n in counts.items() if n > threshold}
+
+
+class QueryRecorder:
+    """Records the SQL of every request made through the ``client`` fixture.
+
+    Listens on the test engine's ``before_cursor_execute`` and files each
+    statement under the request that is currently in flight; statements run
+    outside a request (fixtures, direct crud calls) are ignored.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.requests: list[RecordedRequest] = []
+        self._current = None
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current is not None:
+            self._current.statements.append(statement)
+
+    def start(self, request):
+        """httpx request hook: open a frame for this request (or redirect hop)."""
+        self._current = RecordedRequest(request.method, request.url.path)
+        self.requests.append(self._current)
+
+    def stop(self, response):
+        """httpx response hook: the app has finished serving the request."""
+        self._current = None
+
+    def install(self, client: TestClient) -> TestClient:
+        client.event_hooks = {"request": [self.start], "response": [self.stop]}
+        return client
+
+    def for_endpoint(self, endpoint: str) -> list[RecordedRequest]:
+        """Recorded requests matching ``"METHOD /path"``."""
+        return [r for r in self.requests if r.endpoint == endpoint]
+
+    def assert_budget(self, endpoint: str, budget: int):
+        """Fail if any request to ``endpoint`` ran more than ``budget`` statements."""
+        recorded = self.for_endpoint(endpoint)
+        assert recorded, f"no requests recorded for {endpoint}"
+        for request in recorded:
+            assert len(request.statements) <= budget, (
+                f"{endpoint} ran {len(request.statements)} queries (budget {budget}):\n"
+                + "\n".join(request.statements)
+            )
+
+    def n_plus_one_report(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[str]:
+        report = []
+        for request in self.requests:
+            for shape, count in request.repeated(threshold).items():
+                report.append(f"{request.endpoint}: {count}x {shape}")
+        return report
+
+
 def override_get_db():
     """Override database dependency for tests."""
     db = TestingSessionLocal()
@@ -58,11 +152,28 @@ def db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def query_recorder() -> Generator[QueryRecorder, None, None]:
+    """Record the statements of each request made through ``client``."""
+    with QueryRecorder(engine) as recorder:
+        yield recorder
+
+
 @pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
-    """Create a test client with database override."""
+def client(db: Session, tmp_path, request, query_recorder: QueryRecorder) -> Generator[TestClient, None, None]:
+    """Create a test client with database override.
+
+    Any request that repeats one statement shape more than
+    ``N_PLUS_ONE_THRESHOLD`` times fails the test, unless the test is
+    marked ``allow_n_plus_one``.
+    """
     import app.database as app_database
     import app.main as app_main
+    from app.services.export_cache import export_cache
+    
+    # Keep cached exports per test
+    original_export_dir = export_cache.directory
+    export_cache.directory = str(tmp_path / "exports")
     
     # Override dependency injection
     app.dependency_overrides[get_db] = override_get_db
@@ -73,12 +184,17 @@ def client(db: Session) -> Generator[TestClient, None, None]:
     app_main.SessionLocal = TestingSessionLocal
     
     with TestClient(app) as test_client:
-        yield test_client
+        yield query_recorder.install(test_client)
     
     # Restore
     app_database.SessionLocal = original_session_local
     app_main.SessionLocal = original_session_local
+    export_cache.directory = original_export_dir
     app.dependency_overrides.clear()
+    
+    report = query_recorder.n_plus_one_report()
+    if report and request.node.get_closest_marker("allow_n_plus_one") is None:
+        pytest.fail("Repeated statement shapes (N+1):\n" + "\n".join(report))
 
 
 @pytest.fixture
@@ -252,3 +368,40 @@ def multiple_weeks_data(db: Session, regular_user: User) -> list[WorkWeek]:
         weeks.append(week)
     
     return weeks
+
+
+@pytest.fixture
+def make_week(db: Session):
+    """Factory for work weeks.
+
+    ``make_week(user, weeks_ago=0, week_start=None, **fields)`` creates the
+    week starting ``week_start``, or the Monday ``weeks_ago`` weeks back,
+    with 100 points unless ``total_points`` is given.
+    """
+    def make(user: User, weeks_ago: int = 0, week_start: date = None, **fields) -> WorkWeek:
+        if week_start is None:
+            today = date.today()
+            week_start = today - timedelta(days=today.weekday(), weeks=weeks_ago)
+        fields.setdefault("total_points", 100)
+        week = WorkWeek(
+            id=uuid4(),
+            user_id=user.id,
+            week_start=week_start,
+            week_end=week_start + timedelta(days=4),
+            **fields
+        )
+        db.add(week)
+        db.commit()
+        return week
+    return make
+
+
+@pytest.fixture
+def make_item(db: Session):
+    """Factory for work items: ``make_item(week, title="Task", **fields)``, model defaults otherwise."""
+    def make(week: WorkWeek, title: str = "Task", **fields) -> WorkItem:
+        item = WorkItem(id=uuid4(), week_id=week.id, title=title, **fields)
+        db.add(item)
+        db.commit()
+        return item
+    return make
@@ -111,6 +111,18 @@ class TestAnalyticsAPI:
         """Test analytics data with weeks parameter."""
         response = authenticated_client.get("/api/analytics/data?weeks=8")
         assert response.status_code in [200, 302]
+    
+    @pytest.mark.analytics
+    def test_analytics_data_not_modified(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test unchanged analytics data answers 304 and varies by weeks."""
+        response = authenticated_client.get("/api/analytics/data?weeks=8")
+        etag = response.headers["etag"]
+        
+        cached = authenticated_client.get("/api/analytics/data?weeks=8", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        
+        other = authenticated_client.get("/api/analytics/data?weeks=4", headers={"If-None-Match": etag})
+        assert other.status_code == 200
 
 
 class TestAnalyticsCalculations:
@@ -0,0 +1,170 @@
+"""
+Tests for the JSON REST API.
+"""
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.crud.work_week import create_work_week
+from app.models.user import User
+from app.models.work_week import WorkWeek
+from app.models.work_item import WorkItem
+
+
+class TestWeeksApi:
+    """Tests for /api/v1/weeks."""
+    
+    @pytest.mark.api
+    def test_requires_auth(self, client: TestClient):
+        """Test unauthenticated API calls get 401 instead of the login redirect."""
+        response = client.get("/api/v1/weeks", follow_redirects=False)
+        assert response.status_code == 401
+    
+    @pytest.mark.api
+    def test_keyset_pagination(self, authenticated_client: TestClient, db: Session, regular_user: User):
+        """Test paging through weeks newest first with the cursor."""
+        base = create_work_week(db, *self._week(0), regular_user.id)
+        for weeks_ago in range(1, 5):
+            create_work_week(db, *self._week(weeks_ago), regular_user.id)
+        
+        first = authenticated_client.get("/api/v1/weeks?limit=2").json()
+        assert [w["week_start"] for w in first["data"]] == [
+            base.week_start.isoformat(), (base.week_start - timedelta(weeks=1)).isoformat()
+        ]
+        second = authenticated_client.get(f"/api/v1/weeks?limit=2&cursor={first['next_cursor']}").json()
+        third = authenticated_client.get(f"/api/v1/weeks?limit=2&cursor={second['next_cursor']}").json()
+        assert len(second["data"]) == 2
+        assert len(third["data"]) == 1
+        assert third["next_cursor"] is None
+    
+    @pytest.mark.api
+    def test_sparse_fields(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test ?fields= returns only the requested columns."""
+        response = authenticated_client.get("/api/v1/weeks?fields=id,total_points")
+        assert response.json()["data"] == [{"id": str(sample_work_week.id), "total_points": 100}]
+        
+        response = authenticated_client.get("/api/v1/weeks?fields=id,password_hash")
+        assert response.status_code == 400
+    
+    @pytest.mark.api
+    def test_create_update_delete_week(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test the week lifecycle through the API."""
+        next_week = sample_work_week.week_start + timedelta(weeks=1, days=2)
+        response = authenticated_client.post("/api/v1/weeks", json={"week_start": next_week.isoformat()})
+        assert response.status_code == 201
+        week = response.json()
+        assert week["week_start"] == (sample_work_week.week_start + timedelta(weeks=1)).isoformat()
+        
+        duplicate = authenticated_client.post("/api/v1/weeks", json={"week_start": next_week.isoformat()})
+        assert duplicate.status_code == 409
+        
+        response = authenticated_client.patch(f"/api/v1/weeks/{week['id']}", json={"ooo_days": 2})
+        assert response.json()["total_points"] == 60
+        
+        assert authenticated_client.delete(f"/api/v1/weeks/{week['id']}").status_code == 204
+        assert authenticated_client.get(f"/api/v1/weeks/{week['id']}").status_code == 404
+    
+    @pytest.mark.api
+    def test_other_users_week_hidden(self, client: TestClient, admin_user: User, sample_work_week: WorkWeek):
+        """Test weeks of other users are not visible."""
+        client.post("/login", data={"email": "admin@test.com", "password": "admin123"})
+        assert client.get(f"/api/v1/weeks/{sample_work_week.id}").status_code == 404
+        assert client.get(f"/api/v1/weeks/{sample_work_week.id}/items").status_code == 404
+    
+    @staticmethod
+    def _week(weeks_ago: int):
+        today = date.today()
+        monday = today - timedelta(days=today.weekday(), weeks=weeks_ago)
+        return monday, monday + timedelta(days=4)
+
+
+class TestItemsApi:
+    """Tests for /api/v1/weeks/{id}/items."""
+    
+    @pytest.mark.api
+    def test_list_items_paginated(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek, sample_work_items: list[WorkItem]
+    ):
+        """Test items page in creation order without the big text columns."""
+        url = f"/api/v1/weeks/{sample_work_week.id}/items?fields=title,assigned_points&limit=2"
+        first = authenticated_client.get(url).json()
+        assert first["data"][0] == {"title": "Planned Task 1", "assigned_points": 30}
+        second = authenticated_client.get(f"{url}&cursor={first['next_cursor']}").json()
+        titles = [row["title"] for row in first["data"] + second["data"]]
+        assert sorted(titles) == sorted(item.title for item in sample_work_items)
+        assert second["next_cursor"] is None
+    
+    @pytest.mark.api
+    def test_invalid_cursor(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test a malformed cursor is rejected."""
+        response = authenticated_client.get(f"/api/v1/weeks/{sample_work_week.id}/items?cursor=nonsense")
+        assert response.status_code == 400
+    
+    @pytest.mark.api
+    def test_item_lifecycle(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test creating, patching and deleting an item."""
+        base = f"/api/v1/weeks/{sample_work_week.id}/items"
+        response = authenticated_client.post(base, json={"title": "API task", "assigned_points": 10})
+        assert response.status_code == 201
+        item = response.json()
+        assert item["type"] == "PLANNED"
+        assert item["week_id"] == str(sample_work_week.id)
+        
+        response = authenticated_client.patch(f"{base}/{item['id']}", json={"status": "COMPLETED"})
+        assert response.json()["status"] == "COMPLETED"
+        assert response.json()["title"] == "API task"
+        
+        response = authenticated_client.get(f"{base}/{item['id']}?fields=status")
+        assert response.json() == {"status": "COMPLETED"}
+        
+        assert authenticated_client.delete(f"{base}/{item['id']}").status_code == 204
+        assert authenticated_client.get(f"{base}/{item['id']}").status_code == 404
+    
+    @pytest.mark.api
+    @pytest.mark.parametrize("field", ["title", "type", "status", "assigned_points"])
+    def test_patch_rejects_null_for_required_field(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], field: str
+    ):
+        """Test an explicit null for a NOT NULL column is a 422 and leaves the item unchanged."""
+        item = sample_work_items[0]
+        url = f"/api/v1/weeks/{item.week_id}/items/{item.id}"
+        response = authenticated_client.patch(url, json={field: None})
+        assert response.status_code == 422
+        assert f"{field} cannot be null" in response.text
+        assert authenticated_client.get(url).json()["title"] == "Planned Task 1"
+    
+    @pytest.mark.api
+    def test_patch_allows_null_for_optional_field(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test nullable columns can still be cleared."""
+        item = sample_work_items[0]
+        url = f"/api/v1/weeks/{item.week_id}/items/{item.id}"
+        response = authenticated_client.patch(url, json={"next_week_plan": None})
+        assert response.status_code == 200
+        assert response.json()["next_week_plan"] is None
+    
+    @pytest.mark.api
+    def test_ooo_days_rejected_over_capacity(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek, make_item
+    ):
+        """Test OOO days that would leave the week overbooked are rejected, as in the form."""
+        make_item(sample_work_week, assigned_points=60)
+        response = authenticated_client.patch(f"/api/v1/weeks/{sample_work_week.id}", json={"ooo_days": 5})
+        assert response.status_code == 400
+        assert "only 0 points available" in response.json()["detail"]
+        
+        week = authenticated_client.get(f"/api/v1/weeks/{sample_work_week.id}").json()
+        assert (week["ooo_days"], week["total_points"]) == (0, 100)
+        assert authenticated_client.patch(
+            f"/api/v1/weeks/{sample_work_week.id}", json={"ooo_days": 2}
+        ).json()["total_points"] == 60
+    
+    @pytest.mark.api
+    def test_points_budget_enforced(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test the API applies the same point validation as the forms."""
+        response = authenticated_client.post(
+            f"/api/v1/weeks/{sample_work_week.id}/items", json={"title": "Too big", "assigned_points": 150}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,97 @@
+"""
+Tests for the fingerprinted frontend asset pipeline.
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+
+import app.assets as assets
+from app.models.work_item import WorkItem
+from app.staticfiles import PrecompressedStaticFiles
+from scripts.build_assets import fingerprint
+
+
+class TestAssetManifest:
+    """Tests for resolving logical asset names."""
+    
+    @pytest.mark.performance
+    def test_asset_url_before_build(self, monkeypatch):
+        """Test unbuilt assets resolve to None so templates can fall back."""
+        monkeypatch.setattr(assets, "MANIFEST", {})
+        assert assets.asset_url("tailwind.css") is None
+    
+    @pytest.mark.performance
+    def test_asset_url_from_manifest(self, monkeypatch):
+        """Test built assets resolve to their fingerprinted dist URL."""
+        monkeypatch.setattr(assets, "MANIFEST", {"input.js": "input.0123456789ab.js"})
+        assert assets.asset_url("input.js") == "/static/dist/input.0123456789ab.js"
+    
+    @pytest.mark.performance
+    def test_load_manifest(self, tmp_path):
+        """Test the manifest written by the build is loaded."""
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"app.js": "app.abc.js"}))
+        assert assets.load_manifest(str(path)) == {"app.js": "app.abc.js"}
+        assert assets.load_manifest(str(tmp_path / "missing.json")) == {}
+    
+    @pytest.mark.performance
+    def test_fingerprint_changes_with_content(self, tmp_path):
+        """Test fingerprinted names follow the file content."""
+        first = fingerprint("app.js", b"console.log(1);", str(tmp_path))
+        second = fingerprint("app.js", b"console.log(2);", str(tmp_path))
+        
+        assert first.startswith("app.") and first.endswith(".js")
+        assert first != second
+        assert (tmp_path / first).read_bytes() == b"console.log(1);"
+
+
+class TestTemplateAssets:
+    """Tests for how pages reference assets."""
+    
+    @pytest.mark.performance
+    def test_built_assets_replace_cdn(self, authenticated_client: TestClient, monkeypatch):
+        """Test pages link the built CSS instead of the runtime Tailwind compiler."""
+        monkeypatch.setattr(assets, "MANIFEST", {
+            "tailwind.css": "tailwind.aaaaaaaaaaaa.css",
+            "app.js": "app.bbbbbbbbbbbb.js",
+        })
+        response = authenticated_client.get("/")
+        
+        assert "/static/dist/tailwind.aaaaaaaaaaaa.css" in response.text
+        assert "/static/dist/app.bbbbbbbbbbbb.js" in response.text
+        assert "cdn.tailwindcss.com" not in response.text
+    
+    @pytest.mark.performance
+    def test_chartjs_only_on_analytics(self, authenticated_client: TestClient):
+        """Test Chart.js is loaded by the analytics page only."""
+        assert "chart.umd" not in authenticated_client.get("/").text
+        assert "chart.umd" in authenticated_client.get("/analytics").text
+    
+    @pytest.mark.performance
+    def test_input_page_embeds_data_for_extracted_script(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test the input page ships items as JSON for the external script."""
+        response = authenticated_client.get(f"/input/{sample_work_items[0].start_date}")
+        
+        assert 'id="input-page-data"' in response.text
+        assert "/static/js/input.js" in response.text
+        assert "function editItem" not in response.text
+
+
+class TestImmutableAssets:
+    """Tests for caching headers on fingerprinted files."""
+    
+    @pytest.mark.performance
+    def test_dist_files_are_immutable(self, tmp_path):
+        """Test files under dist/ get a long-lived immutable Cache-Control."""
+        (tmp_path / "dist").mkdir()
+        (tmp_path / "dist" / "app.0123456789ab.js").write_text("console.log(1);")
+        (tmp_path / "plain.js").write_text("console.log(2);")
+        app = Starlette()
+        app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)))
+        client = TestClient(app)
+        
+        assert "immutable" in client.get("/static/dist/app.0123456789ab.js").headers["cache-control"]
+        assert "cache-control" not in client.get("/static/plain.js").headers
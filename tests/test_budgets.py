@@ -0,0 +1,267 @@
+"""
+Tests for per-route query budgets and the degraded responses they trigger.
+"""
+import itertools
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import budgets
+from app.budgets import BudgetExceeded, current_budget, query_budget, staged_deadlines
+from app.models.work_item import WorkItem
+from app.routers import analytics as analytics_router
+
+
+def breaches(route: str) -> float:
+    return REGISTRY.get_sample_value("query_budget_exceeded_total", {"route": route}) or 0.0
+
+
+@pytest.fixture
+def budget_spent(monkeypatch):
+    """A clock that jumps a minute per reading, so every budget is spent by the first statement."""
+    clock = itertools.count(0, 60)
+    monkeypatch.setattr(budgets, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+
+@pytest.fixture
+def manual_clock(monkeypatch):
+    """A clock that only moves when the test advances clock.now."""
+    clock = SimpleNamespace(now=0.0)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(budgets, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def analytics_over_budget_above(monkeypatch):
+    """Make analytics windows wider than the given number of weeks run over budget."""
+    def install(max_weeks: int):
+        real = analytics_router.get_analytics_data
+
+        def limited(db, weeks_back=12, user_id=None):
+            if weeks_back > max_weeks:
+                raise BudgetExceeded("/analytics", 5000)
+            return real(db, weeks_back=weeks_back, user_id=user_id)
+        monkeypatch.setattr(analytics_router, "get_analytics_data", limited)
+    return install
+
+
+class FakePostgresSession:
+    """Records the SQL a budget issues against a Postgres-looking session."""
+
+    def __init__(self):
+        self.statements = []
+        self.rolled_back = False
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def statement_timeout_error(pgcode: str) -> OperationalError:
+    return OperationalError("SELECT 1", {}, SimpleNamespace(pgcode=pgcode))
+
+
+class TestQueryBudget:
+    """Tests for the query_budget context manager."""
+
+    @pytest.mark.performance
+    def test_statement_after_deadline_raises(self, db: Session, budget_spent):
+        """Test no statement may start once the budget is spent, and the breach is counted."""
+        before = breaches("/reports")
+        with pytest.raises(BudgetExceeded) as excinfo:
+            with query_budget(db, "/reports"):
+                db.execute(text("SELECT 1"))
+        assert excinfo.value.route == "/reports"
+        assert breaches("/reports") == before + 1
+        assert current_budget.get() is None
+
+    @pytest.mark.performance
+    def test_route_without_budget_is_unbounded(self, db: Session, budget_spent):
+        """Test routes missing from QUERY_BUDGETS_MS run without a deadline."""
+        with query_budget(db, "/profile"):
+            assert db.execute(text("SELECT 1")).scalar() == 1
+
+    @pytest.mark.performance
+    def test_within_budget(self, db: Session):
+        """Test work inside the budget runs normally and leaves no deadline behind."""
+        with query_budget(db, "/reports"):
+            assert db.execute(text("SELECT 1")).scalar() == 1
+        assert current_budget.get() is None
+        assert db.execute(text("SELECT 2")).scalar() == 2
+
+    @pytest.mark.performance
+    def test_staged_deadlines_share_one_budget(self, manual_clock):
+        """Test each attempt but the last gets half the time left, and the last ends at the budget."""
+        deadlines = staged_deadlines("/analytics", 3)
+        assert next(deadlines) == 2.5
+        manual_clock.now = 1.0
+        assert next(deadlines) == 3.0
+        manual_clock.now = 4.0
+        assert next(deadlines) == 5.0
+        assert list(staged_deadlines("/profile", 2)) == [None, None]
+
+    @pytest.mark.performance
+    def test_spent_deadline_raises_before_running(self, db: Session, manual_clock):
+        """Test an attempt whose shared deadline has already passed does not start."""
+        manual_clock.now = 10.0
+        with pytest.raises(BudgetExceeded):
+            with query_budget(db, "/reports", deadline=9.0):
+                pytest.fail("ran past the deadline")
+
+    @pytest.mark.performance
+    def test_postgres_statement_timeout_is_scoped(self):
+        """Test Postgres gets SET LOCAL statement_timeout, reset once the block succeeds."""
+        session = FakePostgresSession()
+        with query_budget(session, "/reports"):
+            pass
+        assert session.statements == [
+            "SET LOCAL statement_timeout = 5000",
+            "SET LOCAL statement_timeout = DEFAULT",
+        ]
+
+    @pytest.mark.performance
+    def test_postgres_cancellation_becomes_budget_exceeded(self):
+        """Test a statement cancelled by the timeout rolls back and raises BudgetExceeded."""
+        session = FakePostgresSession()
+        before = breaches("/api/analytics/data")
+        with pytest.raises(BudgetExceeded):
+            with query_budget(session, "/api/analytics/data"):
+                raise statement_timeout_error("57014")
+        assert session.rolled_back
+        assert breaches("/api/analytics/data") == before + 1
+
+    @pytest.mark.performance
+    def test_other_database_errors_propagate(self):
+        """Test only statement-timeout cancellations are treated as a breach."""
+        session = FakePostgresSession()
+        with pytest.raises(OperationalError):
+            with query_budget(session, "/reports"):
+                raise statement_timeout_error("40P01")
+        assert not session.rolled_back
+
+
+class TestDegradedResponses:
+    """Tests for what over-budget routes serve instead of an error page."""
+
+    @pytest.mark.analytics
+    def test_analytics_page_falls_back_to_narrower_window(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], analytics_over_budget_above
+    ):
+        """Test the page shows the last 4 weeks with a notice when 12 run over."""
+        analytics_over_budget_above(4)
+        response = authenticated_client.get("/analytics")
+        assert response.status_code == 200
+        assert "only the last 4 weeks are shown" in response.text
+        assert "Points Utilization Trend" in response.text
+
+    @pytest.mark.analytics
+    def test_analytics_page_renders_empty_when_nothing_fits(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], budget_spent
+    ):
+        """Test the page still renders, empty, when even one week runs over."""
+        before = breaches("/analytics")
+        response = authenticated_client.get("/analytics")
+        assert response.status_code == 200
+        assert "Analytics took too long to compute" in response.text
+        assert breaches("/analytics") == before + 3
+
+    @pytest.mark.analytics
+    @pytest.mark.api
+    @pytest.mark.allow_n_plus_one
+    def test_fallbacks_stop_within_one_budget(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], manual_clock, monkeypatch
+    ):
+        """Test all the fallback windows together hold the database no longer than one budget."""
+        def slow(db, weeks_back=12, user_id=None):
+            while True:  # a loop of queries taking half a second each
+                manual_clock.now += 0.5
+                db.execute(text("SELECT 1"))
+        monkeypatch.setattr(analytics_router, "get_analytics_data", slow)
+
+        response = authenticated_client.get("/api/analytics/data?weeks=12")
+        assert response.status_code == 503
+        assert manual_clock.now <= 5.0 + 0.5
+
+    @pytest.mark.analytics
+    @pytest.mark.api
+    @pytest.mark.allow_n_plus_one
+    def test_narrower_window_gets_the_time_left(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], manual_clock, monkeypatch
+    ):
+        """Test a fallback window still runs, within the same budget, after the first one breaches."""
+        real = analytics_router.get_analytics_data
+
+        def slow_when_wide(db, weeks_back=12, user_id=None):
+            while weeks_back > 4:
+                manual_clock.now += 0.5
+                db.execute(text("SELECT 1"))
+            return real(db, weeks_back=weeks_back, user_id=user_id)
+        monkeypatch.setattr(analytics_router, "get_analytics_data", slow_when_wide)
+
+        response = authenticated_client.get("/api/analytics/data?weeks=12")
+        assert response.json()["degraded"] == {"weeks": 4, "requested_weeks": 12}
+        assert manual_clock.now <= 5.0
+
+    @pytest.mark.analytics
+    @pytest.mark.api
+    def test_analytics_api_marks_partial_result(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], analytics_over_budget_above
+    ):
+        """Test the API says which window it returned and sends no validators."""
+        analytics_over_budget_above(4)
+        response = authenticated_client.get("/api/analytics/data?weeks=12")
+        assert response.status_code == 200
+        assert response.json()["degraded"] == {"weeks": 4, "requested_weeks": 12}
+        assert "etag" not in response.headers
+
+    @pytest.mark.analytics
+    @pytest.mark.api
+    def test_analytics_api_full_result_not_marked(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test a result within budget is unchanged."""
+        response = authenticated_client.get("/api/analytics/data?weeks=12")
+        assert "degraded" not in response.json()
+        assert "etag" in response.headers
+
+    @pytest.mark.analytics
+    @pytest.mark.api
+    def test_analytics_api_unavailable_when_nothing_fits(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], budget_spent
+    ):
+        """Test the API answers 503 with Retry-After when no window fits."""
+        response = authenticated_client.get("/api/analytics/data?weeks=12")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "60"
+
+    @pytest.mark.reports
+    def test_reports_page_asks_for_narrower_filters(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], budget_spent
+    ):
+        """Test an over-budget report renders with a notice and no ETag."""
+        response = authenticated_client.get("/reports")
+        assert response.status_code == 200
+        assert "Narrow the date range or filters" in response.text
+        assert "etag" not in response.headers
+
+    @pytest.mark.reports
+    def test_export_over_budget_is_503(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], budget_spent
+    ):
+        """Test an export that cannot be built in time suggests a narrower range."""
+        before = breaches("/reports/export/csv")
+        response = authenticated_client.get("/reports/export/csv")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "60"
+        assert "narrow the date range" in response.json()["detail"]
+        assert breaches("/reports/export/csv") == before + 1
@@ -0,0 +1,131 @@
+"""
+Tests for response compression and precompressed static files.
+"""
+import gzip
+import pytest
+import brotli
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+
+from app.middleware import choose_encoding
+from app.models.work_item import WorkItem
+from app.staticfiles import PrecompressedStaticFiles
+from scripts.precompress_static import precompress
+
+
+class TestEncodingNegotiation:
+    """Tests for Accept-Encoding negotiation."""
+    
+    @pytest.mark.performance
+    def test_prefers_brotli(self):
+        """Test brotli wins when both codings are accepted."""
+        assert choose_encoding("gzip, deflate, br") == "br"
+    
+    @pytest.mark.performance
+    def test_falls_back_to_gzip(self):
+        """Test gzip is used when brotli is not accepted."""
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("br;q=0, gzip;q=0.5") == "gzip"
+    
+    @pytest.mark.performance
+    def test_identity_only(self):
+        """Test no coding is chosen for identity-only clients."""
+        assert choose_encoding("") is None
+        assert choose_encoding("identity") is None
+
+
+class TestCompressionMiddleware:
+    """Tests for compressing dynamic responses."""
+    
+    @pytest.mark.performance
+    def test_html_page_is_brotli_compressed(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test rendered pages are compressed and vary on Accept-Encoding."""
+        response = authenticated_client.get("/", headers={"Accept-Encoding": "br"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "br"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert "Planned Task 1" in response.text
+    
+    @pytest.mark.performance
+    def test_gzip_keeps_conditional_get_working(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test the weakened ETag of a compressed page still revalidates."""
+        response = authenticated_client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        assert etag.startswith("W/")
+        
+        cached = authenticated_client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert cached.status_code == 304
+    
+    @pytest.mark.performance
+    def test_uncompressed_without_accept_encoding(self, authenticated_client: TestClient):
+        """Test clients that do not ask for compression get identity."""
+        response = authenticated_client.get("/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+    
+    @pytest.mark.performance
+    def test_small_responses_are_not_compressed(self, client: TestClient):
+        """Test responses under the size threshold pass through."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+    
+    @pytest.mark.performance
+    def test_streamed_csv_export_is_compressed(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test chunked file responses are compressed as a stream."""
+        response = authenticated_client.get("/reports/export/csv", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Planned Task 1" in response.text
+    
+    @pytest.mark.performance
+    def test_excel_export_is_not_recompressed(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test already-compressed xlsx exports pass through."""
+        response = authenticated_client.get("/reports/export/excel", headers={"Accept-Encoding": "gzip, br"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+
+class TestPrecompressedStaticFiles:
+    """Tests for serving build-time .br/.gz siblings."""
+    
+    @pytest.fixture
+    def static_client(self, tmp_path):
+        (tmp_path / "app.js").write_text("console.log('work tracker');\n" * 50)
+        (tmp_path / "tiny.css").write_text("a{}")
+        precompress(str(tmp_path))
+        app = Starlette()
+        app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)))
+        return TestClient(app)
+    
+    @pytest.mark.performance
+    def test_precompress_writes_siblings(self, tmp_path):
+        """Test siblings are written for compressible files above the threshold."""
+        (tmp_path / "app.js").write_text("var x = 1;\n" * 100)
+        (tmp_path / "tiny.css").write_text("a{}")
+        precompress(str(tmp_path))
+        
+        assert (tmp_path / "app.js.br").exists()
+        assert gzip.decompress((tmp_path / "app.js.gz").read_bytes()) == (tmp_path / "app.js").read_bytes()
+        assert not (tmp_path / "tiny.css.gz").exists()
+    
+    @pytest.mark.performance
+    def test_serves_brotli_sibling(self, static_client: TestClient, tmp_path):
+        """Test the .br sibling is served with the original content type."""
+        response = static_client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+        assert "javascript" in response.headers["content-type"]
+        assert int(response.headers["content-length"]) == len((tmp_path / "app.js.br").read_bytes())
+        assert response.text == (tmp_path / "app.js").read_text()
+    
+    @pytest.mark.performance
+    def test_serves_original_without_sibling(self, static_client: TestClient):
+        """Test files without siblings are served as-is."""
+        response = static_client.get("/static/tiny.css", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "a{}"
+    
+    @pytest.mark.performance
+    def test_brotli_sibling_round_trips(self, tmp_path):
+        """Test the brotli sibling decodes to the original bytes."""
+        (tmp_path / "style.css").write_text("body { color: red; }\n" * 40)
+        precompress(str(tmp_path))
+        assert brotli.decompress((tmp_path / "style.css.br").read_bytes()) == (tmp_path / "style.css").read_bytes()
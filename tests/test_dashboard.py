@@ -167,3 +167,40 @@ class TestWeekNavigation:
         
         assert friday.weekday() == 4  # Friday
         assert friday == date(2024, 12, 20)
+
+
+class TestDashboardConditionalGet:
+    """Tests for ETag revalidation of the dashboard."""
+    
+    @pytest.mark.dashboard
+    def test_dashboard_sends_private_validators(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test the dashboard carries an ETag and private Cache-Control."""
+        response = authenticated_client.get("/")
+        assert response.status_code == 200
+        assert response.headers.get("etag")
+        assert response.headers.get("cache-control", "").startswith("private")
+    
+    @pytest.mark.dashboard
+    def test_unchanged_dashboard_is_not_modified(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test revisiting an unchanged dashboard answers 304."""
+        etag = authenticated_client.get("/").headers["etag"]
+        
+        response = authenticated_client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+    
+    @pytest.mark.dashboard
+    def test_write_invalidates_dashboard(
+        self, authenticated_client: TestClient, db: Session, sample_work_week: WorkWeek
+    ):
+        """Test a work item write changes the dashboard ETag."""
+        from app.crud import create_work_item
+        from app.schemas import WorkItemCreate
+        
+        etag = authenticated_client.get("/").headers["etag"]
+        create_work_item(db, WorkItemCreate(week_id=sample_work_week.id, title="New Task", assigned_points=5))
+        
+        response = authenticated_client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert "New Task" in response.text
@@ -0,0 +1,125 @@
+"""
+Tests for the weekly digest service and the batch job in scripts/weekly_digest.py.
+"""
+import json
+import os
+import pytest
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services.digest import digest_week_start, iter_user_chunks, load_digests, render_digest
+from scripts.weekly_digest import PROGRESS_FILE, generate_digests, save_progress
+
+WEEK = date(2026, 10, 12)
+
+
+def written_users(outbox: str) -> set:
+    directory = os.path.join(outbox, WEEK.isoformat())
+    return {name[:-3] for name in os.listdir(directory) if name.endswith(".md")}
+
+
+class TestDigestService:
+    """Tests for loading and rendering digests."""
+
+    @pytest.mark.reports
+    def test_digest_week_is_last_week(self):
+        """Test a run on any day of a week covers the week before."""
+        assert digest_week_start(date(2026, 10, 19)) == WEEK
+        assert digest_week_start(date(2026, 10, 25)) == WEEK
+
+    @pytest.mark.reports
+    def test_load_digests(self, db: Session, make_week, make_item, regular_user: User, admin_user: User):
+        """Test points, carry-overs and next week's plans, and users without a week."""
+        week = make_week(regular_user, week_start=WEEK, ooo_days=1)
+        make_item(week, "Ship export", status="COMPLETED", assigned_points=30, completion_points=30,
+                  next_week_plan="Announce it")
+        make_item(week, "Fix login", status="DELAYED", assigned_points=20, completion_points=5)
+        make_item(week, "Dropped idea", status="ABANDONED", assigned_points=10)
+        make_week(regular_user, week_start=WEEK - timedelta(weeks=1))
+
+        users = [(regular_user.id, regular_user.email), (admin_user.id, admin_user.email)]
+        mine, theirs = load_digests(db, users, WEEK)
+        assert (mine["assigned"], mine["completed"], mine["completion_rate"]) == (60, 35, 35 / 60)
+        assert mine["week"]["ooo_days"] == 1
+        assert len(mine["work_items"]) == 3
+        assert [item["title"] for item in mine["carry_overs"]] == ["Fix login"]
+        assert [item["next_week_plan"] for item in mine["next_week"]] == ["Announce it"]
+        assert theirs["week"] is None
+        assert theirs["work_items"] == [] and theirs["completion_rate"] is None
+
+    @pytest.mark.reports
+    def test_user_chunks_cover_everyone_once(self, db: Session, regular_user: User, admin_user: User):
+        """Test keyset chunks walk all users in id order."""
+        chunks = list(iter_user_chunks(db, chunk_size=1))
+        assert [chunk[0][0] for chunk in chunks] == sorted([regular_user.id, admin_user.id])
+        assert list(iter_user_chunks(db, chunk_size=5, after=max(regular_user.id, admin_user.id))) == []
+
+    @pytest.mark.reports
+    def test_render_escapes_html_only(self, db: Session, make_week, make_item, regular_user: User):
+        """Test user text is escaped in the HTML digest and left as written in Markdown."""
+        week = make_week(regular_user, week_start=WEEK)
+        make_item(week, "<script>alert(1)</script>", status="IN_PROGRESS", assigned_points=10, completion_points=2)
+
+        html, markdown = render_digest(load_digests(db, [(regular_user.id, regular_user.email)], WEEK)[0])
+        assert "&lt;script&gt;" in html and "<script>" not in html
+        assert "**<script>alert(1)</script>** (Planned, In Progress): 2/10 points" in markdown
+        assert "Completed: 2 points (20% of assigned)" in markdown
+
+
+class TestDigestJob:
+    """Tests for generate_digests."""
+
+    @pytest.fixture
+    def outbox(self, tmp_path) -> str:
+        return str(tmp_path / "outbox")
+
+    @pytest.mark.reports
+    def test_writes_every_user(
+        self, db: Session, make_week, make_item, regular_user: User, admin_user: User, outbox: str
+    ):
+        """Test one HTML and one Markdown file per user, and a finished progress file."""
+        week = make_week(regular_user, week_start=WEEK)
+        make_item(week, "Ship export", status="COMPLETED", assigned_points=30, completion_points=30)
+
+        state = generate_digests(db.get_bind(), outbox, WEEK, chunk_size=1, workers=1)
+        assert state["done"] and state["users"] == 2
+        assert written_users(outbox) == {str(regular_user.id), str(admin_user.id)}
+        directory = os.path.join(outbox, WEEK.isoformat())
+        with open(os.path.join(directory, f"{regular_user.id}.html"), encoding="utf-8") as f:
+            assert "Ship export" in f.read()
+        assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+    @pytest.mark.reports
+    def test_resumes_after_saved_position(self, db: Session, regular_user: User, admin_user: User, outbox: str):
+        """Test an interrupted run continues after the last user it saved."""
+        first, second = sorted([regular_user.id, admin_user.id])
+        directory = os.path.join(outbox, WEEK.isoformat())
+        os.makedirs(directory)
+        save_progress(directory, {"after": str(first), "users": 1, "done": False})
+
+        state = generate_digests(db.get_bind(), outbox, WEEK, workers=1)
+        assert state["users"] == 2
+        assert written_users(outbox) == {str(second)}
+
+    @pytest.mark.reports
+    def test_finished_week_skipped_unless_restarted(self, db: Session, regular_user: User, outbox: str):
+        """Test a finished week is not rewritten unless restart is given."""
+        generate_digests(db.get_bind(), outbox, WEEK, workers=1)
+        os.remove(os.path.join(outbox, WEEK.isoformat(), f"{regular_user.id}.md"))
+
+        assert generate_digests(db.get_bind(), outbox, WEEK, workers=1)["users"] == 1
+        assert written_users(outbox) == set()
+        assert generate_digests(db.get_bind(), outbox, WEEK, workers=1, restart=True)["users"] == 1
+        assert written_users(outbox) == {str(regular_user.id)}
+
+    @pytest.mark.reports
+    def test_process_pool(self, db: Session, make_week, make_item, regular_user: User, admin_user: User, outbox: str):
+        """Test rendering across worker processes writes the same digests."""
+        make_item(make_week(admin_user, week_start=WEEK), "Quarterly plan", status="TODO", assigned_points=10)
+
+        state = generate_digests(db.get_bind(), outbox, WEEK, chunk_size=1, workers=2)
+        assert state["users"] == 2
+        assert written_users(outbox) == {str(regular_user.id), str(admin_user.id)}
+        with open(os.path.join(outbox, WEEK.isoformat(), PROGRESS_FILE), encoding="utf-8") as f:
+            assert json.load(f)["after"] == str(max(regular_user.id, admin_user.id))
@@ -3,6 +3,7 @@ Tests for work item input functionality.
 """
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
 from uuid import uuid4
@@ -10,9 +11,11 @@ from uuid import uuid4
 from app.models.user import User
 from app.models.work_week import WorkWeek
 from app.models.work_item import WorkItem
+from app.routers import input as input_router
+from app.services.idempotency import PENDING, DatabaseIdempotencyStore, IdempotencyStore, MemoryIdempotencyStore
 from app.crud.work_item import (
     create_work_item, get_work_item, update_work_item, 
-    delete_work_item, get_work_items_by_week
+    delete_work_item, get_work_items_by_week, get_week_points
 )
 
 
@@ -311,3 +314,234 @@ class TestFutureWeekPlanning:
         assert item.title == "Future Task"
         # Completion points should be None/0 for future items
         assert item.completion_points is None or item.completion_points == 0
+
+
+class TestInputConditionalGet:
+    """Tests for ETag revalidation of the input page."""
+    
+    @pytest.mark.input
+    def test_past_week_revisit_is_not_modified(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test revisiting an unchanged week answers 304."""
+        url = f"/input/{sample_work_week.week_start - timedelta(days=7)}"
+        first = authenticated_client.get(url)
+        assert first.status_code == 200
+        
+        # The first visit creates the week, so revalidate against the settled page
+        etag = authenticated_client.get(url).headers["etag"]
+        response = authenticated_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    
+    @pytest.mark.input
+    def test_etag_differs_per_week(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test each week URL gets its own ETag."""
+        this_week = authenticated_client.get(f"/input/{sample_work_week.week_start}")
+        
+        response = authenticated_client.get(
+            f"/input/{sample_work_week.week_start + timedelta(days=7)}",
+            headers={"If-None-Match": this_week.headers["etag"]}
+        )
+        assert response.status_code == 200
+
+
+class TestPartialItemUpdates:
+    """Tests for the JSON responses the input page patches itself with."""
+    
+    JSON = {"Accept": "application/json"}
+    
+    @pytest.mark.input
+    def test_week_points(self, db: Session, sample_work_week: WorkWeek, sample_work_items: list[WorkItem]):
+        """Test week totals come from one grouped query."""
+        points = get_week_points(db, sample_work_week.id)
+        assert points == {
+            "item_count": 3,
+            "planned": 30,
+            "unplanned": 20,
+            "adhoc": 10,
+            "total_used": 60,
+            "total_points": 100,
+            "remaining": 40
+        }
+    
+    @pytest.mark.input
+    def test_create_item_returns_card_and_totals(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek
+    ):
+        """Test creating an item answers with the new card instead of a redirect."""
+        response = authenticated_client.post(
+            "/api/work-items",
+            data={
+                "week_id": str(sample_work_week.id),
+                "title": "Patched <Task>",
+                "type": "UNPLANNED",
+                "status": "TODO",
+                "assigned_points": "15"
+            },
+            headers=self.JSON,
+            follow_redirects=False
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item"]["title"] == "Patched <Task>"
+        assert 'id="item-%s"' % data["item"]["id"] in data["html"]
+        assert "Patched &lt;Task&gt;" in data["html"]
+        assert data["points"]["unplanned"] == 15
+        assert data["points"]["remaining"] == 85
+        assert data["points"]["item_count"] == 1
+    
+    @pytest.mark.input
+    def test_update_item_returns_card_and_totals(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test updating an item answers with the replaced card."""
+        item = sample_work_items[0]
+        response = authenticated_client.post(
+            f"/api/work-items/{item.id}",
+            data={"title": "Renamed", "type": "PLANNED", "status": "COMPLETED", "assigned_points": "40"},
+            headers=self.JSON,
+            follow_redirects=False
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item"]["id"] == str(item.id)
+        assert data["item"]["status"] == "COMPLETED"
+        assert data["points"]["planned"] == 40
+        assert data["points"]["total_used"] == 70
+    
+    @pytest.mark.input
+    def test_delete_item_returns_totals(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test deleting an item answers with its id and the remaining totals."""
+        item = sample_work_items[2]
+        response = authenticated_client.post(
+            f"/api/work-items/{item.id}/delete", headers=self.JSON, follow_redirects=False
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["deleted"] == str(item.id)
+        assert data["points"]["adhoc"] == 0
+        assert data["points"]["item_count"] == 2
+    
+    @pytest.mark.input
+    def test_over_budget_returns_error_detail(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek
+    ):
+        """Test validation errors reach the page script as JSON."""
+        response = authenticated_client.post(
+            "/api/work-items",
+            data={"week_id": str(sample_work_week.id), "title": "Too big", "type": "PLANNED", "assigned_points": "150"},
+            headers=self.JSON,
+            follow_redirects=False
+        )
+        assert response.status_code == 400
+        assert "remaining" in response.json()["detail"]
+
+
+class TestIdempotency:
+    """Tests for replaying retried item submissions."""
+    
+    def _create(self, client: TestClient, week: WorkWeek, key: str, points: str = "10", **headers):
+        return client.post(
+            "/api/work-items",
+            data={
+                "week_id": str(week.id),
+                "title": "Retried Task",
+                "type": "PLANNED",
+                "assigned_points": points,
+                "idempotency_key": key
+            },
+            headers=headers,
+            follow_redirects=False
+        )
+    
+    @pytest.mark.input
+    def test_retry_replays_stored_response(
+        self, authenticated_client: TestClient, db: Session, sample_work_week: WorkWeek
+    ):
+        """Test a retried POST creates nothing and gets the first response back."""
+        first = self._create(authenticated_client, sample_work_week, "retry-1", Accept="application/json")
+        second = self._create(authenticated_client, sample_work_week, "retry-1", Accept="application/json")
+        assert first.status_code == second.status_code == 200
+        assert second.json()["item"]["id"] == first.json()["item"]["id"]
+        assert len(get_work_items_by_week(db, sample_work_week.id)) == 1
+        
+        form_retry = self._create(authenticated_client, sample_work_week, "retry-1")
+        assert form_retry.status_code == 302
+        assert form_retry.headers["location"] == f"/input/{sample_work_week.week_start}"
+    
+    @pytest.mark.input
+    def test_failed_attempt_releases_key(
+        self, authenticated_client: TestClient, db: Session, sample_work_week: WorkWeek
+    ):
+        """Test a rejected submission can be retried with the same key."""
+        assert self._create(authenticated_client, sample_work_week, "retry-2", points="500").status_code == 400
+        assert self._create(authenticated_client, sample_work_week, "retry-2").status_code == 302
+        assert len(get_work_items_by_week(db, sample_work_week.id)) == 1
+    
+    @pytest.mark.input
+    def test_unexpected_failure_releases_key(
+        self, authenticated_client: TestClient, db: Session, sample_work_week: WorkWeek, monkeypatch
+    ):
+        """Test a database error mid-change does not leave the key pending (409) for its TTL."""
+        real_create = input_router.create_work_item
+        
+        def failing_once(db, item):
+            monkeypatch.setattr(input_router, "create_work_item", real_create)
+            raise OperationalError("INSERT INTO work_items", {}, Exception("database is locked"))
+        monkeypatch.setattr(input_router, "create_work_item", failing_once)
+        
+        with pytest.raises(OperationalError):
+            self._create(authenticated_client, sample_work_week, "retry-3")
+        assert self._create(authenticated_client, sample_work_week, "retry-3").status_code == 302
+        assert len(get_work_items_by_week(db, sample_work_week.id)) == 1
+    
+    @pytest.mark.input
+    def test_missing_item_releases_key(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test an update of an unknown item can be retried with the same key."""
+        data = {"title": "Renamed", "type": "PLANNED", "assigned_points": "5", "idempotency_key": "retry-4"}
+        assert authenticated_client.post(f"/api/work-items/{uuid4()}", data=data).status_code == 404
+        response = authenticated_client.post(
+            f"/api/work-items/{sample_work_items[0].id}", data=data, follow_redirects=False
+        )
+        assert response.status_code == 302
+    
+    @pytest.mark.input
+    def test_database_store_claims_once(self, db: Session):
+        """Test only the first claim wins and expired keys can be reclaimed."""
+        store = DatabaseIdempotencyStore(ttl_seconds=300)
+        assert store.claim(db, "k") is None
+        assert store.claim(db, "k") is PENDING
+        store.complete(db, "k", {"redirect": "/input/2025-01-06", "json": None})
+        assert store.claim(db, "k") == {"redirect": "/input/2025-01-06", "json": None}
+        
+        expired = DatabaseIdempotencyStore(ttl_seconds=-1)
+        assert expired.claim(db, "k") is None
+    
+    @pytest.mark.input
+    def test_memory_store_is_bounded(self):
+        """Test the in-process store evicts the least recently used keys."""
+        store = MemoryIdempotencyStore(ttl_seconds=300, max_entries=2)
+        for key in ("a", "b", "c"):
+            assert store.claim(None, key) is None
+        assert len(store) == 2
+        assert store.claim(None, "a") is None
+        store.complete(None, "c", {"redirect": "/input"})
+        assert store.claim(None, "c") == {"redirect": "/input"}
+        store.release(None, "c")
+        assert store.claim(None, "c") is None
+    
+    @pytest.mark.input
+    def test_incomplete_store_cannot_be_created(self):
+        """Test a store missing one of the methods fails when created, not mid-request."""
+        class NoRelease(IdempotencyStore):
+            def claim(self, db, key):
+                return None
+            
+            def complete(self, db, key, response):
+                pass
+        
+        with pytest.raises(TypeError, match="release"):
+            NoRelease(ttl_seconds=300)
+
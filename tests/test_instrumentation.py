@@ -0,0 +1,82 @@
+"""
+Tests for Server-Timing and per-request SQL instrumentation.
+"""
+import json
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.instrumentation import RequestMetrics, current_metrics, timed
+from app.middleware import InstrumentationMiddleware
+from app.models.work_week import WorkWeek
+from app.models.work_item import WorkItem
+
+
+def parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+class TestInstrumentation:
+    """Tests for request instrumentation."""
+    
+    @pytest.mark.performance
+    def test_server_timing_on_page(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test a rendered page reports SQL, render and total time."""
+        response = authenticated_client.get("/reports")
+        assert response.status_code == 200
+        timing = parse_server_timing(response.headers["server-timing"])
+        assert int(timing["db"]["desc"].strip('"').split()[0]) > 0
+        assert float(timing["render"]["dur"]) > 0
+        assert float(timing["total"]["dur"]) >= float(timing["db"]["dur"])
+    
+    @pytest.mark.performance
+    def test_structured_log_line(self, authenticated_client: TestClient, sample_work_week: WorkWeek, caplog):
+        """Test each measured request logs one JSON line."""
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            authenticated_client.get("/api/v1/weeks")
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["path"] == "/api/v1/weeks"
+        assert record["status"] == 200
+        assert record["sql_count"] > 0
+    
+    @pytest.mark.performance
+    def test_unsampled_requests_not_measured(self):
+        """Test a zero sample rate leaves requests untouched."""
+        seen = []
+        
+        async def endpoint(request):
+            seen.append(current_metrics.get())
+            return PlainTextResponse("ok")
+        
+        app = Starlette(routes=[Route("/", endpoint)])
+        client = TestClient(InstrumentationMiddleware(app, sample_rate=0.0))
+        response = client.get("/")
+        assert "server-timing" not in response.headers
+        assert seen == [None]
+    
+    @pytest.mark.performance
+    def test_timed_sections(self):
+        """Test timed blocks accumulate under their name only inside a measured request."""
+        with timed("render"):
+            pass
+        
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            with timed("render"):
+                pass
+            with timed("render"):
+                pass
+        finally:
+            current_metrics.reset(token)
+        assert set(metrics.timers) == {"render"}
+        assert "render;dur=" in metrics.server_timing()
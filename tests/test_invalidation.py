@@ -0,0 +1,85 @@
+"""
+Tests for the cross-worker cache invalidation bus.
+"""
+import pytest
+from types import SimpleNamespace
+from sqlalchemy.orm import Session
+
+from app.crud.work_week import update_work_week_ooo
+from app.crud.user import bump_data_version
+from app.fragment_cache import FragmentCache
+from app.models.user import User
+from app.models.work_week import WorkWeek
+from app.services.invalidation import (
+    InvalidationBus, InvalidationEvent, LoopbackInvalidationBus, PostgresInvalidationBus,
+    create_invalidation_bus, invalidation_bus
+)
+
+
+@pytest.fixture
+def received():
+    """Collect events dispatched by the application bus during a test."""
+    events = []
+    invalidation_bus.subscribe(events.append)
+    yield events
+    invalidation_bus._subscribers.remove(events.append)
+
+
+class TestInvalidationBus:
+    """Tests for publishing and delivering invalidation events."""
+    
+    @pytest.mark.performance
+    def test_crud_write_publishes_after_commit(
+        self, db: Session, sample_work_week: WorkWeek, regular_user: User, received
+    ):
+        """Test a CRUD write announces the user's new data version once committed."""
+        update_work_week_ooo(db, sample_work_week.id, 1, regular_user.id)
+        db.refresh(regular_user)
+        assert received == [InvalidationEvent("work_week", regular_user.id, regular_user.data_version)]
+    
+    @pytest.mark.performance
+    def test_rollback_publishes_nothing(self, db: Session, regular_user: User, received):
+        """Test a rolled-back write never reaches subscribers."""
+        bump_data_version(db, regular_user.id)
+        db.rollback()
+        db.commit()
+        assert received == []
+    
+    @pytest.mark.performance
+    def test_backend_selection(self):
+        """Test auto picks LISTEN/NOTIFY only on Postgres."""
+        assert isinstance(create_invalidation_bus("auto", "sqlite:///./x.db"), LoopbackInvalidationBus)
+        assert isinstance(create_invalidation_bus("auto", "postgresql://db/app"), PostgresInvalidationBus)
+        with pytest.raises(ValueError):
+            create_invalidation_bus("redis", "sqlite:///./x.db")
+    
+    @pytest.mark.performance
+    def test_bus_without_publish_cannot_be_created(self):
+        """Test a bus must implement publish to be created."""
+        class Silent(InvalidationBus):
+            pass
+        
+        with pytest.raises(TypeError, match="publish"):
+            Silent()
+    
+    @pytest.mark.performance
+    def test_postgres_listener_dispatches_notifications(self, regular_user: User):
+        """Test NOTIFY payloads from other workers are decoded and dispatched."""
+        bus = PostgresInvalidationBus("postgresql://db/app")
+        events = []
+        bus.subscribe(events.append)
+        payload = '{"entity": "work_item", "user_id": "%s", "version": 7}' % regular_user.id
+        bus._connection = SimpleNamespace(poll=lambda: None, notifies=[SimpleNamespace(payload=payload)])
+        bus._on_readable()
+        assert events == [InvalidationEvent("work_item", regular_user.id, 7)]
+    
+    @pytest.mark.performance
+    def test_fragments_evicted_for_older_versions(self):
+        """Test only the changed user's older fragments are dropped."""
+        cache = FragmentCache()
+        cache.set(("sidebar", "u1", 1, "2025-01-06"), "old")
+        cache.set(("sidebar", "u1", 2, "2025-01-06"), "current")
+        cache.set(("sidebar", "u2", 1, "2025-01-06"), "other user")
+        assert cache.evict_user("u1", 2) == 1
+        assert cache.get(("sidebar", "u1", 2, "2025-01-06")) == "current"
+        assert cache.get(("sidebar", "u2", 1, "2025-01-06")) == "other user"
@@ -0,0 +1,61 @@
+"""
+Tests for the Prometheus /metrics endpoint.
+"""
+import pytest
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.config import get_settings
+from app.models.work_week import WorkWeek
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Tests for request, database and cache metrics."""
+    
+    @pytest.mark.performance
+    def test_metrics_public_and_prometheus_format(self, client: TestClient):
+        """Test the scrape endpoint skips login and serves the text format."""
+        response = client.get("/metrics", follow_redirects=False)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "http_request_duration_seconds" in response.text
+        assert "db_pool_connections_in_use" in response.text
+    
+    @pytest.mark.performance
+    def test_metrics_token(self, client: TestClient, monkeypatch):
+        """Test a configured token is required to scrape."""
+        monkeypatch.setattr(get_settings(), "metrics_token", "s3cret")
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+    
+    @pytest.mark.performance
+    def test_latency_labelled_by_route_template(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek
+    ):
+        """Test requests to different weeks share the route template series."""
+        labels = {"method": "GET", "route": "/input/{week_start}", "status": "200"}
+        before = sample("http_request_duration_seconds_count", **labels)
+        queries_before = sample("db_queries_total")
+        authenticated_client.get(f"/input/{sample_work_week.week_start}")
+        authenticated_client.get(f"/input/{sample_work_week.week_start - timedelta(days=7)}")
+        assert sample("http_request_duration_seconds_count", **labels) == before + 2
+        assert sample("db_queries_total") > queries_before
+        assert sample("http_requests_in_progress", method="GET") == 0
+    
+    @pytest.mark.performance
+    def test_cache_and_export_metrics(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test export cache hits, misses and generation time are recorded."""
+        misses = sample("cache_requests_total", cache="export", result="miss")
+        hits = sample("cache_requests_total", cache="export", result="hit")
+        exports = sample("export_duration_seconds_count", format="csv")
+        authenticated_client.get("/reports/export/csv")
+        authenticated_client.get("/reports/export/csv")
+        assert sample("cache_requests_total", cache="export", result="miss") == misses + 1
+        assert sample("cache_requests_total", cache="export", result="hit") == hits + 1
+        assert sample("export_duration_seconds_count", format="csv") == exports + 1
@@ -0,0 +1,70 @@
+"""
+Tests for admin on-demand request profiling (?_profile=).
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.work_item import WorkItem
+
+
+class TestProfiling:
+    """Tests for the profiling hook."""
+
+    @pytest.mark.performance
+    @pytest.mark.admin
+    def test_admin_gets_html_profile_with_sql(self, admin_client: TestClient):
+        """Test an admin gets a flame graph and the request's SQL instead of the page."""
+        response = admin_client.get("/analytics?_profile=html")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["cache-control"] == "no-store"
+        assert response.headers["x-profiled-status"] == "200"
+        assert 'id="sql-statements"' in response.text
+        assert "SELECT" in response.text
+        assert "Points Utilization Trend" not in response.text
+
+    @pytest.mark.performance
+    @pytest.mark.admin
+    def test_admin_gets_speedscope_profile(self, admin_client: TestClient):
+        """Test the speedscope format is a speedscope file plus the SQL timings."""
+        response = admin_client.get("/reports?_profile=speedscope")
+        assert response.status_code == 200
+        profile = response.json()
+        assert "speedscope" in profile["$schema"]
+        assert profile["profiles"]
+        assert profile["sql"]
+        assert all(entry["duration_ms"] >= 0 for entry in profile["sql"])
+
+    @pytest.mark.performance
+    def test_regular_user_cannot_profile(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test the flag is ignored for non-admins: they get the normal page."""
+        response = authenticated_client.get("/analytics?_profile=html")
+        assert response.status_code == 200
+        assert "x-profiled-status" not in response.headers
+        assert "Points Utilization Trend" in response.text
+
+    @pytest.mark.performance
+    def test_anonymous_cannot_profile(self, client: TestClient):
+        """Test anonymous requests with the flag are still sent to login."""
+        response = client.get("/analytics?_profile=speedscope", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/login"
+
+    @pytest.mark.performance
+    @pytest.mark.admin
+    def test_unknown_format_is_ignored(self, admin_client: TestClient):
+        """Test only the known formats trigger profiling."""
+        response = admin_client.get("/analytics?_profile=pdf")
+        assert response.status_code == 200
+        assert "x-profiled-status" not in response.headers
+
+    @pytest.mark.performance
+    @pytest.mark.admin
+    def test_profile_keeps_server_timing_counts(self, admin_client: TestClient):
+        """Test profiling reuses the sampled request metrics instead of replacing them."""
+        response = admin_client.get("/analytics?_profile=speedscope")
+        assert len(json.loads(response.content)["sql"]) > 0
+        assert "db;dur=" in response.headers["server-timing"]
@@ -0,0 +1,153 @@
+"""
+Query-count budgets and N+1 detection for the main pages.
+
+Each budget is checked twice: once with a small data set and once after the
+data has grown 10x. The statement count must not move, so any per-row query
+(N+1) fails the test.
+"""
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.crud.user import bump_data_version
+from app.models.user import User
+from app.models.work_week import WorkWeek
+from app.models.work_item import WorkItem
+
+
+@pytest.fixture
+def seed_weeks(db: Session, make_week, make_item):
+    """``seed_weeks(user, start, count)`` adds ``count`` past weeks (offset by ``start``) with items in every status."""
+    def seed(user: User, start: int, count: int, items_per_week: int = 3) -> None:
+        for i in range(start, start + count):
+            week = make_week(user, weeks_ago=i + 1)
+            for j in range(items_per_week):
+                make_item(
+                    week,
+                    f"Seeded task {i}-{j}",
+                    type=["PLANNED", "UNPLANNED", "ADHOC"][j % 3],
+                    status=["IN_PROGRESS", "DELAYED", "COMPLETED"][j % 3],
+                    assigned_points=10,
+                    completion_points=5,
+                    start_date=week.week_start,
+                    end_date=week.week_end
+                )
+        # Drop every cached page, fragment and export built from the old data
+        bump_data_version(db, user.id)
+        db.commit()
+    return seed
+
+
+def queries_at_scale(client: TestClient, recorder, seed_weeks, user: User, url: str) -> tuple[int, int]:
+    """Statement counts for ``url`` with 1x and 10x the seeded data."""
+    # The first visit creates the current week; measure steady-state requests
+    client.get(url)
+    recorder.requests.clear()
+    seed_weeks(user, 0, 2)
+    response = client.get(url)
+    assert response.status_code == 200
+    small = len(recorder.requests[-1].statements)
+
+    seed_weeks(user, 2, 18)
+    response = client.get(url)
+    assert response.status_code == 200
+    large = len(recorder.requests[-1].statements)
+    return small, large
+
+
+# Per-endpoint budgets. Counts include the auth middleware's user lookup and
+# the sidebar stats, so they bound the whole request, not just the handler.
+PAGE_BUDGETS = [
+    ("/", 8),
+    ("/input", 8),
+    ("/analytics", 8),
+    ("/api/analytics/data", 7),
+    ("/profile", 6),
+    ("/reports", 6),
+    ("/reports/export/csv", 4),
+    ("/api/v1/weeks", 4),
+]
+
+
+class TestQueryBudgets:
+    """Query counts stay flat as the data grows."""
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("url,budget", PAGE_BUDGETS)
+    def test_user_page_budget(
+        self, authenticated_client: TestClient, query_recorder, seed_weeks,
+        regular_user: User, url: str, budget: int
+    ):
+        small, large = queries_at_scale(authenticated_client, query_recorder, seed_weeks, regular_user, url)
+
+        assert small == large
+        query_recorder.assert_budget(f"GET {url}", budget)
+        # Redirects (/input -> /input/<week>) are followed; the page at the end
+        # does the real work and gets the same budget
+        page = query_recorder.requests[-1].endpoint
+        assert page.startswith(f"GET {url}")
+        query_recorder.assert_budget(page, budget)
+
+    @pytest.mark.performance
+    def test_admin_page_budget(
+        self, admin_client: TestClient, query_recorder, seed_weeks, regular_user: User
+    ):
+        small, large = queries_at_scale(admin_client, query_recorder, seed_weeks, regular_user, "/admin")
+
+        assert small == large
+        query_recorder.assert_budget("GET /admin", 6)
+
+    @pytest.mark.performance
+    def test_delete_user_is_constant(
+        self, admin_client: TestClient, query_recorder, seed_weeks, regular_user: User
+    ):
+        seed_weeks(regular_user, 0, 20)
+
+        admin_client.post(f"/admin/delete-user/{regular_user.id}", follow_redirects=False)
+
+        recorded = query_recorder.for_endpoint(f"POST /admin/delete-user/{regular_user.id}")[0]
+        item_loads = [s for s in recorded.statements if s.startswith("SELECT work_items.")]
+        assert len(item_loads) == 1
+
+
+class TestQueryRecorder:
+    """Tests for the recorder behind the query budgets."""
+
+    @pytest.mark.performance
+    def test_records_each_request_separately(self, authenticated_client: TestClient, query_recorder):
+        authenticated_client.get("/profile")
+        authenticated_client.get("/api/v1/weeks")
+
+        endpoints = [r.endpoint for r in query_recorder.requests]
+        assert endpoints[-2:] == ["GET /profile", "GET /api/v1/weeks"]
+        assert all(r.statements for r in query_recorder.requests[-2:])
+
+    @pytest.mark.performance
+    def test_redirect_hops_are_recorded_separately(self, authenticated_client: TestClient, query_recorder):
+        authenticated_client.get("/input")
+
+        endpoints = [r.endpoint for r in query_recorder.requests]
+        assert endpoints[-2].startswith("GET /input")
+        assert endpoints[-1].startswith("GET /input/")
+
+    @pytest.mark.performance
+    def test_flags_repeated_statement_shapes(self, db: Session, query_recorder, sample_work_items):
+        query_recorder.start(httpx.Request("GET", "http://testserver/n-plus-one"))
+        for item in sample_work_items:
+            db.query(WorkItem).filter(WorkItem.id == item.id).first()
+        db.query(WorkWeek).filter(WorkWeek.total_points == 100).all()
+        db.query(WorkWeek).filter(WorkWeek.total_points == 80).all()
+        query_recorder.stop(None)
+
+        repeated = query_recorder.requests[-1].repeated(threshold=2)
+        assert len(repeated) == 1
+        assert list(repeated.values()) == [3]
+        assert query_recorder.n_plus_one_report(threshold=1)
+
+    @pytest.mark.performance
+    def test_budget_failure_lists_statements(self, authenticated_client: TestClient, query_recorder):
+        authenticated_client.get("/profile")
+
+        with pytest.raises(AssertionError, match="budget 1"):
+            query_recorder.assert_budget("GET /profile", 1)
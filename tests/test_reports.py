@@ -3,7 +3,11 @@ Tests for reports and export functionality.
 """
 import pytest
 import io
+import os
 import csv
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
@@ -11,7 +15,12 @@ from datetime import date, timedelta
 from app.models.user import User
 from app.models.work_week import WorkWeek
 from app.models.work_item import WorkItem
-from app.services.export import export_to_csv, export_to_excel, get_filtered_items
+from app.services.export_cache import ExportCache
+from app.crud import create_work_item
+from app.schemas import WorkItemCreate
+from app.services.export import (
+    export_to_csv, export_to_excel, get_filtered_items, iter_export_batches, EXPORT_SCHEMA
+)
 
 
 class TestReportsPageAccess:
@@ -175,6 +184,174 @@ class TestExcelExport:
             assert response.status_code in [200, 302]
 
 
+class TestColumnarExport:
+    """Tests for Parquet, Arrow IPC and NDJSON exports."""
+    
+    @pytest.mark.reports
+    def test_batches_are_typed(
+        self, db: Session, regular_user: User, sample_work_week: WorkWeek, sample_work_items: list[WorkItem]
+    ):
+        """Test record batches keep dates and integers typed."""
+        batches = list(iter_export_batches(db, user_id=regular_user.id))
+        table = pa.Table.from_batches(batches, schema=EXPORT_SCHEMA)
+        
+        assert table.num_rows == len(sample_work_items)
+        assert table.schema.field("week_start").type == pa.date32()
+        assert table.schema.field("assigned_points").type == pa.int32()
+        assert table.column("week_start")[0].as_py() == sample_work_week.week_start
+        assert sum(table.column("assigned_points").to_pylist()) == 60
+    
+    @pytest.mark.reports
+    def test_batches_respect_batch_size(
+        self, db: Session, regular_user: User, sample_work_week: WorkWeek, sample_work_items: list[WorkItem]
+    ):
+        """Test results are split into batches of the requested size."""
+        batches = list(iter_export_batches(db, user_id=regular_user.id, batch_size=2))
+        assert [batch.num_rows for batch in batches] == [2, 1]
+    
+    @pytest.mark.reports
+    def test_empty_completion_points_is_null(self, db: Session, regular_user: User, sample_work_week: WorkWeek):
+        """Test missing completion points export as null, not an empty string."""
+        db.add(WorkItem(
+            week_id=sample_work_week.id, title="No completion", type="PLANNED",
+            status="TODO", assigned_points=5
+        ))
+        db.commit()
+        
+        batches = list(iter_export_batches(db, user_id=regular_user.id))
+        assert batches[0].column("completion_points").to_pylist() == [None]
+    
+    @pytest.mark.reports
+    def test_parquet_export_api(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test Parquet export via API round-trips."""
+        response = authenticated_client.get("/reports/export/parquet")
+        assert response.status_code == 200
+        assert "parquet" in response.headers.get("content-type", "")
+        
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == len(sample_work_items)
+        assert set(table.column("title").to_pylist()) == {item.title for item in sample_work_items}
+    
+    @pytest.mark.reports
+    def test_arrow_export_api(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test Arrow IPC stream export via API round-trips."""
+        response = authenticated_client.get("/reports/export/arrow?task_type=PLANNED")
+        assert response.status_code == 200
+        
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.column("type").to_pylist() == ["PLANNED"]
+    
+    @pytest.mark.reports
+    def test_arrow_export_empty(self, authenticated_client: TestClient):
+        """Test Arrow export with no matching rows still carries the schema."""
+        response = authenticated_client.get("/reports/export/arrow")
+        assert response.status_code == 200
+        
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 0
+        assert table.schema.names == EXPORT_SCHEMA.names
+    
+    @pytest.mark.reports
+    def test_ndjson_export_api(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek, sample_work_items: list[WorkItem]
+    ):
+        """Test NDJSON export emits one typed object per line."""
+        response = authenticated_client.get("/reports/export/ndjson?status=COMPLETED")
+        assert response.status_code == 200
+        
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 2
+        assert all(row["status"] == "COMPLETED" for row in rows)
+        assert all(isinstance(row["assigned_points"], int) for row in rows)
+        assert rows[0]["week_start"] == sample_work_week.week_start.isoformat()
+    
+    @pytest.mark.reports
+    def test_unknown_export_format(self, authenticated_client: TestClient):
+        """Test unknown export formats return 404."""
+        response = authenticated_client.get("/reports/export/xml")
+        assert response.status_code == 404
+
+
+class TestExportCache:
+    """Tests for the on-disk export cache and conditional downloads."""
+    
+    @pytest.mark.reports
+    def test_key_depends_on_version_and_filters(self, regular_user: User):
+        """Test cache keys change with data version, format and filters."""
+        key = ExportCache.make_key(regular_user.id, 1, "excel", {"status": "TODO"})
+        
+        assert key == ExportCache.make_key(regular_user.id, 1, "excel", {"status": "TODO"})
+        assert key != ExportCache.make_key(regular_user.id, 2, "excel", {"status": "TODO"})
+        assert key != ExportCache.make_key(regular_user.id, 1, "csv", {"status": "TODO"})
+        assert key != ExportCache.make_key(regular_user.id, 1, "excel", {"status": "COMPLETED"})
+    
+    @pytest.mark.reports
+    def test_empty_filters_share_a_key(self, regular_user: User):
+        """Test empty-string filters from the form match omitted filters."""
+        assert ExportCache.make_key(regular_user.id, 1, "csv", {"status": ""}) == \
+            ExportCache.make_key(regular_user.id, 1, "csv", {"status": None})
+    
+    @pytest.mark.reports
+    def test_lru_eviction_under_budget(self, tmp_path):
+        """Test least recently used files are evicted first."""
+        cache = ExportCache(str(tmp_path), max_bytes=25)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        os.utime(tmp_path / "a", (1, 1))
+        os.utime(tmp_path / "b", (2, 2))
+        assert cache.get("a") is not None  # touch: "b" is now least recent
+        
+        cache.put("c", b"x" * 10)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+    
+    @pytest.mark.reports
+    def test_oversized_entry_is_kept(self, tmp_path):
+        """Test the entry just written survives even if it exceeds the budget."""
+        cache = ExportCache(str(tmp_path), max_bytes=5)
+        path = cache.put("big", [b"x" * 4, b"y" * 4])
+        
+        assert open(path, "rb").read() == b"xxxxyyyy"
+    
+    @pytest.mark.reports
+    def test_write_bumps_data_version(self, db: Session, regular_user: User, sample_work_week: WorkWeek):
+        """Test work item writes bump the owning user's data version."""
+        before = regular_user.data_version
+        create_work_item(db, WorkItemCreate(week_id=sample_work_week.id, title="Bump", assigned_points=5))
+        db.refresh(regular_user)
+        
+        assert regular_user.data_version == before + 1
+    
+    @pytest.mark.reports
+    def test_repeat_download_is_not_modified(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test a repeat download with the ETag answers 304."""
+        first = authenticated_client.get("/reports/export/excel")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        
+        second = authenticated_client.get("/reports/export/excel")
+        assert second.headers["etag"] == etag
+        assert second.content == first.content
+        
+        cached = authenticated_client.get("/reports/export/excel", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+    
+    @pytest.mark.reports
+    def test_write_invalidates_etag(
+        self, authenticated_client: TestClient, db: Session, sample_work_week: WorkWeek
+    ):
+        """Test a new work item produces a fresh export."""
+        first = authenticated_client.get("/reports/export/csv")
+        create_work_item(db, WorkItemCreate(week_id=sample_work_week.id, title="Fresh Task", assigned_points=5))
+        
+        second = authenticated_client.get("/reports/export/csv", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 200
+        assert "Fresh Task" in second.text
+
+
 class TestReportFilters:
     """Tests for report filtering via UI/API."""
     
@@ -198,6 +375,17 @@ class TestReportFilters:
         """Test reports page with status filter."""
         response = authenticated_client.get("/reports?status=COMPLETED")
         assert response.status_code in [200, 302]
+    
+    @pytest.mark.reports
+    def test_reports_page_not_modified(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test the reports page revalidates per filter set."""
+        etag = authenticated_client.get("/reports?status=COMPLETED").headers["etag"]
+        
+        cached = authenticated_client.get("/reports?status=COMPLETED", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        
+        other = authenticated_client.get("/reports?status=TODO", headers={"If-None-Match": etag})
+        assert other.status_code == 200
 
 
 class TestReportDataIntegrity:
@@ -0,0 +1,213 @@
+"""
+Tests for full-text search and title suggestions over work items (SQLite fallbacks).
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.work_item import WorkItem
+from app.services.search import highlight, search_work_items, suggest_titles
+
+
+class TestSearchService:
+    """Tests for search_work_items."""
+
+    @pytest.mark.reports
+    def test_matches_every_text_column(self, db: Session, regular_user: User, make_week, make_item):
+        """Test title, planned work, actual work and next week's plan are all searched."""
+        week = make_week(regular_user)
+        make_item(week, "Kafka upgrade")
+        make_item(week, "Infra", planned_work="prepare the kafka brokers")
+        make_item(week, "Ops", actual_work="rolled kafka back")
+        make_item(week, "Later", next_week_plan="finish kafka")
+        make_item(week, "Unrelated", planned_work="nothing here")
+
+        titles = {row["title"] for row in search_work_items(db, regular_user.id, "kafka")}
+        assert titles == {"Kafka upgrade", "Infra", "Ops", "Later"}
+
+    @pytest.mark.reports
+    def test_title_matches_rank_first(self, db: Session, regular_user: User, make_week, make_item):
+        """Test a title hit outranks the same word in the notes."""
+        week = make_week(regular_user)
+        make_item(week, "Quarterly review", planned_work="something else entirely")
+        make_item(week, "Notes", planned_work="talked about the review of the quarterly plan")
+
+        results = search_work_items(db, regular_user.id, "review")
+        assert [row["title"] for row in results] == ["Quarterly review", "Notes"]
+        assert results[0]["rank"] > results[1]["rank"]
+
+    @pytest.mark.reports
+    def test_scoped_to_user(self, db: Session, regular_user: User, admin_user: User, make_week, make_item):
+        """Test another user's items never match."""
+        make_item(make_week(regular_user), "Mine: migrate billing")
+        make_item(make_week(admin_user), "Theirs: migrate billing")
+
+        assert [row["title"] for row in search_work_items(db, regular_user.id, "billing")] == ["Mine: migrate billing"]
+
+    @pytest.mark.reports
+    def test_index_follows_updates_and_deletes(self, db: Session, regular_user: User, make_week, make_item):
+        """Test edits and deletions are reflected immediately."""
+        item = make_item(make_week(regular_user), "Draft roadmap")
+        item.title = "Final roadmap"
+        db.commit()
+        assert search_work_items(db, regular_user.id, "draft") == []
+        assert [row["title"] for row in search_work_items(db, regular_user.id, "final")] == ["Final roadmap"]
+
+        db.delete(item)
+        db.commit()
+        assert search_work_items(db, regular_user.id, "roadmap") == []
+
+    @pytest.mark.reports
+    def test_keyset_paging_covers_every_match_once(self, db: Session, regular_user: User, make_week, make_item):
+        """Test following (rank, id) cursors returns each match exactly once."""
+        week = make_week(regular_user)
+        for n in range(7):
+            make_item(week, f"Deploy service {n}", planned_work="deploy " * (n % 3 + 1))
+
+        seen, after = [], None
+        while True:
+            rows = search_work_items(db, regular_user.id, "deploy", after=after, limit=3)
+            seen.extend(row["id"] for row in rows)
+            if len(rows) < 3:
+                break
+            after = (rows[-1]["rank"], rows[-1]["id"])
+        assert len(seen) == len(set(seen)) == 7
+
+    @pytest.mark.reports
+    def test_query_syntax_is_literal(self, db: Session, regular_user: User, make_week, make_item):
+        """Test punctuation and FTS operators in user input cannot break the query."""
+        make_item(make_week(regular_user), "Fix OR gate")
+        assert search_work_items(db, regular_user.id, '"); DROP TABLE work_items; --') == []
+        assert search_work_items(db, regular_user.id, "*** (") == []
+        assert [row["title"] for row in search_work_items(db, regular_user.id, 'fix "OR"')] == ["Fix OR gate"]
+
+    @pytest.mark.reports
+    def test_snippet_is_escaped_and_marked(self, db: Session, regular_user: User, make_week, make_item):
+        """Test snippets escape the stored text and wrap only the matches in <mark>."""
+        make_item(make_week(regular_user), "Sanitize", planned_work="strip <script>alert(1)</script> from widget titles")
+
+        snippet = search_work_items(db, regular_user.id, "widget")[0]["snippet"]
+        assert "<mark>widget</mark>" in snippet
+        assert "&lt;script&gt;" in snippet
+        assert "<script>" not in snippet
+        assert highlight(None) == ""
+
+
+class TestSearchEndpoints:
+    """Tests for /api/v1/search and the /search page."""
+
+    @pytest.mark.api
+    def test_api_pages_with_cursor(
+        self, authenticated_client: TestClient, regular_user: User, make_week, make_item
+    ):
+        """Test the API returns ranked pages and a cursor to the next one."""
+        week = make_week(regular_user)
+        for n in range(3):
+            make_item(week, f"Incident review {n}")
+
+        first = authenticated_client.get("/api/v1/search", params={"q": "incident", "limit": 2}).json()
+        assert len(first["data"]) == 2
+        assert {"rank", "snippet", "week_start"} <= set(first["data"][0])
+        second = authenticated_client.get(
+            "/api/v1/search", params={"q": "incident", "limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert len(second["data"]) == 1
+        assert second["next_cursor"] is None
+        assert {row["id"] for row in first["data"]}.isdisjoint(row["id"] for row in second["data"])
+
+    @pytest.mark.api
+    def test_api_rejects_bad_input(self, authenticated_client: TestClient):
+        """Test a missing query is 422 and a malformed cursor is 400."""
+        assert authenticated_client.get("/api/v1/search").status_code == 422
+        response = authenticated_client.get("/api/v1/search", params={"q": "x", "cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    @pytest.mark.api
+    def test_api_requires_auth(self, client: TestClient):
+        """Test anonymous callers are rejected."""
+        assert client.get("/api/v1/search", params={"q": "x"}).status_code == 401
+
+    @pytest.mark.reports
+    def test_page_shows_highlighted_results(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem]
+    ):
+        """Test the page lists matches with their snippets."""
+        response = authenticated_client.get("/search", params={"q": "production"})
+        assert response.status_code == 200
+        assert "Unplanned Task" in response.text
+        assert "<mark>production</mark>" in response.text
+        assert "Planned Task 1" not in response.text
+
+    @pytest.mark.reports
+    def test_page_without_matches(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test an unmatched query says so."""
+        response = authenticated_client.get("/search", params={"q": "zeppelin"})
+        assert "No work items match" in response.text
+
+    @pytest.mark.reports
+    def test_page_requires_login(self, client: TestClient):
+        """Test anonymous visitors are sent to login."""
+        response = client.get("/search", params={"q": "x"}, follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/login"
+
+
+class TestTitleSuggest:
+    """Tests for suggest_titles and /api/titles/suggest."""
+
+    @pytest.mark.input
+    def test_one_suggestion_per_title_with_latest_values(self, db: Session, regular_user: User, make_week, make_item):
+        """Test repeated titles collapse to one, carrying the most recent type and points."""
+        old, new = make_week(regular_user, weeks_ago=2), make_week(regular_user)
+        make_item(old, "Weekly sync", type="PLANNED", assigned_points=5)
+        make_item(new, "weekly SYNC", type="ADHOC", assigned_points=2)
+
+        suggestions = suggest_titles(db, regular_user.id, "sync")
+        assert len(suggestions) == 1
+        assert suggestions[0]["title"] == "weekly SYNC"
+        assert (suggestions[0]["type"], suggestions[0]["assigned_points"]) == ("ADHOC", 2)
+        assert suggestions[0]["last_used"] == new.week_start
+
+    @pytest.mark.input
+    def test_prefix_matches_first(self, db: Session, regular_user: User, make_week, make_item):
+        """Test a title starting with the text outranks one containing it later."""
+        week = make_week(regular_user)
+        make_item(week, "Review deploy checklist")
+        make_item(week, "Deploy pipeline")
+
+        titles = [s["title"] for s in suggest_titles(db, regular_user.id, "deploy")]
+        assert titles == ["Deploy pipeline", "Review deploy checklist"]
+
+    @pytest.mark.input
+    def test_scoped_and_literal(self, db: Session, regular_user: User, admin_user: User, make_week, make_item):
+        """Test other users' titles are hidden and LIKE wildcards in the text match literally."""
+        week = make_week(regular_user)
+        make_item(week, "Cut costs 50%")
+        make_item(week, "Cut costs 500")
+        make_item(make_week(admin_user), "Cut costs 50% more")
+
+        assert [s["title"] for s in suggest_titles(db, regular_user.id, "50%")] == ["Cut costs 50%"]
+        assert suggest_titles(db, regular_user.id, "c") == []
+
+    @pytest.mark.input
+    def test_endpoint(self, authenticated_client: TestClient, sample_work_items: list[WorkItem]):
+        """Test the endpoint returns the suggestions as JSON."""
+        response = authenticated_client.get("/api/titles/suggest", params={"q": "task"})
+        assert response.status_code == 200
+        titles = {s["title"] for s in response.json()["suggestions"]}
+        assert {"Planned Task 1", "Unplanned Task"} <= titles
+
+    @pytest.mark.input
+    def test_endpoint_requires_auth(self, client: TestClient):
+        """Test anonymous callers are sent to login like the other input form endpoints."""
+        response = client.get("/api/titles/suggest", params={"q": "task"}, follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/login"
+
+    @pytest.mark.input
+    def test_input_form_is_wired(self, authenticated_client: TestClient):
+        """Test the add form's title field uses the suggestion list."""
+        response = authenticated_client.get("/input", follow_redirects=True)
+        assert 'list="title_suggestions"' in response.text
+        assert '<datalist id="title_suggestions">' in response.text
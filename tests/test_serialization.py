@@ -0,0 +1,64 @@
+"""
+Tests for the orjson serialization path.
+"""
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from app.models.work_item import TaskStatus
+from app.models.work_week import WorkWeek
+from app.serialization import JSONResponse, dumps, tojson
+
+
+class TestSerialization:
+    """Tests for the shared serializer and response class."""
+    
+    @pytest.mark.performance
+    def test_dumps_native_types(self):
+        """Test UUIDs, dates, enums and decimals encode without conversion by the caller."""
+        item_id = uuid4()
+        data = json.loads(dumps({
+            "id": item_id,
+            "day": date(2025, 1, 6),
+            "at": datetime(2025, 1, 6, 9, 30),
+            "status": TaskStatus.COMPLETED,
+            "ratio": Decimal("0.5"),
+            1: "non-string key"
+        }))
+        assert data == {
+            "id": str(item_id),
+            "day": "2025-01-06",
+            "at": "2025-01-06T09:30:00",
+            "status": "COMPLETED",
+            "ratio": 0.5,
+            "1": "non-string key"
+        }
+    
+    @pytest.mark.performance
+    def test_dumps_rejects_unknown(self):
+        """Test unsupported objects still fail loudly."""
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+    
+    @pytest.mark.performance
+    def test_tojson_escapes_script_breakout(self):
+        """Test embedded JSON cannot close the surrounding script tag."""
+        rendered = tojson({"title": "</script><b>'&'"})
+        assert "</script>" not in rendered
+        assert json.loads(str(rendered)) == {"title": "</script><b>'&'"}
+    
+    @pytest.mark.performance
+    def test_tojson_passes_preserialized_bytes(self):
+        """Test bytes from dumps are embedded without re-encoding."""
+        assert str(tojson(b'{"a":1}')) == '{"a":1}'
+    
+    @pytest.mark.performance
+    def test_default_response_class(self, authenticated_client: TestClient, sample_work_week: WorkWeek):
+        """Test JSON endpoints are rendered by the orjson response class."""
+        response = authenticated_client.get("/api/analytics/data")
+        assert response.status_code == 200
+        assert response.content == JSONResponse(response.json()).body
+        assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,114 @@
+"""
+Tests for the slow query log and /admin/slow-queries.
+"""
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.work_item import WorkItem
+from app.services.slow_queries import SlowQueryLog, redact, slow_query_log
+
+
+@pytest.fixture
+def log_everything(monkeypatch):
+    """Treat every statement as slow, starting from an empty log."""
+    monkeypatch.setattr(slow_query_log, "threshold", 0.0)
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+def fake_connection(dialect: str):
+    return SimpleNamespace(info={}, dialect=SimpleNamespace(name=dialect), engine=object())
+
+
+class TestSlowQueryLog:
+    """Tests for recording slow statements."""
+
+    @pytest.mark.performance
+    def test_parameters_are_redacted(self):
+        """Test bound values are replaced by their types."""
+        assert redact({"email_1": "user@test.com", "param_1": 1}, False) == {"email_1": "str", "param_1": "int"}
+        assert redact(("user@test.com", 1), False) == ["str", "int"]
+        assert redact([("a",), ("b",)], True) == {"rows": 2}
+
+    @pytest.mark.performance
+    def test_ring_buffer_keeps_newest(self):
+        """Test only the last max_entries statements are kept, newest first."""
+        log = SlowQueryLog(threshold_ms=0, max_entries=2, explain=False)
+        for n in range(3):
+            log.record(fake_connection("sqlite"), f"SELECT {n}", (), 0.5, False, None)
+        assert [entry["statement"] for entry in log.entries()] == ["SELECT 2", "SELECT 1"]
+
+    @pytest.mark.performance
+    def test_explain_only_on_postgres(self, monkeypatch):
+        """Test plans are requested for Postgres SELECTs and nothing else."""
+        log = SlowQueryLog(threshold_ms=0, max_entries=10, explain=True)
+        explained = []
+        monkeypatch.setattr(log, "_explain_later", lambda engine, entry, statement, params: explained.append(statement))
+
+        log.record(fake_connection("sqlite"), "SELECT 1", (), 0.5, False, None)
+        log.record(fake_connection("postgresql"), "SELECT 2", (), 0.5, False, None)
+        log.record(fake_connection("postgresql"), "BEGIN", (), 0.5, False, None)
+        log.record(fake_connection("postgresql"), "INSERT INTO t VALUES (%s)", [(1,), (2,)], 0.5, True, None)
+        assert explained == ["SELECT 2"]
+
+    @pytest.mark.performance
+    def test_explain_failure_is_kept_on_entry(self, db: Session):
+        """Test a plan that cannot be captured records the error instead of raising."""
+        log = SlowQueryLog(threshold_ms=0, max_entries=10)
+        entry = {"plan": None}
+        log._explain(db.get_bind(), entry, "SELECT 1", ())
+        assert "error" in entry["plan"]
+
+    @pytest.mark.performance
+    def test_fast_statements_not_recorded(self, db: Session, monkeypatch):
+        """Test statements under the threshold are skipped."""
+        monkeypatch.setattr(slow_query_log, "threshold", 60.0)
+        slow_query_log.clear()
+        db.execute(text("SELECT 1"))
+        assert slow_query_log.entries() == []
+
+    @pytest.mark.performance
+    def test_request_statements_carry_route_and_caller(
+        self, authenticated_client: TestClient, sample_work_items: list[WorkItem], log_everything
+    ):
+        """Test entries name the route template and the crud/service function."""
+        authenticated_client.get("/analytics")
+
+        entries = [entry for entry in log_everything.entries() if entry["route"] == "/analytics"]
+        assert entries
+        callers = {entry["caller"] for entry in entries}
+        assert any(caller and caller.startswith("app/services/analytics.py") for caller in callers)
+        assert all("user@test.com" not in str(entry["parameters"]) for entry in entries)
+
+
+class TestSlowQueriesPage:
+    """Tests for /admin/slow-queries."""
+
+    @pytest.mark.admin
+    def test_admin_sees_entries(self, admin_client: TestClient, log_everything):
+        """Test the page lists recorded statements."""
+        admin_client.get("/profile")
+        response = admin_client.get("/admin/slow-queries")
+        assert response.status_code == 200
+        assert "Slow Queries" in response.text
+        assert "/profile" in response.text
+        assert "FROM users" in response.text
+
+    @pytest.mark.admin
+    def test_admin_can_clear(self, admin_client: TestClient, log_everything):
+        """Test clearing empties the buffer."""
+        admin_client.get("/profile")
+        log_everything.threshold = 60.0
+        admin_client.post("/admin/slow-queries/clear", follow_redirects=False)
+        assert log_everything.entries() == []
+
+    @pytest.mark.admin
+    def test_regular_user_redirected(self, authenticated_client: TestClient):
+        """Test non-admins cannot browse the log."""
+        response = authenticated_client.get("/admin/slow-queries", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/"
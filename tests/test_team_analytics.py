@@ -0,0 +1,173 @@
+"""
+Tests for the set-based team analytics on /admin/analytics.
+"""
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.crud.user import bump_data_version, create_user, delete_user
+from app.models.user import User
+from app.models.work_item import WorkItem
+from app.services.team_analytics import (
+    compute_team_analytics, get_team_analytics, percentile_cont, team_analytics_cache
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    team_analytics_cache.clear()
+    yield
+    team_analytics_cache.clear()
+
+
+def this_monday() -> date:
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+
+class TestPercentileCont:
+    """Tests for the Python percentile_cont fallback."""
+
+    @pytest.mark.admin
+    def test_interpolates_like_postgres(self):
+        """Test results match Postgres percentile_cont on the same values."""
+        values = [10, 20, 30, 40]
+        assert percentile_cont(values, 0.5) == 25
+        assert percentile_cont(values, 0.25) == 17.5
+        assert percentile_cont(values, 0.0) == 10
+        assert percentile_cont(values, 1.0) == 40
+
+    @pytest.mark.admin
+    def test_ignores_nulls(self):
+        """Test NULLs are skipped and an empty input has no percentile."""
+        assert percentile_cont([None, 5, None], 0.9) == 5
+        assert percentile_cont([None], 0.5) is None
+        assert percentile_cont([], 0.5) is None
+
+
+class TestTeamAnalytics:
+    """Tests for compute_team_analytics and its cache."""
+
+    @pytest.mark.admin
+    def test_weekly_utilization_and_percentiles(
+        self, db: Session, make_week, make_item, regular_user: User, admin_user: User
+    ):
+        """Test team utilization, its week-on-week change and the spread across users."""
+        make_item(make_week(regular_user, weeks_ago=1), assigned_points=40, completion_points=40)
+        make_item(make_week(admin_user, weeks_ago=1), assigned_points=60, completion_points=30)
+        make_item(make_week(regular_user), assigned_points=80, completion_points=40)
+        make_item(make_week(admin_user), assigned_points=100, completion_points=0)
+
+        team = compute_team_analytics(db, this_monday() - timedelta(weeks=1), this_monday())
+        last, current = team["weekly"]
+        assert (last["users"], last["capacity"], last["assigned"], last["completed"]) == (2, 200, 100, 70)
+        assert last["utilization"] == 0.5
+        assert last["change"] is None
+        assert (last["p25"], last["p50"], last["p75"]) == (0.45, 0.5, 0.55)
+        assert current["utilization"] == 0.9
+        assert current["change"] == 0.4
+
+    @pytest.mark.admin
+    def test_type_mix_completion_and_ooo(self, db: Session, make_week, make_item, regular_user: User, admin_user: User):
+        """Test type mix, completion totals and the split by days out of office."""
+        week = make_week(regular_user)
+        make_item(week, status="COMPLETED", assigned_points=30, completion_points=30)
+        make_item(week, type="UNPLANNED", status="IN_PROGRESS", assigned_points=10, completion_points=5)
+        week = make_week(admin_user, ooo_days=2)
+        make_item(week, status="IN_PROGRESS", assigned_points=20, completion_points=10)
+        make_item(week, type="ADHOC", status="COMPLETED", assigned_points=10, completion_points=10)
+
+        team = compute_team_analytics(db, this_monday(), this_monday())
+        assert team["type_mix"]["PLANNED"] == {"items": 2, "points": 50, "completed_items": 1, "completion_rate": 0.8}
+        assert team["type_mix"]["UNPLANNED"]["completion_rate"] == 0.5
+        assert team["completion"] == {"items": 4, "completed_items": 2, "item_rate": 0.5, "points_rate": 0.7857}
+        assert [(row["ooo_days"], row["assigned"], row["completion_rate"]) for row in team["ooo_impact"]] == [
+            (0, 40.0, 0.875), (2, 30.0, 0.6667)
+        ]
+
+    @pytest.mark.admin
+    def test_user_distribution(self, db: Session, make_week, make_item, regular_user: User, admin_user: User):
+        """Test per-user figures are pooled over the range before taking percentiles."""
+        make_item(make_week(regular_user, weeks_ago=1), assigned_points=20, completion_points=20)
+        make_item(make_week(regular_user), assigned_points=60, completion_points=30)
+        make_item(make_week(admin_user), assigned_points=100, completion_points=100)
+
+        users = compute_team_analytics(db, this_monday() - timedelta(weeks=1), this_monday())["users"]
+        assert users["count"] == 2
+        assert (users["utilization"]["p10"], users["utilization"]["p90"]) == (0.46, 0.94)
+        assert users["completion_rate"]["p50"] == 0.8125
+
+    @pytest.mark.admin
+    def test_weeks_outside_range_ignored(self, db: Session, make_week, make_item, regular_user: User):
+        """Test only weeks inside the range are counted."""
+        make_item(make_week(regular_user, weeks_ago=5), assigned_points=10, completion_points=10)
+        team = compute_team_analytics(db, this_monday() - timedelta(weeks=3), this_monday())
+        assert team["weekly"] == []
+        assert team["users"]["count"] == 0
+        assert team["completion"]["item_rate"] is None
+
+    @pytest.mark.admin
+    def test_cached_until_any_user_writes(self, db: Session, make_week, make_item, regular_user: User, monkeypatch):
+        """Test a repeat view is served from cache and a data_version bump recomputes."""
+        make_item(make_week(regular_user), assigned_points=50, completion_points=25)
+        first = get_team_analytics(db, weeks_back=4)
+
+        import app.services.team_analytics as team_analytics
+        monkeypatch.setattr(team_analytics, "compute_team_analytics", lambda *args: pytest.fail("recomputed"))
+        assert get_team_analytics(db, weeks_back=4) is first
+        monkeypatch.undo()
+
+        bump_data_version(db, regular_user.id)
+        db.commit()
+        assert get_team_analytics(db, weeks_back=4) is not first
+
+
+    @pytest.mark.admin
+    def test_version_never_repeats_over_different_data(
+        self, db: Session, make_week, make_item, regular_user: User, admin_user: User
+    ):
+        """Test deleting a user, a signup and as many writes as the deleted user had still recomputes."""
+        make_item(make_week(regular_user), assigned_points=50, completion_points=25)
+        bump_data_version(db, regular_user.id)
+        db.commit()
+        first = get_team_analytics(db, weeks_back=4)
+        versions = db.query(func.sum(User.data_version)).scalar()
+
+        delete_user(db, regular_user.id)
+        create_user(db, "newcomer@test.com", "password123")
+        for _ in range(versions - db.query(func.sum(User.data_version)).scalar()):
+            bump_data_version(db, admin_user.id)
+        db.commit()
+        assert db.query(func.sum(User.data_version)).scalar() == versions
+        assert get_team_analytics(db, weeks_back=4) is not first
+
+
+class TestTeamAnalyticsPage:
+    """Tests for the /admin/analytics page."""
+
+    @pytest.mark.admin
+    def test_page_renders(
+        self, admin_client: TestClient, sample_work_items: list[WorkItem], query_recorder
+    ):
+        """Test admins see the tables, computed in a handful of statements."""
+        response = admin_client.get("/admin/analytics?weeks=4")
+        assert response.status_code == 200
+        assert "Team Analytics" in response.text
+        assert "Weekly Utilization" in response.text
+        assert "Out-of-Office Impact" in response.text
+        assert "60%" in response.text
+        query_recorder.assert_budget("GET /admin/analytics", 12)
+
+    @pytest.mark.admin
+    def test_rejects_bad_range(self, admin_client: TestClient):
+        """Test the week range is validated."""
+        assert admin_client.get("/admin/analytics?weeks=0").status_code == 422
+
+    @pytest.mark.admin
+    def test_regular_user_redirected(self, authenticated_client: TestClient):
+        """Test non-admins are sent to the dashboard."""
+        response = authenticated_client.get("/admin/analytics", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/"
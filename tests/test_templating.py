@@ -0,0 +1,125 @@
+"""
+Tests for the shared Jinja environment.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from jinja2 import Environment, pass_eval_context
+
+import app.middleware as middleware
+from app.fragment_cache import FragmentCache, FragmentCacheExtension
+from app.models.work_week import WorkWeek
+from app.routers import admin, dashboard, input, reports
+from app.templating import create_environment, environment_fingerprint, precompile_templates, templates
+
+
+class TestTemplating:
+    """Tests for the shared, precompiled template environment."""
+    
+    @pytest.mark.performance
+    def test_routers_share_one_environment(self):
+        """Test every router renders through the same environment."""
+        for module in (admin, dashboard, input, reports):
+            assert module.templates is templates
+        assert templates.env.globals["asset_url"] is not None
+        assert "url_for" in templates.env.globals
+    
+    @pytest.mark.performance
+    def test_precompile_writes_bytecode_cache(self, tmp_path):
+        """Test precompiling fills the bytecode cache for a fresh worker."""
+        cache_dir = tmp_path / "templates"
+        env = create_environment(str(cache_dir), auto_reload=False)
+        names = precompile_templates(env)
+        assert "base.html" in names
+        assert "dashboard.html" in names
+        assert len(list(cache_dir.iterdir())) == len(names)
+        
+        # A second environment loads from the cache rather than compiling
+        fresh = create_environment(str(cache_dir), auto_reload=False)
+        fresh.compile = None
+        assert fresh.get_template("base.html") is not None
+    
+    @pytest.mark.performance
+    def test_filter_change_invalidates_bytecode(self, tmp_path):
+        """Test bytecode compiled against different filters is not reused."""
+        env = create_environment(str(tmp_path), auto_reload=False)
+        precompile_templates(env)
+        
+        changed = create_environment(str(tmp_path), auto_reload=False)
+        changed.filters["tojson"] = pass_eval_context(lambda eval_ctx, value: value)
+        assert environment_fingerprint(changed) != environment_fingerprint(env)
+        assert environment_fingerprint(create_environment(str(tmp_path), auto_reload=False)) == environment_fingerprint(env)
+    
+    @pytest.mark.performance
+    def test_autoescape_enabled(self, tmp_path):
+        """Test the shared environment still escapes user content."""
+        env = create_environment(str(tmp_path), auto_reload=False)
+        rendered = env.from_string("{{ value }}").render(value="<b>x</b>")
+        assert rendered == "&lt;b&gt;x&lt;/b&gt;"
+
+
+class TestFragmentCache:
+    """Tests for the {% cache %} fragment cache."""
+    
+    @pytest.mark.performance
+    def test_lru_evicts_oldest(self):
+        """Test the cache stays within its entry bound."""
+        cache = FragmentCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert len(cache) == 2
+    
+    @pytest.mark.performance
+    def test_ttl_expires_entry(self):
+        """Test entries are dropped once their TTL passes."""
+        cache = FragmentCache()
+        cache.set("a", "1", ttl=0)
+        assert cache.get("a") is None
+    
+    @pytest.mark.performance
+    def test_warm_fragment_skips_body(self):
+        """Test a warm fragment does not evaluate its body again."""
+        env = Environment(extensions=[FragmentCacheExtension], autoescape=True)
+        template = env.from_string("{% cache key, 60 %}<b>{{ load() }}</b>{% endcache %}")
+        calls = []
+        load = lambda: calls.append(1) or len(calls)
+        
+        assert template.render(key="k", load=load) == "<b>1</b>"
+        assert template.render(key="k", load=load) == "<b>1</b>"
+        assert template.render(key="other", load=load) == "<b>2</b>"
+        assert template.render(key=None, load=load) == "<b>3</b>"
+        assert len(calls) == 3
+    
+    @pytest.mark.performance
+    def test_sidebar_served_from_cache(
+        self, authenticated_client: TestClient, sample_work_week: WorkWeek, monkeypatch
+    ):
+        """Test the sidebar stats are only queried until the fragment is warm."""
+        calls = []
+        original = middleware.get_current_week_stats
+        monkeypatch.setattr(
+            middleware, "get_current_week_stats",
+            lambda db, user_id=None: calls.append(user_id) or original(db, user_id)
+        )
+        
+        assert authenticated_client.get("/reports").status_code == 200
+        assert authenticated_client.get("/analytics").status_code == 200
+        assert len(calls) == 1
+        
+        # Changing the user's data invalidates the fragment
+        response = authenticated_client.post("/api/work-items", data={
+            "week_id": str(sample_work_week.id),
+            "title": "New Task",
+            "type": "PLANNED",
+            "status": "TODO",
+            "assigned_points": "20",
+            "start_date": sample_work_week.week_start.isoformat(),
+            "end_date": sample_work_week.week_end.isoformat(),
+        }, follow_redirects=False)
+        assert response.status_code in [200, 302, 303]
+        response = authenticated_client.get("/reports")
+        assert len(calls) == 2
+        assert "20 / 100 pts" in response.text